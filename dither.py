@@ -3,25 +3,21 @@
 Dithering CLI entry point.
 
 Loads (or randomly selects) a demo image and dispatches to one of the dithering
-tasks chosen via CLI args (naive, ordered, random, error/adaptive diffusion, multi-level).
+tasks chosen via CLI args (naive, ordered, random, error/adaptive/dot/multiscale
+diffusion, text/photo hybrid, Riemersma, direct binary search, multi-level), or
+dithers a video/animation frame by frame into an animated GIF/APNG.
 """
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import numpy as np
-from skimage import io
-from skimage.util import img_as_ubyte
 from src.app.cli import check_kernels, parse_args
-from src.app.tasks import (
-    task_adaptive_diffusion,
-    task_error_diffusion,
-    task_multi_level,
-    task_naive,
-    task_ordered,
-    task_random,
-)
+
+# Task, I/O and plotting modules are imported in `main` once the chosen mode
+# is known, so `--help` and headless runs stay fast to start.
 
 ROOT   = Path(__file__).resolve().parent
 ASSETS = ROOT / "assets"
@@ -50,27 +46,157 @@ def load_demo_image(seed: int | None = None) -> tuple[np.ndarray, str]:
             candidates.extend(ASSETS.glob(pat))
 
     if candidates:
+        from src.app.batch import load_rgb
+
         path = candidates[int(rng.integers(0, len(candidates)))]
-        img = io.imread(str(path))
-        name = path.stem
-    else:
-        from skimage import data
-        img = data.astronaut()
-        name = "astronaut"
-
-    # Normalize to RGB uint8
-    if img.ndim == 2:
-        img = np.stack([img, img, img], axis=-1)
-    if img.shape[-1] == 4:
-        img = img[..., :3]
-    if img.dtype != np.uint8:
-        img = img_as_ubyte(img)
-    return img, name
+        return load_rgb(path), path.stem
+
+    from skimage import data
+    return data.astronaut(), "astronaut"
+
+
+def batch_params(args) -> dict:
+    """Task keyword arguments taken from the CLI options (batch mode and `--task all`)."""
+    serp = not args.no_serpentine
+    if args.task == "error_diffusion":
+        kernels = check_kernels([s.strip() for s in args.kernels.split(",") if s.strip()])
+        return {"kernels": kernels, "threshold": args.threshold, "serpentine": serp}
+    if args.task == "adaptive_diffusion":
+        return {"serpentine": serp}
+    if args.task == "hybrid":
+        return {"threshold": args.threshold, "serpentine": serp}
+    if args.task in ("naive", "dot_diffusion", "riemersma"):
+        return {"threshold": args.threshold}
+    if args.task == "ordered":
+        return {"n": args.bayer_n}
+    if args.task == "multi_level":
+        return {"levels": args.levels, "palette_mode": args.palette}
+    if args.task == "dbs":
+        return {"max_iter": args.dbs_iters, "time_budget": args.dbs_seconds}
+    if args.task == "all":
+        kernels = check_kernels([s.strip() for s in args.kernels.split(",") if s.strip()])
+        return {
+            "kernels": kernels,
+            "threshold": args.threshold,
+            "serpentine": serp,
+            "n": args.bayer_n,
+            "levels": args.levels,
+            "palette_mode": args.palette,
+            "max_iter": args.dbs_iters,
+            "time_budget": args.dbs_seconds,
+        }
+    return {}
 
 
 def main() -> None:
     """CLI entry: parse args, load image, and run the requested dithering task."""
     args = parse_args()
+
+    cache = None
+    if args.cache_dir:
+        from src.utils.result_cache import ResultCache
+
+        cache = ResultCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 2**20))
+
+    if args.frames_in:
+        if not args.frames_out:
+            raise SystemExit("--frames-in requires --frames-out")
+        from src.app.sequence_task import task_sequence
+
+        frames_in = args.frames_in
+        if Path(frames_in).is_dir() or any(c in frames_in for c in "*?["):
+            from src.app.batch import collect_inputs
+
+            frames_in = collect_inputs(frames_in)
+        kernels = [s.strip() for s in args.kernels.split(",") if s.strip()]
+        count = task_sequence(
+            frames_in,
+            args.frames_out,
+            task=args.task,
+            kind=args.ordered_kind,
+            n=args.bayer_n if args.ordered_kind == "bayer" else 64,
+            threshold=args.threshold,
+            kernel=check_kernels(kernels[:1])[0],
+            serpentine=not args.no_serpentine,
+            jobs=args.jobs or os.cpu_count() or 1,
+            delta=not args.no_delta,
+            duration_ms=args.frame_ms,
+            compress_level=args.compress_level,
+        )
+        print(f"Wrote {args.frames_out} ({count} frames)")
+        return
+
+    if args.large_in:
+        if not args.large_out:
+            raise SystemExit("--large-in requires --large-out")
+        from src.app.memmap_task import task_memmap
+        from src.app.stream_task import task_stream
+        from src.utils.stream_io import is_stream_path
+
+        kernels = [s.strip() for s in args.kernels.split(",") if s.strip()]
+        raw_shape = (
+            tuple(int(v) for v in args.raw_shape.split(",")) if args.raw_shape else None
+        )
+        streamed = is_stream_path(args.large_in) or is_stream_path(args.large_out)
+        extra = {"compress_level": args.compress_level} if streamed else {}
+        run_large = task_stream if streamed else task_memmap
+        out = run_large(
+            args.large_in,
+            args.large_out,
+            task=args.task,
+            band_rows=args.band_rows,
+            threshold=args.threshold,
+            kernel=check_kernels(kernels[:1])[0],
+            n=args.bayer_n,
+            serpentine=not args.no_serpentine,
+            raw_shape=raw_shape,
+            raw_dtype=np.dtype(args.raw_dtype),
+            **extra,
+        )
+        print(f"Wrote {out}")
+        return
+
+    if args.input:
+        if not args.output:
+            raise SystemExit("--input requires --output")
+        from src.app.batch import collect_inputs, run_batch
+        from src.app.visualize import PNGOptions
+
+        summary = run_batch(
+            collect_inputs(args.input),
+            Path(args.output),
+            task=args.task,
+            params=batch_params(args),
+            jobs=args.jobs,
+            png=PNGOptions(
+                compress_level=args.compress_level, filter_type=args.png_filter, workers=1
+            ),
+            force=args.force,
+            cache=cache,
+        )
+        print(summary.report())
+        for src, err in summary.failed:
+            print(f"  {src}: {err}")
+        if summary.failed:
+            raise SystemExit(1)
+        return
+
+    from src.app.tasks import (
+        task_adaptive_diffusion,
+        task_all,
+        task_dbs,
+        task_dot_diffusion,
+        task_error_diffusion,
+        task_hybrid,
+        task_multi_level,
+        task_multiscale,
+        task_naive,
+        task_ordered,
+        task_random,
+        task_riemersma,
+    )
+    from src.app.visualize import PNGOptions
+
     img, img_name = load_demo_image()
 
     outdir = ROOT / "output"
@@ -78,6 +204,7 @@ def main() -> None:
         outdir.mkdir(parents=True, exist_ok=True)
 
     serp = not args.no_serpentine
+    png = PNGOptions(compress_level=args.compress_level, filter_type=args.png_filter)
 
     def preparse_kernels() -> list[str]:
         """Split and validate the `--kernels` CSV argument using `check_kernels`."""
@@ -85,8 +212,23 @@ def main() -> None:
         return check_kernels(items)
 
     dispatch = {
+        "all": lambda: task_all(
+            img,
+            img_name,
+            **batch_params(args),
+            save=args.save,
+            outdir=outdir,
+            png=png,
+            cache=cache,
+        ),
         "adaptive_diffusion": lambda: task_adaptive_diffusion(
-            img, serpentine=serp, save=args.save, outdir=outdir, img_name=img_name
+            img,
+            serpentine=serp,
+            save=args.save,
+            outdir=outdir,
+            img_name=img_name,
+            png=png,
+            cache=cache,
         ),
         "error_diffusion": lambda: task_error_diffusion(
             img,
@@ -96,16 +238,79 @@ def main() -> None:
             save=args.save,
             outdir=outdir,
             img_name=img_name,
+            png=png,
+            cache=cache,
+        ),
+        "hybrid": lambda: task_hybrid(
+            img,
+            threshold=args.threshold,
+            serpentine=serp,
+            save=args.save,
+            outdir=outdir,
+            img_name=img_name,
+            png=png,
+            cache=cache,
+        ),
+        "dbs": lambda: task_dbs(
+            img,
+            **batch_params(args),
+            save=args.save,
+            outdir=outdir,
+            img_name=img_name,
+            png=png,
+            cache=cache,
+        ),
+        "dot_diffusion": lambda: task_dot_diffusion(
+            img,
+            threshold=args.threshold,
+            save=args.save,
+            outdir=outdir,
+            img_name=img_name,
+            png=png,
+            cache=cache,
+        ),
+        "multiscale": lambda: task_multiscale(
+            img, save=args.save, outdir=outdir, img_name=img_name, png=png, cache=cache
         ),
         "naive": lambda: task_naive(
-            img, threshold=args.threshold, save=args.save, outdir=outdir, img_name=img_name
+            img,
+            threshold=args.threshold,
+            save=args.save,
+            outdir=outdir,
+            img_name=img_name,
+            png=png,
+            cache=cache,
         ),
         "ordered": lambda: task_ordered(
-            img, n=args.bayer_n, save=args.save, outdir=outdir, img_name=img_name
+            img,
+            n=args.bayer_n,
+            save=args.save,
+            outdir=outdir,
+            img_name=img_name,
+            png=png,
+            cache=cache,
+        ),
+        "random": lambda: task_random(
+            img, save=args.save, outdir=outdir, img_name=img_name, png=png
+        ),
+        "riemersma": lambda: task_riemersma(
+            img,
+            threshold=args.threshold,
+            save=args.save,
+            outdir=outdir,
+            img_name=img_name,
+            png=png,
+            cache=cache,
         ),
-        "random": lambda: task_random(img, save=args.save, outdir=outdir, img_name=img_name),
         "multi_level": lambda: task_multi_level(
-            img, levels=args.levels, save=args.save, outdir=outdir, img_name=img_name
+            img,
+            levels=args.levels,
+            palette_mode=args.palette,
+            save=args.save,
+            outdir=outdir,
+            img_name=img_name,
+            png=png,
+            cache=cache,
         ),
     }
 
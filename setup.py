@@ -31,11 +31,15 @@ setup(
         include=[
             "app*",
             "adaptive_diffusion",
+            "dbs",
+            "dot_diffusion",
             "error_diffusion",
+            "hybrid",
             "multi_level",
             "naive",
             "ordered",
             "random",
+            "riemersma",
             "utils",
         ],
     ),
@@ -1,18 +1,47 @@
 # -*- coding: utf-8 -*-
 """Top-level package for the dithering project.
 
-Exposes submodules implementing various dithering algorithms.
+Exposes submodules implementing various dithering algorithms. They are imported
+on first attribute access, so ``import src.app.cli`` does not load them all.
 """
 
 from __future__ import annotations
 
-from . import adaptive_diffusion, error_diffusion, multi_level, naive, ordered, random
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import (
+        adaptive_diffusion,
+        dbs,
+        dot_diffusion,
+        error_diffusion,
+        hybrid,
+        multi_level,
+        naive,
+        ordered,
+        random,
+        riemersma,
+    )
+
+__version__ = "0.1.0"
 
 __all__ = [
     "adaptive_diffusion",
+    "dbs",
+    "dot_diffusion",
     "error_diffusion",
+    "hybrid",
     "multi_level",
     "naive",
     "ordered",
     "random",
+    "riemersma",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the algorithm subpackage `name` on first access."""
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
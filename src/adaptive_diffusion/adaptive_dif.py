@@ -7,10 +7,12 @@ Ostromoukhov or Zhou-Fang adaptive diffusion implementations.
 
 from __future__ import annotations
 
-from typing import Literal, Union
+from typing import Literal, Optional, Union
 
 import numpy as np
 
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace
 from .group import ostromoukhov_bw, zhou_fang_bw
 
 
@@ -23,6 +25,9 @@ def adaptive_diff_bw(
     serpentine: bool = True,
     noise_scale: float = 1.0,
     seed: Union[int, None] = None,
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
 ) -> np.ndarray:
     """Apply adaptive diffusion dithering.
 
@@ -42,6 +47,12 @@ def adaptive_diff_bw(
         Scaling factor for random noise (only used in Zhou-Fang).
     seed : int | None, optional
         RNG seed for reproducibility (only used in Zhou-Fang).
+    tone : ToneCurve | None, optional
+        Tone curve folded into the grayscale conversion.
+    out : np.ndarray | None, optional
+        Preallocated (H, W) output, written in place and returned.
+    workspace : Workspace | None, optional
+        Reusable scratch buffers shared across calls.
 
     Returns
     -------
@@ -50,7 +61,13 @@ def adaptive_diff_bw(
     """
     if method == "ostromoukhov":
         return ostromoukhov_bw(
-            img, dtype=dtype, threshold=threshold, serpentine=serpentine
+            img,
+            dtype=dtype,
+            threshold=threshold,
+            serpentine=serpentine,
+            tone=tone,
+            out=out,
+            workspace=workspace,
         )
     if method == "zhou_fang":
         return zhou_fang_bw(
@@ -59,5 +76,8 @@ def adaptive_diff_bw(
             serpentine=serpentine,
             noise_scale=noise_scale,
             seed=seed,
+            tone=tone,
+            out=out,
+            workspace=workspace,
         )
     raise ValueError("method must be 'ostromoukhov' or 'zhou_fang'")
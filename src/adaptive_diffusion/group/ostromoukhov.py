@@ -11,24 +11,14 @@ References
 
 from __future__ import annotations
 
-import pathlib
-from typing import Literal, Union
+from typing import Literal, Optional, Union
 
 import numpy as np
 
-from ...utils import binarize, grayscale, map_threshold_graydomain
-from ..kernels import load_ostro_coeffs
-
-_THIS_FILE = pathlib.Path(__file__).resolve()
-_THIS_DIR = _THIS_FILE.parent
-_AD_DIR = _THIS_DIR.parent
-_DATA_DIR = _AD_DIR / "kernels" / "data"
-
-_OSTRO_TXT = _DATA_DIR / "weights_ostromoukhov.txt"
-if not _OSTRO_TXT.exists():
-    raise FileNotFoundError(f"Not found: {_OSTRO_TXT}")
-
-__OSTRO_COEFFS = load_ostro_coeffs(_OSTRO_TXT, dtype=np.float32)
+from ...utils import grayscale, map_threshold_graydomain
+from ...utils.tone import ToneCurve
+from ...utils.workspace import Workspace, prepare_output
+from ..kernels import ostro_coeffs
 
 
 def ostromoukhov_bw(
@@ -37,6 +27,9 @@ def ostromoukhov_bw(
     dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
     threshold: Union[int, float] = 128,
     serpentine: bool = True,
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
 ) -> np.ndarray:
     """Apply Ostromoukhov variable-coefficient error diffusion to an image.
 
@@ -50,21 +43,32 @@ def ostromoukhov_bw(
         Global threshold in gray domain (0..255 mapping). Default 128.
     serpentine : bool, optional
         Alternate scan direction per row (True) or always left→right (False).
+    tone : ToneCurve | None, optional
+        Tone curve folded into the grayscale conversion. Default None.
+    out : np.ndarray | None, optional
+        Preallocated (H, W) output, written in place and returned. Default None.
+    workspace : Workspace | None, optional
+        Reusable scratch buffers (gray plane, error rows). Default None.
 
     Returns
     -------
     np.ndarray
-        Dithered 1-bit image mapped to requested dtype via `binarize`.
+        Dithered {0,1} image in the requested dtype (`out` when given).
     """
-    g_base = grayscale(img, dtype)
+    g_base = grayscale(img, dtype, tone=tone, workspace=workspace)
     h, w = g_base.shape
     thr = map_threshold_graydomain(threshold, dtype)
 
-    out_u8 = np.empty((h, w), dtype=np.uint8)
-    err_curr = np.zeros(w, dtype=np.float32)
-    err_next = np.zeros(w, dtype=np.float32)
+    dst = prepare_output((h, w), dtype, out)
+    if workspace is None:
+        err_curr = np.zeros(w, dtype=np.float32)
+        err_next = np.zeros(w, dtype=np.float32)
+    else:
+        err_curr = workspace.zeros("err_row0", (w,))
+        err_next = workspace.zeros("err_row1", (w,))
 
-    n_ostro = __OSTRO_COEFFS.shape[0]
+    coeffs = ostro_coeffs()
+    n_ostro = coeffs.shape[0]
 
     for y in range(h):
         flip = serpentine and (y & 1)
@@ -82,12 +86,12 @@ def ostromoukhov_bw(
             if idx >= n_ostro:
                 idx = n_ostro - 1
 
-            w_r, w_dl, w_d = __OSTRO_COEFFS[idx]  # right, diag, down
+            w_r, w_dl, w_d = coeffs[idx]  # right, diag, down
 
             # Diffuse quantization error
             old = g_base[y, x] + err_curr[x]
             new = 255.0 if old >= thr else 0.0
-            out_u8[y, x] = 255 if new > 0.0 else 0
+            dst[y, x] = 1 if new > 0.0 else 0
             e = old - new
 
             if not flip:
@@ -106,4 +110,4 @@ def ostromoukhov_bw(
         # Next row becomes current
         err_curr, err_next = err_next, err_curr
 
-    return binarize(out_u8, dtype)
+    return dst
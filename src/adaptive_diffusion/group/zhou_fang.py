@@ -11,29 +11,14 @@ References
 
 from __future__ import annotations
 
-import pathlib
-from typing import Literal, Union
+from typing import Literal, Optional, Union
 
 import numpy as np
 
-from ...utils.grayscale import binarize, grayscale
-from ..kernels import load_ostro_coeffs, load_zf_strength
-
-_THIS_FILE = pathlib.Path(__file__).resolve()
-_THIS_DIR = _THIS_FILE.parent
-_AD_DIR = _THIS_DIR.parent
-_DATA_DIR = _AD_DIR / "kernels" / "data"
-
-_OSTRO_TXT = _DATA_DIR / "weights_ostromoukhov.txt"
-_ZF_TXT = _DATA_DIR / "strengths_zhou_fang.txt"
-
-if not _OSTRO_TXT.exists():
-    raise FileNotFoundError(f"Not found: {_OSTRO_TXT}")
-if not _ZF_TXT.exists():
-    raise FileNotFoundError(f"Not found: {_ZF_TXT}")
-
-__OSTRO_COEFFS = load_ostro_coeffs(_OSTRO_TXT, dtype=np.float32)
-__ZF_STRENGTH = load_zf_strength(_ZF_TXT, dtype=np.float32)
+from ...utils.grayscale import grayscale
+from ...utils.tone import ToneCurve
+from ...utils.workspace import Workspace, prepare_output
+from ..kernels import ostro_coeffs, zf_strength
 
 
 def zhou_fang_bw(
@@ -43,6 +28,9 @@ def zhou_fang_bw(
     serpentine: bool = True,
     noise_scale: float = 1.0,
     seed: Union[int, None] = None,
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
 ) -> np.ndarray:
     """Apply Zhou–Fang variable-threshold error diffusion.
 
@@ -58,24 +46,35 @@ def zhou_fang_bw(
         Scales the threshold jitter amplitude. Default 1.0.
     seed : int | None, optional
         RNG seed for reproducible jitter, default None.
+    tone : ToneCurve | None, optional
+        Tone curve folded into the grayscale conversion. Default None.
+    out : np.ndarray | None, optional
+        Preallocated (H, W) output, written in place and returned. Default None.
+    workspace : Workspace | None, optional
+        Reusable scratch buffers (gray plane, error rows). Default None.
 
     Returns
     -------
     np.ndarray
-        Dithered 1-bit image mapped to `dtype` via `binarize`.
+        Dithered {0,1} image in `dtype` (`out` when given).
     """
     rng = np.random.default_rng(seed)
-    g_base = grayscale(img, dtype)
+    g_base = grayscale(img, dtype, tone=tone, workspace=workspace)
     h, w = g_base.shape
 
-    out_u8 = np.empty((h, w), dtype=np.uint8)
-    err_curr = np.zeros(w, dtype=np.float32)
-    err_next = np.zeros(w, dtype=np.float32)
+    dst = prepare_output((h, w), dtype, out)
+    if workspace is None:
+        err_curr = np.zeros(w, dtype=np.float32)
+        err_next = np.zeros(w, dtype=np.float32)
+    else:
+        err_curr = workspace.zeros("err_row0", (w,))
+        err_next = workspace.zeros("err_row1", (w,))
 
-    n_ostro = __OSTRO_COEFFS.shape[0]
+    coeffs = ostro_coeffs()
+    n_ostro = coeffs.shape[0]
 
     # First positive strength value, or 0.0 if none found
-    jitter_strength = float(next((float(s) for s in __ZF_STRENGTH.flat if s > 0), 0.0))
+    jitter_strength = float(next((float(s) for s in zf_strength().flat if s > 0), 0.0))
 
     for y in range(h):
         flip = serpentine and (y & 1)
@@ -93,7 +92,7 @@ def zhou_fang_bw(
             if idx >= n_ostro:
                 idx = n_ostro - 1
 
-            w_r, w_dl, w_d = __OSTRO_COEFFS[idx]  # right, diag, down
+            w_r, w_dl, w_d = coeffs[idx]  # right, diag, down
 
             # ZF-style threshold jitter in [128..256), scaled by strength and noise_scale
             threshold_t = 128.0 + (rng.random() * 128.0) * jitter_strength * float(noise_scale)
@@ -101,7 +100,7 @@ def zhou_fang_bw(
             # Error diffusion step
             old = g0 + err_curr[x]
             new = 255.0 if old >= threshold_t else 0.0
-            out_u8[y, x] = 255 if new > 0.0 else 0
+            dst[y, x] = 1 if new > 0.0 else 0
             e = old - new
 
             if not flip:
@@ -120,4 +119,4 @@ def zhou_fang_bw(
         # Next row becomes current
         err_curr, err_next = err_next, err_curr
 
-    return binarize(out_u8, dtype)
+    return dst
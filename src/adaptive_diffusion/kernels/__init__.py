@@ -10,9 +10,13 @@ from __future__ import annotations
 from .load_kernel import (
     load_ostro_coeffs,
     load_zf_strength,
+    ostro_coeffs,
+    zf_strength,
 )
 
 __all__ = [
     "load_ostro_coeffs",
     "load_zf_strength",
+    "ostro_coeffs",
+    "zf_strength",
 ]
@@ -2,16 +2,22 @@
 """Kernel loaders for adaptive diffusion dithering.
 
 Provides functions to load and normalize coefficient/strength tables
-used by Ostromoukhov (2001) and Zhou-Fang (2007) algorithms.
+used by Ostromoukhov (2001) and Zhou-Fang (2007) algorithms, plus cached
+accessors for the bundled tables, parsed on first use rather than at import.
 """
 
 from __future__ import annotations
 
+import functools
 import pathlib
 from typing import Union
 
 import numpy as np
 
+DATA_DIR = pathlib.Path(__file__).resolve().parent / "data"
+OSTRO_TXT = DATA_DIR / "weights_ostromoukhov.txt"
+ZF_TXT = DATA_DIR / "strengths_zhou_fang.txt"
+
 
 def load_ostro_coeffs(
     filepath: Union[str, pathlib.Path],
@@ -66,3 +72,26 @@ def load_zf_strength(
     weights = arr[:, 2].astype(np.float64)
     s0 = float(np.clip(np.mean(weights), 0.0, 1.0))
     return np.full((256,), s0, dtype=dtype)
+
+
+def _bundled(path: pathlib.Path) -> pathlib.Path:
+    """Return a bundled data file, or raise if it is missing from the install."""
+    if not path.exists():
+        raise FileNotFoundError(f"Not found: {path}")
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def ostro_coeffs() -> np.ndarray:
+    """Bundled Ostromoukhov table (see `load_ostro_coeffs`), loaded once on first call."""
+    arr = load_ostro_coeffs(_bundled(OSTRO_TXT), dtype=np.float32)
+    arr.setflags(write=False)
+    return arr
+
+
+@functools.lru_cache(maxsize=None)
+def zf_strength() -> np.ndarray:
+    """Bundled Zhou-Fang strengths (see `load_zf_strength`), loaded once on first call."""
+    arr = load_zf_strength(_bundled(ZF_TXT), dtype=np.float32)
+    arr.setflags(write=False)
+    return arr
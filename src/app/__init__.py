@@ -2,30 +2,77 @@
 """Application package for the dithering project.
 
 Exposes CLI argument parsing, task dispatchers, and visualization helpers.
+Each name is imported from its module on first access, so the CLI only pays
+for the task and output path it actually runs.
 """
 
 from __future__ import annotations
 
-from .cli import (
-    check_kernels,
-    parse_args,
-)
-from .tasks import (
-    task_adaptive_diffusion,
-    task_error_diffusion,
-    task_naive,
-    task_ordered,
-    task_random,
-)
-from .visualize import show_images
-
-__all__ = [
-    "parse_args",
-    "check_kernels",
-    "task_adaptive_diffusion",
-    "task_error_diffusion",
-    "task_naive",
-    "task_ordered",
-    "task_random",
-    "show_images",
-]
+import importlib
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from .batch import BatchSummary, collect_inputs, run_batch
+    from .cli import check_kernels, parse_args
+    from .memmap_task import task_memmap
+    from .sequence_task import dither_frames, task_sequence
+    from .stream_task import task_stream
+    from .tasks import (
+        task_adaptive_diffusion,
+        task_all,
+        task_dbs,
+        task_dot_diffusion,
+        task_error_diffusion,
+        task_hybrid,
+        task_multiscale,
+        task_naive,
+        task_ordered,
+        task_random,
+        task_riemersma,
+    )
+    from .visualize import PNGOptions, png_bytes, save_pngs, show_images
+
+# public name -> defining submodule
+_EXPORTS: Dict[str, str] = {
+    "parse_args": "cli",
+    "check_kernels": "cli",
+    "task_adaptive_diffusion": "tasks",
+    "task_all": "tasks",
+    "task_dbs": "tasks",
+    "task_dot_diffusion": "tasks",
+    "task_error_diffusion": "tasks",
+    "task_hybrid": "tasks",
+    "task_multiscale": "tasks",
+    "task_naive": "tasks",
+    "task_ordered": "tasks",
+    "task_random": "tasks",
+    "task_riemersma": "tasks",
+    "task_memmap": "memmap_task",
+    "task_stream": "stream_task",
+    "task_sequence": "sequence_task",
+    "dither_frames": "sequence_task",
+    "run_batch": "batch",
+    "collect_inputs": "batch",
+    "BatchSummary": "batch",
+    "show_images": "visualize",
+    "save_pngs": "visualize",
+    "png_bytes": "visualize",
+    "PNGOptions": "visualize",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import `name` from its submodule on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """Module attributes including the lazily imported exports."""
+    return sorted(list(globals()) + __all__)
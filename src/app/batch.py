@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""Headless batch dithering of image directories.
+
+Runs one task over every image matched by a directory or glob, in a process
+pool, saving the outputs as PNGs without importing matplotlib. Workers load
+their own inputs, so the parent only holds paths; at most ``2 * jobs`` files are
+queued at a time. Inputs whose outputs are already up to date are skipped.
+"""
+
+from __future__ import annotations
+
+import glob
+import inspect
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.result_cache import ResultCache
+from . import tasks
+from .visualize import PNGOptions, save_pngs
+
+IMAGE_SUFFIXES = (
+    ".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp", ".pbm", ".pgm", ".ppm"
+)
+
+TASKS: Dict[str, Callable[..., Tuple[List[np.ndarray], List[str]]]] = {
+    "all": tasks.task_all,
+    "adaptive_diffusion": tasks.task_adaptive_diffusion,
+    "dbs": tasks.task_dbs,
+    "dot_diffusion": tasks.task_dot_diffusion,
+    "error_diffusion": tasks.task_error_diffusion,
+    "hybrid": tasks.task_hybrid,
+    "multi_level": tasks.task_multi_level,
+    "multiscale": tasks.task_multiscale,
+    "naive": tasks.task_naive,
+    "ordered": tasks.task_ordered,
+    "random": tasks.task_random,
+    "riemersma": tasks.task_riemersma,
+}
+
+
+@dataclass
+class BatchSummary:
+    """
+    Outcome of `run_batch`.
+
+    Attributes
+    ----------
+    done, skipped : int
+        Inputs processed, and inputs whose outputs were already up to date.
+    failed : list of (Path, str)
+        Inputs that raised, with the error message.
+    pixels : int
+        Input pixels processed.
+    outputs : int
+        PNG files written.
+    seconds : float
+        Wall-clock time.
+    """
+
+    done: int = 0
+    skipped: int = 0
+    failed: List[Tuple[Path, str]] = field(default_factory=list)
+    pixels: int = 0
+    outputs: int = 0
+    seconds: float = 0.0
+
+    def report(self) -> str:
+        """One-line throughput summary."""
+        secs = max(self.seconds, 1e-9)
+        return (
+            f"{self.done} done, {self.skipped} up to date, {len(self.failed)} failed; "
+            f"{self.outputs} PNGs in {self.seconds:.2f}s "
+            f"({self.done / secs:.2f} files/s, {self.pixels / secs / 1e6:.2f} MP/s)"
+        )
+
+
+def collect_inputs(spec: str) -> List[Path]:
+    """
+    Resolve a directory or glob pattern to a sorted list of image files.
+
+    Parameters
+    ----------
+    spec : str
+        Directory (its images, non-recursive) or glob pattern (``**`` recurses).
+
+    Returns
+    -------
+    List[Path]
+        Image files with a supported suffix.
+
+    Raises
+    ------
+    FileNotFoundError
+        If nothing matches.
+    """
+    path = Path(spec)
+    if path.is_dir():
+        files = [p for p in path.iterdir() if p.is_file()]
+    else:
+        files = [Path(p) for p in glob.glob(spec, recursive=True)]
+    files = sorted(p for p in files if p.suffix.lower() in IMAGE_SUFFIXES and p.is_file())
+    if not files:
+        raise FileNotFoundError(f"No images match {spec!r}")
+    return files
+
+
+def load_rgb(path: Path) -> np.ndarray:
+    """
+    Read an image file as RGB uint8 (gray is replicated, alpha dropped).
+
+    Decodes with Pillow directly; 16-bit samples keep their high byte, as
+    ``skimage.util.img_as_ubyte`` would.
+    """
+    from PIL import Image
+
+    with Image.open(path) as im:
+        if im.mode.startswith("I;16"):
+            img = (np.asarray(im) >> 8).astype(np.uint8)
+        elif im.mode in ("L", "RGB", "RGBA"):
+            img = np.asarray(im)
+        else:
+            img = np.asarray(im.convert("RGB"))
+    if img.ndim == 2:
+        img = np.stack([img, img, img], axis=-1)
+    if img.shape[-1] == 4:
+        img = img[..., :3]
+    return np.ascontiguousarray(img)
+
+
+def _stamp_path(outdir: Path, stem: str, task: str) -> Path:
+    """Record of the outputs written for one input (hidden file in `outdir`)."""
+    return outdir / f".{stem}_{task}.json"
+
+
+def is_up_to_date(src: Path, outdir: Path, task: str, params: Dict[str, Any]) -> bool:
+    """
+    Whether `src` was already processed with the same task and parameters.
+
+    True when its stamp records `params`, every listed output exists, and none
+    is older than `src`.
+    """
+    stamp = _stamp_path(outdir, src.stem, task)
+    try:
+        record = json.loads(stamp.read_text(encoding="utf-8"))
+        mtime = src.stat().st_mtime
+        return record.get("params") == params and all(
+            (outdir / name).stat().st_mtime >= mtime for name in record["outputs"]
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def _process_one(
+    src: Path,
+    outdir: Path,
+    task: str,
+    params: Dict[str, Any],
+    png: PNGOptions,
+    cache: Optional[ResultCache],
+) -> Tuple[int, int]:
+    """Dither one file and save its outputs; returns (pixels, outputs written)."""
+    img = load_rgb(src)
+    fn = TASKS[task]
+    extra = {}
+    if cache is not None and "cache" in inspect.signature(fn).parameters:
+        extra["cache"] = cache
+    outs, names = fn(img, src.stem, save=False, show=False, **params, **extra)
+    paths = save_pngs(outs, names, outdir=outdir, stem=src.stem, task=task, png=png)
+    record = {"params": params, "outputs": [p.name for p in paths]}
+    _stamp_path(outdir, src.stem, task).write_text(json.dumps(record), encoding="utf-8")
+    return img.shape[0] * img.shape[1], len(paths)
+
+
+def run_batch(
+    inputs: List[Path],
+    outdir: Path,
+    *,
+    task: str,
+    params: Optional[Dict[str, Any]] = None,
+    jobs: Optional[int] = None,
+    png: Optional[PNGOptions] = None,
+    force: bool = False,
+    cache: Optional[ResultCache] = None,
+) -> BatchSummary:
+    """
+    Dither many image files headlessly in a process pool.
+
+    Parameters
+    ----------
+    inputs : list of Path
+        Image files (see `collect_inputs`).
+    outdir : Path
+        Output directory; files are named ``{stem}_{task}_{name}.png``.
+    task : str
+        One of `TASKS`.
+    params : dict | None, default None
+        Keyword arguments for the task function (e.g. ``{"kernels": ["floyd_steinberg"]}``);
+        must be JSON-serializable, as they are recorded for up-to-date checks.
+    jobs : int | None, default None
+        Worker processes; None uses the CPU count, 1 runs in this process.
+    png : PNGOptions | None, default None
+        PNG encoding options. Each worker encodes with one thread unless
+        `png.workers` says otherwise.
+    force : bool, default False
+        Reprocess inputs even if their outputs are up to date.
+    cache : ResultCache | None, default None
+        On-disk result cache shared by the workers.
+
+    Returns
+    -------
+    BatchSummary
+        Counts, failures and timing.
+
+    Raises
+    ------
+    ValueError
+        If `task` is unknown or `jobs` < 1.
+    """
+    if task not in TASKS:
+        raise ValueError(f"task must be one of {sorted(TASKS)}")
+    jobs = jobs or os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError("jobs must be >= 1")
+    params = dict(params or {})
+    png = png or PNGOptions(workers=1)
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    summary = BatchSummary()
+    t0 = time.perf_counter()
+    todo: List[Path] = []
+    for src in inputs:
+        if not force and is_up_to_date(src, outdir, task, params):
+            summary.skipped += 1
+        else:
+            todo.append(src)
+
+    def record(src: Path, result: Callable[[], Tuple[int, int]]) -> None:
+        try:
+            pixels, outputs = result()
+        except Exception as exc:  # record and keep going; callers report `summary.failed`
+            summary.failed.append((src, f"{type(exc).__name__}: {exc}"))
+            return
+        summary.done += 1
+        summary.pixels += pixels
+        summary.outputs += outputs
+
+    if jobs == 1 or len(todo) <= 1:
+        for src in todo:
+            record(src, lambda src=src: _process_one(src, outdir, task, params, png, cache))
+    else:
+        # imported here: the process pool pulls in multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+            pending: Dict[Future, Path] = {}
+            for src in todo:
+                pending[pool.submit(_process_one, src, outdir, task, params, png, cache)] = src
+                if len(pending) >= 2 * jobs:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        record(pending.pop(fut), fut.result)
+            for fut in list(pending):
+                record(pending.pop(fut), fut.result)
+
+    summary.seconds = time.perf_counter() - t0
+    return summary
@@ -102,14 +102,20 @@ def parse_args() -> argparse.Namespace:
         "--task",
         choices=[
             "adaptive_diffusion",
+            "all",
+            "dbs",
+            "dot_diffusion",
             "error_diffusion",
+            "hybrid",
             "multi_level",
+            "multiscale",
             "naive",
             "ordered",
             "random",
+            "riemersma",
         ],
         default="error_diffusion",
-        help="Which task to run.",
+        help="Which task to run; 'all' runs every task, converting each image once.",
     )
     p.add_argument(
         "--kernels",
@@ -134,6 +140,12 @@ def parse_args() -> argparse.Namespace:
         default=4,
         help="(multi_level) Number of gray levels (>=2).",
     )
+    p.add_argument(
+        "--palette",
+        choices=["linspace", "multi_otsu"],
+        default="linspace",
+        help="(multi_level) Evenly spaced gray levels, or multi-Otsu levels of the image.",
+    )
     p.add_argument(
         "--bayer-n",
         type=int,
@@ -141,9 +153,146 @@ def parse_args() -> argparse.Namespace:
         choices=[2, 4, 8, 16],
         help="(ordered) Bayer matrix size (power of two).",
     )
+    p.add_argument(
+        "--dbs-iters",
+        type=int,
+        default=10,
+        help="(dbs) Maximum direct binary search passes.",
+    )
+    p.add_argument(
+        "--dbs-seconds",
+        type=float,
+        default=None,
+        help="(dbs) Time budget per search in seconds (results are then not cached).",
+    )
     p.add_argument(
         "--save",
         action="store_true",
         help="Save each output PNG into ./output/",
     )
+    p.add_argument(
+        "--compress-level",
+        type=int,
+        default=6,
+        choices=range(10),
+        metavar="0..9",
+        help="zlib level for saved PNGs (also --large-out .png).",
+    )
+    p.add_argument(
+        "--png-filter",
+        choices=["none", "sub", "up", "average", "paeth"],
+        default=None,
+        help="PNG row filter; default 'none' for 1/2/4-bit and indexed outputs, 'paeth' otherwise.",
+    )
+    p.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help=(
+            "Reuse results across runs from this content-addressed cache directory "
+            "(keyed on pixels, canonical parameters and library version)."
+        ),
+    )
+    p.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=1024,
+        help="Size bound of --cache-dir; least recently used results are evicted.",
+    )
+    p.add_argument(
+        "--input",
+        type=str,
+        default=None,
+        help=(
+            "Batch mode: dither every image in this directory or glob (quote it) "
+            "headlessly, without matplotlib. Requires --output."
+        ),
+    )
+    p.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="(batch) Output directory for the PNGs.",
+    )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="(batch, frames) Worker processes (default: CPU count).",
+    )
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="(batch) Reprocess inputs whose outputs are already up to date.",
+    )
+    p.add_argument(
+        "--large-in",
+        type=str,
+        default=None,
+        help=(
+            "(naive/ordered/error_diffusion) Dither this file band by band instead of a "
+            "demo image: .npy, uncompressed TIFF or raw (memory-mapped), or "
+            "PNG/PBM/PGM/PPM (row-streamed). Requires --large-out."
+        ),
+    )
+    p.add_argument(
+        "--large-out",
+        type=str,
+        default=None,
+        help=(
+            "Output for --large-in: .tif (bilevel palette), .npy or raw {0,1} uint8 "
+            "(memory-mapped), or 1-bit .png, .pbm, .pgm (row-streamed)."
+        ),
+    )
+    p.add_argument(
+        "--frames-in",
+        type=str,
+        default=None,
+        help=(
+            "(naive/ordered/random/error_diffusion) Dither every frame of this animated "
+            "GIF/APNG/WebP, video, .npy (N, H, W[, C]) stack, or directory/glob of stills "
+            "into a 1-bit animation, with --jobs frames in parallel. Requires --frames-out."
+        ),
+    )
+    p.add_argument(
+        "--frames-out",
+        type=str,
+        default=None,
+        help="Output animation for --frames-in: .gif, or .png/.apng (APNG).",
+    )
+    p.add_argument(
+        "--ordered-kind",
+        choices=["bayer", "blue_noise"],
+        default="blue_noise",
+        help="(frames, ordered) Bayer matrix (--bayer-n) or a 64x64 blue-noise tile.",
+    )
+    p.add_argument(
+        "--frame-ms",
+        type=int,
+        default=None,
+        help="(frames) Display time of every frame; default keeps the source timing.",
+    )
+    p.add_argument(
+        "--no-delta",
+        action="store_true",
+        help="(frames) Store every frame whole instead of as a delta over the previous one.",
+    )
+    p.add_argument(
+        "--band-rows",
+        type=int,
+        default=1024,
+        help="(large) Rows processed per band.",
+    )
+    p.add_argument(
+        "--raw-shape",
+        type=str,
+        default=None,
+        help="(large) Shape of a raw input file as H,W or H,W,C.",
+    )
+    p.add_argument(
+        "--raw-dtype",
+        type=str,
+        default="uint8",
+        help="(large) Sample dtype of a raw input file.",
+    )
     return p.parse_args()
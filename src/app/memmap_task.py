@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Band-by-band dithering of memory-mapped images.
+
+Reads a ``.npy``, uncompressed TIFF or raw image as a memmap, dithers it in
+row bands, and writes the result straight into a memory-mapped output file,
+so memory stays bounded by a few bands whatever the image size.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Literal, Optional, Tuple, Union
+
+import numpy as np
+
+from ..error_diffusion import error_diff_bw
+from ..naive import threshold_bw
+from ..ordered import ordered_bw
+from ..utils.mmap_io import create_image_memmap, open_image_memmap
+from ..utils.workspace import Workspace
+
+
+def task_memmap(
+    in_path: Union[str, Path],
+    out_path: Union[str, Path],
+    *,
+    task: Literal["naive", "ordered", "error_diffusion"] = "error_diffusion",
+    band_rows: int = 1024,
+    threshold: float = 128,
+    kernel: str = "floyd_steinberg",
+    n: int = 8,
+    serpentine: bool = True,
+    raw_shape: Optional[Tuple[int, ...]] = None,
+    raw_dtype: Union[np.dtype, type] = np.uint8,
+) -> Path:
+    """
+    Dither a memory-mapped image into a memory-mapped output file.
+
+    Parameters
+    ----------
+    in_path : str | Path
+        Input ``.npy``, uncompressed ``.tif``/``.tiff``, or raw file.
+    out_path : str | Path
+        Output path; ``.tif``/``.tiff`` is written as a bilevel palette TIFF,
+        ``.npy`` and raw files hold {0, 1} uint8.
+    task : {"naive", "ordered", "error_diffusion"}, default "error_diffusion"
+        Global threshold, Bayer (n) ordered dithering, or error diffusion.
+    band_rows : int, default 1024
+        Rows per band.
+    threshold : float, default 128
+        Threshold for "naive" and "error_diffusion".
+    kernel : str, default "floyd_steinberg"
+        Diffusion kernel for "error_diffusion".
+    n : int, default 8
+        Bayer matrix size for "ordered".
+    serpentine : bool, default True
+        Serpentine scanning for "error_diffusion".
+    raw_shape : tuple | None, default None
+        (H, W) or (H, W, C) of a raw input file.
+    raw_dtype : np.dtype | type, default np.uint8
+        Sample dtype of a raw input file.
+
+    Returns
+    -------
+    Path
+        The output path.
+
+    Raises
+    ------
+    ValueError
+        If `task` is not supported for memory-mapped processing.
+    """
+    src = open_image_memmap(in_path, shape=raw_shape, dtype=raw_dtype)
+    out_path = Path(out_path)
+    dst = create_image_memmap(
+        out_path,
+        src.shape[:2],
+        np.uint8,
+        bilevel=out_path.suffix.lower() in (".tif", ".tiff"),
+    )
+    ws = Workspace()
+
+    if task == "naive":
+        threshold_bw(src, threshold=threshold, band_rows=band_rows, out=dst, workspace=ws)
+    elif task == "ordered":
+        ordered_bw(src, kind="bayer", n=n, band_rows=band_rows, out=dst, workspace=ws)
+    elif task == "error_diffusion":
+        error_diff_bw(
+            src,
+            kernel_type=kernel,
+            threshold=threshold,
+            serpentine=serpentine,
+            band_rows=band_rows,
+            out=dst,
+            workspace=ws,
+        )
+    else:
+        raise ValueError("task must be 'naive', 'ordered' or 'error_diffusion'")
+
+    dst.flush()
+    return out_path
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""Frame-sequence (video, animated GIF/APNG) -> dither -> animation pipeline.
+
+Frames are decoded lazily (`utils.sequence_io.FrameReader`), dithered by one
+configured `Ditherer` per worker, whose workspace is reused for every frame,
+and encoded one at a time into a streaming GIF/APNG writer. With several jobs,
+frames are dithered in a process pool with at most ``2 * jobs`` in flight and
+written back in input order.
+
+Error diffusion decides every dot from the scan before it, so small changes
+between frames move dots all over the frame and flicker. Fixed threshold
+fields (ordered Bayer or blue-noise tiles, a counter-keyed noise field) dither
+each pixel from its own value and position only: static content stays
+bit-identical across frames, which also keeps the delta frames small.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, Literal, Optional, Sequence, Union
+
+import numpy as np
+
+from ..utils.ditherer import Ditherer
+from ..utils.sequence_io import FrameReader, open_frame_writer
+
+_SEQUENCE_TASKS = ("naive", "ordered", "random", "error_diffusion")
+
+# Ditherer of each pool worker, built once by `_init_worker`
+_WORKER_DITHERER: Optional[Ditherer] = None
+
+
+def make_ditherer(
+    task: Literal["naive", "ordered", "random", "error_diffusion"],
+    *,
+    threshold: float = 128,
+    kind: Literal["bayer", "halftone", "blue_noise"] = "blue_noise",
+    n: int = 64,
+    kernel: str = "floyd_steinberg",
+    serpentine: bool = True,
+    amount: float = 0.05,
+    seed: Optional[int] = None,
+) -> Ditherer:
+    """
+    Build the configured ditherer of a sequence task.
+
+    Parameters
+    ----------
+    task : {"naive", "ordered", "random", "error_diffusion"}
+        Global threshold, ordered tile, counter-keyed noise field, or error
+        diffusion.
+    threshold : float, default 128
+        Threshold for "naive", "random" and "error_diffusion".
+    kind : {"bayer", "halftone", "blue_noise"}, default "blue_noise"
+        Tile of "ordered".
+    n : int, default 64
+        Tile size of "ordered".
+    kernel : str, default "floyd_steinberg"
+        Diffusion kernel for "error_diffusion".
+    serpentine : bool, default True
+        Serpentine scanning for "error_diffusion".
+    amount : float, default 0.05
+        Noise amplitude of "random".
+    seed : int | None, default None
+        Noise field seed of "random"; pass a resolved seed when several
+        processes must share one field.
+
+    Returns
+    -------
+    Ditherer
+        A new ditherer with its own workspace.
+
+    Raises
+    ------
+    ValueError
+        If `task` is not supported or its options are invalid.
+    """
+    if task == "naive":
+        from ..naive import ThresholdDitherer
+
+        return ThresholdDitherer(threshold)
+    if task == "ordered":
+        from ..ordered import OrderedDitherer
+
+        return OrderedDitherer(kind, n)
+    if task == "random":
+        from ..random import RandomDitherer
+
+        return RandomDitherer(threshold, amount=amount, seed=seed)
+    if task == "error_diffusion":
+        from ..error_diffusion import ErrorDiffuser
+
+        return ErrorDiffuser(kernel, threshold=threshold, serpentine=serpentine)
+    raise ValueError(f"task must be one of {_SEQUENCE_TASKS}")
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Pool initializer: build this worker's ditherer once."""
+    global _WORKER_DITHERER
+    _WORKER_DITHERER = make_ditherer(**config)
+
+
+def _dither_in_worker(frame: np.ndarray) -> np.ndarray:
+    return _WORKER_DITHERER(frame)
+
+
+def dither_frames(
+    frames: Iterable[np.ndarray],
+    config: Dict[str, Any],
+    *,
+    jobs: int = 1,
+) -> Iterator[np.ndarray]:
+    """
+    Dither a stream of frames, yielding the results in input order.
+
+    Parameters
+    ----------
+    frames : iterable of np.ndarray
+        (H, W) or (H, W, C) frames; consumed lazily.
+    config : dict
+        Keyword arguments of `make_ditherer`. For "random" the seed must be
+        given for all jobs to share one noise field (see
+        `random.group.counter.resolve_counter_seed`).
+    jobs : int, default 1
+        Worker processes; 1 dithers in this process. Each worker builds one
+        ditherer and reuses it, and with it its workspace, for all its frames.
+
+    Yields
+    ------
+    np.ndarray
+        {0, 1} uint8 (H, W) result of each frame.
+
+    Raises
+    ------
+    ValueError
+        If `jobs` < 1 or `config` is invalid.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be >= 1")
+    ditherer = make_ditherer(**config)  # validates the configuration up front
+    if jobs == 1:
+        for frame in frames:
+            yield ditherer(frame)
+        return
+
+    # imported here: the process pool pulls in multiprocessing
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(config,)
+    ) as pool:
+        pending: Deque[Future] = deque()
+        for frame in frames:
+            pending.append(pool.submit(_dither_in_worker, np.asarray(frame)))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def task_sequence(
+    in_path: Union[str, Path, Sequence[Union[str, Path]]],
+    out_path: Union[str, Path],
+    *,
+    task: Literal["naive", "ordered", "random", "error_diffusion"] = "ordered",
+    kind: Literal["bayer", "halftone", "blue_noise"] = "blue_noise",
+    n: int = 64,
+    threshold: float = 128,
+    kernel: str = "floyd_steinberg",
+    serpentine: bool = True,
+    amount: float = 0.05,
+    seed: Optional[int] = None,
+    jobs: int = 1,
+    delta: bool = True,
+    loop: int = 0,
+    duration_ms: Optional[int] = None,
+    compress_level: int = 6,
+) -> int:
+    """
+    Dither a video, animation or frame list into a 1-bit animated GIF/APNG.
+
+    Parameters
+    ----------
+    in_path : str | Path | sequence of str | Path
+        Animated GIF/APNG/WebP, multi-page TIFF, video (via imageio), ``.npy``
+        (N, H, W[, C]) stack, or a list of still image files in frame order.
+    out_path : str | Path
+        ``.gif``, or ``.png``/``.apng``.
+    task : {"naive", "ordered", "random", "error_diffusion"}, default "ordered"
+        Dithering method (see `make_ditherer`); all but "error_diffusion" are
+        temporally stable.
+    kind : {"bayer", "halftone", "blue_noise"}, default "blue_noise"
+        Tile of "ordered".
+    n : int, default 64
+        Tile size of "ordered".
+    threshold : float, default 128
+        Threshold for "naive", "random" and "error_diffusion".
+    kernel : str, default "floyd_steinberg"
+        Diffusion kernel for "error_diffusion".
+    serpentine : bool, default True
+        Serpentine scanning for "error_diffusion".
+    amount : float, default 0.05
+        Noise amplitude of "random".
+    seed : int | None, default None
+        Noise field seed of "random"; None draws one, shared by all frames.
+    jobs : int, default 1
+        Worker processes dithering frames in parallel (output order is kept).
+    delta : bool, default True
+        Store each frame after the first as a transparent delta over the previous one.
+    loop : int, default 0
+        Repetitions (0 = forever).
+    duration_ms : int | None, default None
+        Display time of every frame; None keeps the source's timing (100 ms
+        when it has none).
+    compress_level : int, default 6
+        zlib level for APNG output.
+
+    Returns
+    -------
+    int
+        Number of frames written.
+
+    Raises
+    ------
+    ValueError
+        If the task, its options or the output suffix are invalid, the input
+        has no frames, or frames differ in size.
+    """
+    config: Dict[str, Any] = {
+        "task": task,
+        "threshold": threshold,
+        "kind": kind,
+        "n": n,
+        "kernel": kernel,
+        "serpentine": serpentine,
+        "amount": amount,
+        "seed": seed,
+    }
+    if task == "random":
+        from ..random.group.counter import resolve_counter_seed
+
+        # one noise field for every frame and every worker
+        config["seed"] = resolve_counter_seed(seed)
+
+    writer = None
+    with ExitStack() as stack:
+        reader = stack.enter_context(FrameReader(in_path))
+        for i, res in enumerate(dither_frames(reader, config, jobs=jobs)):
+            if writer is None:
+                h, w = res.shape
+                # Closed on success; on error only the file is released
+                writer = stack.enter_context(
+                    open_frame_writer(
+                        out_path,
+                        w,
+                        h,
+                        loop=loop,
+                        delta=delta,
+                        n_frames=reader.n_frames,
+                        compress_level=compress_level,
+                    )
+                )
+            duration = reader.durations[i] if duration_ms is None else duration_ms
+            writer.write_frame(res, duration)
+        if writer is None:
+            raise ValueError(f"{in_path}: no frames")
+    return writer.frames_written
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Row-streaming file -> dither -> file pipeline.
+
+Decodes the input band by band (PNG/PBM/PGM/PPM via `utils.stream_io`, or a
+memory-mapped ``.npy``/TIFF/raw file), dithers each band, and encodes it
+straight into the output, so memory stays constant whatever the image height.
+Ordered dithering keeps its tile phase through `origin`; error diffusion
+carries its error rows from band to band through the workspace (`resume`).
+"""
+
+from __future__ import annotations
+
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Iterator, Literal, Optional, Tuple, Union
+
+import numpy as np
+
+from ..error_diffusion import error_diff_bw
+from ..naive import threshold_bw
+from ..ordered import ordered_bw
+from ..utils.mmap_io import create_image_memmap, open_image_memmap
+from ..utils.prep_img import gray_input_scale
+from ..utils.stream_io import is_stream_path, open_row_reader, open_row_writer
+from ..utils.workspace import Workspace
+
+_STREAM_TASKS = ("naive", "ordered", "error_diffusion")
+
+
+def task_stream(
+    in_path: Union[str, Path],
+    out_path: Union[str, Path],
+    *,
+    task: Literal["naive", "ordered", "error_diffusion"] = "error_diffusion",
+    band_rows: int = 256,
+    threshold: float = 128,
+    kernel: str = "floyd_steinberg",
+    n: int = 8,
+    serpentine: bool = True,
+    raw_shape: Optional[Tuple[int, ...]] = None,
+    raw_dtype: Union[np.dtype, type] = np.uint8,
+    compress_level: int = 6,
+) -> Path:
+    """
+    Dither an image file band by band into an output file.
+
+    Parameters
+    ----------
+    in_path : str | Path
+        PNG/PBM/PGM/PPM (streamed), or ``.npy``/uncompressed TIFF/raw (memory-mapped).
+    out_path : str | Path
+        ``.png`` (1-bit), ``.pbm``, ``.pgm``/``.pnm`` (streamed), or
+        ``.tif``/``.npy``/raw (memory-mapped, see `task_memmap`).
+    task : {"naive", "ordered", "error_diffusion"}, default "error_diffusion"
+        Global threshold, Bayer (n) ordered dithering, or error diffusion.
+    band_rows : int, default 256
+        Rows decoded, dithered and encoded per step.
+    threshold : float, default 128
+        Threshold for "naive" and "error_diffusion".
+    kernel : str, default "floyd_steinberg"
+        Diffusion kernel for "error_diffusion".
+    n : int, default 8
+        Bayer matrix size for "ordered".
+    serpentine : bool, default True
+        Serpentine scanning for "error_diffusion".
+    raw_shape : tuple | None, default None
+        (H, W) or (H, W, C) of a raw input file.
+    raw_dtype : np.dtype | type, default np.uint8
+        Sample dtype of a raw input file.
+    compress_level : int, default 6
+        zlib level for PNG output.
+
+    Returns
+    -------
+    Path
+        The output path.
+
+    Raises
+    ------
+    ValueError
+        If `task` is not supported or `band_rows` < 1.
+    """
+    if task not in _STREAM_TASKS:
+        raise ValueError("task must be 'naive', 'ordered' or 'error_diffusion'")
+    if band_rows < 1:
+        raise ValueError("band_rows must be >= 1")
+
+    scale = None
+    with ExitStack() as stack:
+        if is_stream_path(in_path):
+            reader = stack.enter_context(open_row_reader(in_path))
+            shape = reader.shape
+            bands: Iterator[np.ndarray] = reader.iter_bands(band_rows)
+        else:
+            src = open_image_memmap(in_path, shape=raw_shape, dtype=raw_dtype)
+            shape = src.shape
+            # One input range for every band (float files may hold [0..1] or [0..255])
+            scale = gray_input_scale(src, band_rows)
+            bands = (src[y0:y0 + band_rows] for y0 in range(0, shape[0], band_rows))
+        h, w = shape[:2]
+
+        out_path = Path(out_path)
+        writer, dst = None, None
+        if is_stream_path(out_path):
+            # Closed on success; on error only the file is released
+            writer = stack.enter_context(
+                open_row_writer(out_path, w, h, bilevel=True, compress_level=compress_level)
+            )
+        else:
+            dst = create_image_memmap(
+                out_path, (h, w), np.uint8, bilevel=out_path.suffix.lower() in (".tif", ".tiff")
+            )
+
+        ws = Workspace()
+        y0 = 0
+        for band in bands:
+            rows = band.shape[0]
+            out = None if dst is None else dst[y0:y0 + rows]
+            if task == "naive":
+                res = threshold_bw(
+                    band, threshold=threshold, out=out, workspace=ws, input_scale=scale
+                )
+            elif task == "ordered":
+                res = ordered_bw(
+                    band,
+                    kind="bayer",
+                    n=n,
+                    origin=(y0, 0),
+                    out=out,
+                    workspace=ws,
+                    input_scale=scale,
+                )
+            else:
+                res = error_diff_bw(
+                    band,
+                    kernel_type=kernel,
+                    threshold=threshold,
+                    serpentine=serpentine,
+                    out=out,
+                    workspace=ws,
+                    resume=y0 > 0,
+                    row_offset=y0,
+                    input_scale=scale,
+                )
+            if writer is not None:
+                writer.write_rows(res)
+            y0 += rows
+
+        if dst is not None:
+            dst.flush()
+    return out_path
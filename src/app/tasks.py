@@ -2,28 +2,45 @@
 """Task runners for the dithering demo.
 
 Each task takes an input image and returns a list of output images plus their names.
+Algorithm packages are imported inside the task that uses them, so running one
+task does not load the others.
 """
 
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Callable, List, Literal, Optional, Tuple
 
 import numpy as np
 
-from ..adaptive_diffusion import adaptive_diff_bw
-from ..error_diffusion import error_diff_bw
-from ..multi_level import palette_bw
-from ..naive import threshold_bw
-from ..ordered import ordered_bw
-from ..utils import grayscale
-from .visualize import show_images
+from ..utils import IntermediateCache, ResultCache, Workspace, gray_histogram, grayscale
+from .visualize import PNGOptions, show_images
 
 THIS_FILE = Path(__file__).resolve()
 ROOT = THIS_FILE.parents[2]
 OUT = ROOT / "output"
 
 
+def _run(
+    cache: Optional[ResultCache], fn: Callable[..., np.ndarray], img: np.ndarray, **kwargs: Any
+) -> np.ndarray:
+    """Call ``fn(img, **kwargs)``, through `cache` when one is given."""
+    if cache is None:
+        return fn(img, **kwargs)
+    return cache.run(fn, img, **kwargs)
+
+
+def _workspace(workspace: Optional[Workspace]) -> Workspace:
+    """`workspace`, or a new one whose intermediates live for one task call."""
+    return workspace if workspace is not None else Workspace(intermediates=IntermediateCache())
+
+
+def _gray_histogram(img: np.ndarray, ws: Workspace) -> np.ndarray:
+    """Histogram of the "u8"-path gray plane, shared through the workspace."""
+    g = grayscale(img, "u8", workspace=ws)
+    return ws.image_memo(img, "hist", (g.dtype.str, None), lambda: gray_histogram(g))
+
+
 def task_adaptive_diffusion(
     img: np.ndarray,
     img_name: str,
@@ -31,32 +48,55 @@ def task_adaptive_diffusion(
     serpentine: bool = True,
     save: bool = False,
     outdir: Path = ROOT / "output",
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
 ) -> Tuple[List[np.ndarray], List[str]]:
     """Adaptive diffusion dithering: Ostromoukhov and Zhou-Fang."""
+    # the method functions directly: adaptive_diff_bw's unused seed=None would
+    # make the Ostromoukhov call uncacheable
+    from ..adaptive_diffusion.group import ostromoukhov_bw, zhou_fang_bw
+
+    ws = _workspace(workspace)
+
     outs, names = [], []
 
-    d_ostro = adaptive_diff_bw(
+    d_ostro = _run(
+        cache,
+        ostromoukhov_bw,
         img,
-        method="ostromoukhov",
         dtype="u8",
         threshold=128,
         serpentine=serpentine,
+        workspace=ws,
     )
     outs.append(d_ostro)
     names.append("ostromoukhov")
 
-    d_zf = adaptive_diff_bw(
+    d_zf = _run(
+        cache,
+        zhou_fang_bw,
         img,
-        method="zhou_fang",
         dtype="u8",
         serpentine=serpentine,
         noise_scale=1.0,
         seed=42,
+        workspace=ws,
     )
     outs.append(d_zf)
     names.append("zhou_fang")
 
-    show_images(outs, names, save=save, outdir=outdir, stem=img_name, task="adaptive_diffusion")
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="adaptive_diffusion",
+        png=png,
+        show=show,
+    )
     return outs, names
 
 
@@ -69,20 +109,237 @@ def task_error_diffusion(
     serpentine=True,
     save=False,
     outdir: Path = ROOT / "output",
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
 ) -> Tuple[List[np.ndarray], List[str]]:
     """Error diffusion dithering with the specified kernels."""
+    from ..error_diffusion import error_diff_bw
+
+    ws = _workspace(workspace)
+
     outs, names = [], []
     for kname in kernels:
-        d_img = error_diff_bw(
+        d_img = _run(
+            cache,
+            error_diff_bw,
             img,
             dtype="u8",
             kernel_type=kname,
             threshold=threshold,
             serpentine=serpentine,
+            workspace=ws,
         )
         outs.append(d_img)
         names.append(kname)
-    show_images(outs, names, save=save, outdir=outdir, stem=img_name, task="error_diffusion")
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="error_diffusion",
+        png=png,
+        show=show,
+    )
+    return outs, names
+
+
+def task_hybrid(
+    img: np.ndarray,
+    img_name: str,
+    *,
+    threshold: int | float = 128,
+    serpentine: bool = True,
+    save: bool = False,
+    outdir: Path = OUT,
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
+) -> Tuple[List[np.ndarray], List[str]]:
+    """Hybrid dithering: threshold on text/line-art blocks, Floyd-Steinberg on photo blocks."""
+    from ..hybrid import hybrid_bw
+
+    ws = _workspace(workspace)
+
+    d_img = _run(
+        cache, hybrid_bw, img, dtype="u8", threshold=threshold, serpentine=serpentine, workspace=ws
+    )
+
+    outs = [d_img]
+    names = ["threshold_floyd_steinberg"]
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="hybrid",
+        png=png,
+        show=show,
+    )
+    return outs, names
+
+
+def task_multiscale(
+    img: np.ndarray,
+    img_name: str,
+    *,
+    save: bool = False,
+    outdir: Path = OUT,
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
+) -> Tuple[List[np.ndarray], List[str]]:
+    """Multiscale error diffusion: dots assigned top-down over a quadtree of block sums."""
+    from ..error_diffusion import multiscale_bw
+
+    ws = _workspace(workspace)
+
+    d_img = _run(cache, multiscale_bw, img, dtype="u8", workspace=ws)
+
+    outs = [d_img]
+    names = ["pyramid"]
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="multiscale",
+        png=png,
+        show=show,
+    )
+    return outs, names
+
+
+def task_dot_diffusion(
+    img: np.ndarray,
+    img_name: str,
+    *,
+    threshold: int | float = 128,
+    save: bool = False,
+    outdir: Path = OUT,
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
+) -> Tuple[List[np.ndarray], List[str]]:
+    """Dot diffusion with Knuth's and the optimized 8×8 class matrices."""
+    from ..dot_diffusion import dot_diff_bw
+
+    ws = _workspace(workspace)
+
+    outs, names = [], []
+    for matrix in ("knuth", "optimized"):
+        d_img = _run(
+            cache,
+            dot_diff_bw,
+            img,
+            dtype="u8",
+            class_matrix=matrix,
+            threshold=threshold,
+            workspace=ws,
+        )
+        outs.append(d_img)
+        names.append(f"{matrix}_8")
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="dot_diffusion",
+        png=png,
+        show=show,
+    )
+    return outs, names
+
+
+def task_dbs(
+    img: np.ndarray,
+    img_name: str,
+    *,
+    max_iter: int = 10,
+    time_budget: Optional[float] = None,
+    save: bool = False,
+    outdir: Path = OUT,
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
+) -> Tuple[List[np.ndarray], List[str]]:
+    """Direct binary search seeded from dot diffusion and from Floyd-Steinberg.
+
+    `time_budget` (seconds) applies to each search.
+    """
+    from ..dbs import dbs_bw
+    from ..error_diffusion import error_diff_bw
+
+    ws = _workspace(workspace)
+
+    fs = _run(cache, error_diff_bw, img, dtype="u8", kernel_type="floyd_steinberg", workspace=ws)
+    outs, names = [], []
+    for seed_name, init in (("dot", None), ("floyd_steinberg", fs)):
+        d_img = _run(
+            cache,
+            dbs_bw,
+            img,
+            init=init,
+            dtype="u8",
+            max_iter=max_iter,
+            time_budget=time_budget,
+            workspace=ws,
+        )
+        outs.append(d_img)
+        names.append(f"{seed_name}_seed")
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="dbs",
+        png=png,
+        show=show,
+    )
+    return outs, names
+
+
+def task_riemersma(
+    img: np.ndarray,
+    img_name: str,
+    *,
+    threshold: int | float = 128,
+    save: bool = False,
+    outdir: Path = OUT,
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
+) -> Tuple[List[np.ndarray], List[str]]:
+    """Riemersma dithering along a Hilbert curve (16-error history, weights 1 to 1/16)."""
+    from ..riemersma import riemersma_bw
+
+    ws = _workspace(workspace)
+
+    d_img = _run(cache, riemersma_bw, img, dtype="u8", threshold=threshold, workspace=ws)
+
+    outs = [d_img]
+    names = ["hilbert_16"]
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="riemersma",
+        png=png,
+        show=show,
+    )
     return outs, names
 
 
@@ -93,10 +350,19 @@ def task_naive(
     threshold: int | float = 128,
     save: bool = False,
     outdir: Path = OUT,
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
 ) -> Tuple[List[np.ndarray], List[str]]:
     """Naive thresholding variants: global, mean, percentile, Otsu."""
+    from ..naive import threshold_bw
+
+    ws = _workspace(workspace)
+
     outs: List[np.ndarray] = []
     names: List[str] = []
+    hist = _gray_histogram(img, ws)
 
     cfgs = [
         ("global", {"threshold": threshold}),
@@ -106,11 +372,22 @@ def task_naive(
     ]
 
     for method, kwargs in cfgs:
-        d = threshold_bw(img, dtype="u8", method=method, **kwargs)
+        d = _run(
+            cache, threshold_bw, img, dtype="u8", method=method, hist=hist, workspace=ws, **kwargs
+        )
         outs.append(d)
         names.append(f"naive_{method}")
 
-    show_images(outs, names, save=save, outdir=outdir, stem=img_name, task="naive")
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="naive",
+        png=png,
+        show=show,
+    )
     return outs, names
 
 
@@ -118,19 +395,38 @@ def task_random(
     img: np.ndarray,
     img_name: str,
     *,
+    seed: Optional[int] = None,
     save: bool = False,
     outdir: Path = ROOT / "output",
+    png: Optional[PNGOptions] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
 ) -> Tuple[List[np.ndarray], List[str]]:
-    """Noise dithering: per-pixel random threshold in [0..255]."""
-    g = grayscale(img, "u8")
-    rng = np.random.default_rng()
-    noise = rng.integers(0, 256, size=g.shape, dtype=np.uint16)
+    """Noise dithering: per-pixel random threshold in [0..255].
+
+    Thresholds are keyed on (seed, y, x), so any tiling of the image gives the same output.
+    """
+    from ..random.group import counter_integers
+
+    ws = _workspace(workspace)
+
+    g = grayscale(img, "u8", workspace=ws)
+    noise = counter_integers(0, 256, g.shape, seed=seed)
 
     d = np.where(g >= noise, 255, 0).astype(np.uint8)
 
     outs = [d]
     names = ["random_threshold"]
-    show_images(outs, names, save=save, outdir=outdir, stem=img_name, task="random")
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="random",
+        png=png,
+        show=show,
+    )
     return outs, names
 
 
@@ -141,24 +437,42 @@ def task_ordered(
     n: int = 8,
     save: bool = False,
     outdir: Path = OUT,
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
 ) -> Tuple[List[np.ndarray], List[str]]:
     """Ordered dithering showcase: Bayer (n) and halftone (n @ 45°)."""
-    gray = grayscale(img, "u8")
+    from ..ordered import ordered_bw
 
-    d_bayer = ordered_bw(gray, kind="bayer", n=n, dtype="u8")
-    d_half = ordered_bw(
-        gray,
+    ws = _workspace(workspace)
+
+    d_bayer = _run(cache, ordered_bw, img, kind="bayer", n=n, dtype="u8", workspace=ws)
+    d_half = _run(
+        cache,
+        ordered_bw,
+        img,
         kind="halftone",
         n=n,
         angle_deg=45.0,
         spot="cos+cos",
         dtype="u8",
+        workspace=ws,
     )
 
     outs = [d_bayer, d_half]
     names = [f"bayer_{n}", f"halftone_{n}px_45deg"]
 
-    show_images(outs, names, save=save, outdir=outdir, stem=img_name, task="ordered")
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="ordered",
+        png=png,
+        show=show,
+    )
     return outs, names
 
 
@@ -168,27 +482,154 @@ def task_multi_level(
     *,
     levels: int = 4,
     kernel_type: str = "floyd_steinberg",
+    palette_mode: Literal["linspace", "multi_otsu"] = "linspace",
     save: bool = False,
     outdir: Path = OUT,
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
 ) -> Tuple[List[np.ndarray], List[str]]:
-    """Multi-level grayscale dithering using palette-based error diffusion."""
+    """Multi-level grayscale dithering using palette-based error diffusion.
+
+    The gray levels are either evenly spaced (`linspace`) or derived from a
+    multi-Otsu split of the image histogram (`multi_otsu`, see `multi_otsu_levels`).
+    """
+    from ..multi_level import palette_bw
+    from ..naive.group import multi_otsu_levels
+
+    ws = _workspace(workspace)
+
     if levels < 2:
         raise ValueError("levels must be >= 2")
 
-    if levels == 2:
+    if palette_mode == "multi_otsu":
+        values = multi_otsu_levels(_gray_histogram(img, ws), levels)
+        palette = [(int(v), int(v), int(v)) for v in values]
+    elif palette_mode != "linspace":
+        raise ValueError("palette_mode must be 'linspace' or 'multi_otsu'")
+    elif levels == 2:
         palette = [(0, 0, 0), (255, 255, 255)]
     else:
         values = np.rint(np.linspace(0, 255, levels)).astype(np.uint8)
         palette = [(int(v), int(v), int(v)) for v in values]
 
-    d_img = palette_bw(
+    d_img = _run(
+        cache,
+        palette_bw,
         img,
         palette=palette,
         kernel_type=kernel_type,
         serpentine=True,
+        workspace=ws,
     )
 
     outs = [d_img]
-    names = [f"multi_level_{levels}"]
-    show_images(outs, names, save=save, outdir=outdir, stem=img_name, task="multi_level")
+    names = [f"multi_level_{levels}" if palette_mode == "linspace" else f"multi_otsu_{levels}"]
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="multi_level",
+        png=png,
+        show=show,
+    )
+    return outs, names
+
+
+def task_all(
+    img: np.ndarray,
+    img_name: str,
+    *,
+    kernels: Optional[List[str]] = None,
+    threshold: int | float = 128,
+    serpentine: bool = True,
+    n: int = 8,
+    levels: int = 4,
+    palette_mode: Literal["linspace", "multi_otsu"] = "linspace",
+    max_iter: int = 10,
+    time_budget: Optional[float] = None,
+    save: bool = False,
+    outdir: Path = OUT,
+    png: Optional[PNGOptions] = None,
+    cache: Optional[ResultCache] = None,
+    workspace: Optional[Workspace] = None,
+    show: bool = True,
+) -> Tuple[List[np.ndarray], List[str]]:
+    """Every task on one image, sharing one workspace so the image is converted once.
+
+    Outputs are named ``{task}_{name}`` and shown in one grid.
+    """
+    ws = _workspace(workspace)
+    common = {"save": False, "show": False, "workspace": ws}
+    runs = [
+        ("naive", lambda: task_naive(img, img_name, threshold=threshold, cache=cache, **common)),
+        ("ordered", lambda: task_ordered(img, img_name, n=n, cache=cache, **common)),
+        ("random", lambda: task_random(img, img_name, **common)),
+        (
+            "error_diffusion",
+            lambda: task_error_diffusion(
+                img,
+                img_name,
+                kernels=kernels or ["floyd_steinberg"],
+                threshold=threshold,
+                serpentine=serpentine,
+                cache=cache,
+                **common,
+            ),
+        ),
+        ("multiscale", lambda: task_multiscale(img, img_name, cache=cache, **common)),
+        (
+            "hybrid",
+            lambda: task_hybrid(
+                img, img_name, threshold=threshold, serpentine=serpentine, cache=cache, **common
+            ),
+        ),
+        (
+            "dot_diffusion",
+            lambda: task_dot_diffusion(img, img_name, threshold=threshold, cache=cache, **common),
+        ),
+        (
+            "riemersma",
+            lambda: task_riemersma(img, img_name, threshold=threshold, cache=cache, **common),
+        ),
+        (
+            "dbs",
+            lambda: task_dbs(
+                img, img_name, max_iter=max_iter, time_budget=time_budget, cache=cache, **common
+            ),
+        ),
+        (
+            "adaptive_diffusion",
+            lambda: task_adaptive_diffusion(
+                img, img_name, serpentine=serpentine, cache=cache, **common
+            ),
+        ),
+        (
+            "multi_level",
+            lambda: task_multi_level(
+                img, img_name, levels=levels, palette_mode=palette_mode, cache=cache, **common
+            ),
+        ),
+    ]
+
+    outs: List[np.ndarray] = []
+    names: List[str] = []
+    for task, run in runs:
+        task_outs, task_names = run()
+        outs.extend(task_outs)
+        names.extend(name if name.startswith(task) else f"{task}_{name}" for name in task_names)
+
+    show_images(
+        outs,
+        names,
+        save=save,
+        outdir=outdir,
+        stem=img_name,
+        task="all",
+        png=png,
+        show=show,
+    )
     return outs, names
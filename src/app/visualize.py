@@ -2,49 +2,209 @@
 """Visualization utilities for dithering outputs.
 
 Provides:
-- png_bytes: robust PNG encoder using Pillow
-- show_images: grid display + optional saving to disk
+- png_bytes: PNG encoder choosing the smallest exact layout (1-bit, 2/4/8-bit
+  indexed, gray, RGB/RGBA) from the pixel data
+- save_png / save_pngs: write outputs, a batch encoded on a thread pool
+- show_images: grid display (matplotlib, imported on use) + optional saving to disk
 """
 
 from __future__ import annotations
 
 import io
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
-from PIL import Image
 
 from ..utils.prep_img import to_uint8_image
-
-
-def png_bytes(im: np.ndarray) -> bytes:
-    """Robust PNG encoder using Pillow. Works for grayscale/RGB/RGBA."""
+from ..utils.stream_io import PNGWriter
+
+# PNG filter names accepted by `PNGOptions.filter_type`
+PNG_FILTERS = {"none": 0, "sub": 1, "up": 2, "average": 3, "paeth": 4}
+
+
+@dataclass(frozen=True)
+class PNGOptions:
+    """
+    PNG encoding options.
+
+    Attributes
+    ----------
+    compress_level : int
+        zlib level 0..9 (default 6).
+    filter_type : str | None
+        One of `PNG_FILTERS`, or None to pick "none" for 1/2/4-bit and indexed
+        data and "paeth" for continuous-tone data.
+    workers : int | None
+        Threads encoding a batch in `save_pngs`; None uses one per image up to
+        the CPU count.
+    """
+
+    compress_level: int = 6
+    filter_type: Optional[str] = None
+    workers: Optional[int] = None
+
+
+def png_layout(
+    im: np.ndarray
+) -> Tuple[np.ndarray, int, Optional[np.ndarray]]:
+    """
+    Choose the smallest exact PNG layout for an image.
+
+    Parameters
+    ----------
+    im : np.ndarray
+        (H, W), (H, W, 3) or (H, W, 4) image; converted with `to_uint8_image`.
+
+    Returns
+    -------
+    Tuple[np.ndarray, int, np.ndarray | None]
+        ``(samples, bit_depth, palette)``: samples to store, (H, W) or
+        (H, W, C); bits per sample; (K, 3) palette for indexed images.
+
+    Raises
+    ------
+    ValueError
+        If the image shape is unsupported.
+    """
     u8 = to_uint8_image(im)
-    if u8.ndim == 2:
-        mode = "L"
-    elif u8.ndim == 3 and u8.shape[2] == 3:
-        mode = "RGB"
-    elif u8.ndim == 3 and u8.shape[2] == 4:
-        mode = "RGBA"
-    else:
+    if u8.ndim == 3 and u8.shape[2] == 3:
+        if np.array_equal(u8[..., 0], u8[..., 1]) and np.array_equal(u8[..., 0], u8[..., 2]):
+            u8 = u8[..., 0]
+        else:
+            packed = (u8[..., 0].astype(np.uint32) << 16) | (u8[..., 1].astype(np.uint32) << 8)
+            packed |= u8[..., 2]
+            colors, index = np.unique(packed.ravel(), return_inverse=True)
+            if colors.size > 256:
+                return u8, 8, None
+            palette = np.stack(
+                [(colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF], axis=1
+            ).astype(np.uint8)
+            return index.reshape(u8.shape[:2]).astype(np.uint8), _index_bits(colors.size), palette
+    if u8.ndim == 3 and u8.shape[2] == 4:
+        return u8, 8, None
+    if u8.ndim != 2:
         raise ValueError(f"Unsupported image shape for saving: {u8.shape}")
 
-    img = Image.fromarray(u8, mode=mode)
+    levels = np.flatnonzero(np.bincount(u8.ravel(), minlength=256))
+    if np.all((levels == 0) | (levels == 255)):
+        return (u8 > 0).astype(np.uint8), 1, None
+    if levels.size > 16:
+        return u8, 8, None
+    lut = np.zeros(256, dtype=np.uint8)
+    lut[levels] = np.arange(levels.size, dtype=np.uint8)
+    palette = np.repeat(levels.astype(np.uint8)[:, None], 3, axis=1)
+    return lut[u8], _index_bits(levels.size), palette
+
+
+def _index_bits(n_colors: int) -> int:
+    """Smallest PNG bit depth holding `n_colors` palette indices."""
+    for bits in (1, 2, 4):
+        if n_colors <= 1 << bits:
+            return bits
+    return 8
+
+
+def png_bytes(im: np.ndarray, png: Optional[PNGOptions] = None) -> bytes:
+    """
+    Encode an image as PNG in its smallest exact layout (see `png_layout`).
+
+    Binary outputs become 1-bit PNGs, images with few gray levels or colors
+    become 2/4/8-bit indexed PNGs, anything else 8-bit gray/RGB/RGBA.
+
+    Parameters
+    ----------
+    im : np.ndarray
+        (H, W), (H, W, 3) or (H, W, 4) image of any dtype (see `to_uint8_image`).
+    png : PNGOptions | None, default None
+        Compression level and filter.
+
+    Returns
+    -------
+    bytes
+        The PNG file contents.
+
+    Raises
+    ------
+    ValueError
+        If the image shape or filter name is unsupported.
+    """
+    png = png or PNGOptions()
+    samples, bits, palette = png_layout(im)
+    if png.filter_type is None:
+        filter_type = 0 if bits < 8 or palette is not None else PNG_FILTERS["paeth"]
+    elif png.filter_type in PNG_FILTERS:
+        filter_type = PNG_FILTERS[png.filter_type]
+    else:
+        raise ValueError(f"filter_type must be one of {sorted(PNG_FILTERS)}")
+
+    h, w = samples.shape[:2]
     buf = io.BytesIO()
-    img.save(buf, format="PNG", optimize=True)
+    with PNGWriter(
+        buf,
+        w,
+        h,
+        channels=1 if samples.ndim == 2 else samples.shape[2],
+        bit_depth=bits,
+        palette=palette,
+        compress_level=png.compress_level,
+        filter_type=filter_type,
+    ) as writer:
+        writer.write_rows(samples)
     return buf.getvalue()
 
 
-def save_png(im: np.ndarray, outdir: Path, stem: str, task: str, name: str) -> None:
+def save_png(
+    im: np.ndarray,
+    outdir: Path,
+    stem: str,
+    task: str,
+    name: str,
+    png: Optional[PNGOptions] = None,
+) -> Path:
     """Save a single image as a PNG file."""
     outdir.mkdir(parents=True, exist_ok=True)
     outpath = outdir / f"{stem}_{task}_{name}.png"
     with open(outpath, "wb") as f:
-        f.write(png_bytes(im))
+        f.write(png_bytes(im, png))
     print(f"Saved: {outpath}")
+    return outpath
+
+
+def save_pngs(
+    images: List[np.ndarray],
+    names: List[str],
+    *,
+    outdir: Path,
+    stem: str,
+    task: str,
+    png: Optional[PNGOptions] = None,
+) -> List[Path]:
+    """
+    Encode and save a batch of images on a thread pool.
+
+    zlib releases the GIL while compressing, so the encodes run in parallel.
+
+    Returns
+    -------
+    List[Path]
+        Output paths, in input order.
+    """
+    png = png or PNGOptions()
+    outdir.mkdir(parents=True, exist_ok=True)
+    workers = png.workers or min(len(images), os.cpu_count() or 1)
+    if workers <= 1 or len(images) <= 1:
+        return [save_png(im, outdir, stem, task, name, png) for im, name in zip(images, names)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(save_png, im, outdir, stem, task, name, png)
+            for im, name in zip(images, names)
+        ]
+        return [f.result() for f in futures]
 
 
 def show_images(
@@ -54,9 +214,21 @@ def show_images(
     *,
     save: bool,
     outdir: Path,
-    stem: str
+    stem: str,
+    png: Optional[PNGOptions] = None,
+    show: bool = True,
 ):
-    """Display a list of images in a grid and optionally save them."""
+    """Display a list of images in a grid and optionally save them (see `save_pngs`).
+
+    matplotlib is only imported when `show` is set, so headless runs never load it.
+    """
+    if save:
+        save_pngs(images, names, outdir=outdir, stem=stem, task=task, png=png)
+    if not show:
+        return
+
+    import matplotlib.pyplot as plt
+
     n = len(images)
     cols = min(4, n)
     rows = math.ceil(n / cols)
@@ -75,12 +247,6 @@ def show_images(
             ax.imshow(im)
         ax.set_title(name.replace("_", " "))
         ax.axis("off")
-        if save:
-            png_data = png_bytes(im)
-            outpath = outdir / f"{stem}_{task}_{name}.png"
-            with open(outpath, "wb") as f:
-                f.write(png_data)
-            print(f"Saved: {outpath}")
 
         for j in range(i + 1, len(axes)):
             axes[j].axis("off")
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""Direct binary search (DBS) halftoning.
+
+This subpackage refines any black-white halftone by direct binary search
+against a Gaussian model of the eye, with incremental cost updates.
+"""
+
+from __future__ import annotations
+
+from .dbs import dbs_bw
+from .filters import hvs_autocorrelation, hvs_error
+
+__all__ = [
+    "dbs_bw",
+    "hvs_autocorrelation",
+    "hvs_error",
+]
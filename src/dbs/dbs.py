@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Direct binary search (DBS) halftoning.
+
+DBS refines a halftone by toggling pixels and swapping them with differing
+8-neighbours whenever that lowers the perceived error
+``E = Σ (h̃ * (halftone - gray))²``. With e the error image and c_pp the HVS
+autocorrelation, the cross-correlation ``c_ep = e ⋆ c_pp`` gives the change
+of E for a trial in O(1):
+
+- toggle at m by a (±1):          ΔE = a² c_pp(0) + 2 a c_ep(m)
+- swap of m and m' (a' = -a):     ΔE = 2 c_pp(0) - 2 c_pp(m - m') + 2 a (c_ep(m) - c_ep(m'))
+
+and an accepted change updates c_ep by ``a c_pp(· - m)`` in O(filter support).
+Pixels on a lattice of step ``R + 3`` (R the c_pp radius) cannot affect each
+other's trials or costs, so every such lattice is searched as one vectorized
+step over the whole image, like independent blocks processed in parallel.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Literal, Optional, Union
+
+import numpy as np
+
+from ..utils.grayscale import grayscale
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace, prepare_output
+from .filters import gaussian_taps, hvs_autocorrelation, separable_filter
+
+# Swap partners: the 8-neighbourhood, then the toggle as candidate 8
+_SWAPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def _spread_matrix(cpp: np.ndarray) -> np.ndarray:
+    """
+    (9, (2R+3)²) matrix mapping a 3×3 change around a pixel to its c_ep update.
+
+    Row u is c_pp centred on 3×3 offset u, laid out on the (2R+3)² window
+    around the pixel.
+    """
+    r = cpp.shape[0] // 2
+    size = 2 * r + 3
+    k = np.zeros((3, 3, size, size), dtype=np.float64)
+    for uy in range(3):
+        for ux in range(3):
+            k[uy, ux, uy:uy + 2 * r + 1, ux:ux + 2 * r + 1] = cpp
+    return k.reshape(9, size * size)
+
+
+def dbs_bw(
+    img: np.ndarray,
+    *,
+    init: Optional[np.ndarray] = None,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+    sigma: float = 1.5,
+    max_iter: int = 10,
+    time_budget: Optional[float] = None,
+    swaps: bool = True,
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+) -> np.ndarray:
+    """
+    Refine a halftone by direct binary search.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Input image (H, W) or (H, W, C). Converted to grayscale internally.
+    init : np.ndarray | None, optional
+        Starting (H, W) halftone, e.g. any `*_bw` output (nonzero = white).
+        Default None starts from Knuth dot diffusion.
+    dtype : {"u8","f32"} | np.dtype | type, optional
+        Output dtype for the binarized image. Default "u8".
+    sigma : float, optional
+        Standard deviation of the Gaussian HVS filter in pixels. Default 1.5.
+    max_iter : int, optional
+        Maximum number of passes over the image; the search also stops after
+        a pass that changes nothing. Default 10.
+    time_budget : float | None, optional
+        Stop after this many seconds (checked between lattice steps), keeping
+        every improvement made so far. Default None (no limit).
+    swaps : bool, optional
+        Try swaps with the 8 neighbours besides toggles. Default True.
+    tone : ToneCurve | None, optional
+        Tone curve folded into the grayscale conversion. Default None.
+    out : np.ndarray | None, optional
+        Preallocated (H, W) output, written in place and returned. Default None.
+    workspace : Workspace | None, optional
+        Reusable scratch buffers (gray plane, halftone and c_ep planes). Default None.
+
+    Returns
+    -------
+    np.ndarray
+        Dithered 1-bit image mapped to `dtype` (`out` when given).
+
+    Raises
+    ------
+    ValueError
+        If `init` has the wrong shape, `sigma` <= 0 or `max_iter` < 0.
+    """
+    h, w = img.shape[:2]
+    if max_iter < 0:
+        raise ValueError("max_iter must be >= 0")
+    cpp = hvs_autocorrelation(sigma)
+    if init is None:
+        # imported here: the default seed is the only use of dot_diffusion
+        from ..dot_diffusion import dot_diff_bw
+
+        init = dot_diff_bw(img, tone=tone, workspace=workspace)
+    elif init.shape[:2] != (h, w) or init.ndim != 2:
+        raise ValueError(f"init shape {init.shape} does not match image shape {(h, w)}")
+
+    g = grayscale(img, "u8", tone=tone, workspace=workspace)
+    r = cpp.shape[0] // 2
+    pad = r + 1
+    if workspace is None:
+        hpad = np.empty((h + 2, w + 2), dtype=np.int8)
+        cep = np.zeros((h + 2 * pad, w + 2 * pad), dtype=np.float64)
+    else:
+        hpad = workspace.get("dbs_halftone", (h + 2, w + 2), np.int8)
+        cep = workspace.zeros("dbs_cep", (h + 2 * pad, w + 2 * pad), np.float64)
+
+    # Halftone with a -1 border (never a swap partner)
+    hpad.fill(-1)
+    ht = hpad[1:1 + h, 1:1 + w]
+    np.greater(init, 0, out=ht, casting="unsafe")
+
+    # c_ep = e ⋆ c_pp inside the image; the border absorbs updates, never read
+    e = ht - g.astype(np.float64) / 255.0
+    cep[pad:pad + h, pad:pad + w] = separable_filter(e, gaussian_taps(sigma * np.sqrt(2.0), r))
+
+    _search(hpad, cep, cpp, h, w, swaps, max_iter, time_budget)
+
+    dither_img = prepare_output((h, w), dtype, out)
+    dither_img[...] = ht
+    return dither_img
+
+
+def _search(
+    hpad: np.ndarray,
+    cep: np.ndarray,
+    cpp: np.ndarray,
+    h: int,
+    w: int,
+    swaps: bool,
+    max_iter: int,
+    time_budget: Optional[float],
+) -> None:
+    """DBS passes over independent pixel lattices, updating `hpad` and `cep` in place."""
+    r = cpp.shape[0] // 2
+    pad = r + 1
+    step = r + 3
+    c0 = cpp[r, r]
+    spread = _spread_matrix(cpp)
+    # Flat offsets (in `cep`) of the (2R+3)² window around a pixel
+    wy, wx = np.mgrid[-pad:pad + 1, -pad:pad + 1]
+    window = (wy * cep.shape[1] + wx).ravel()
+    cep_flat = cep.reshape(-1)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    def view(arr: np.ndarray, off: int, oy: int, ox: int, dy: int = 0, dx: int = 0) -> np.ndarray:
+        """Lattice of phase (oy, ox) shifted by (dy, dx), in an array padded by `off`."""
+        y0, x0 = off + oy + dy, off + ox + dx
+        return arr[y0:y0 + h - oy:step, x0:x0 + w - ox:step]
+
+    for _ in range(max_iter):
+        changed = 0
+        for oy in range(min(step, h)):
+            for ox in range(min(step, w)):
+                if deadline is not None and time.perf_counter() > deadline:
+                    return
+                hm = view(hpad, 1, oy, ox).copy()
+                cm = view(cep, pad, oy, ox)
+                a = (1 - 2 * hm).astype(np.float64)
+
+                best = c0 + 2.0 * a * cm  # toggle
+                choice = np.full(hm.shape, 8, dtype=np.int8)
+                if swaps:
+                    for k, (dy, dx) in enumerate(_SWAPS):
+                        valid = view(hpad, 1, oy, ox, dy, dx) == 1 - hm
+                        cn = view(cep, pad, oy, ox, dy, dx)
+                        d = 2.0 * c0 - 2.0 * cpp[r + dy, r + dx] + 2.0 * a * (cm - cn)
+                        better = valid & (d < best)
+                        best[better] = d[better]
+                        choice[better] = k
+
+                accept = best < -1e-12 * c0
+                n_acc = int(np.count_nonzero(accept))
+                if n_acc == 0:
+                    continue
+                changed += n_acc
+
+                # 3×3 change around each accepted pixel: +a at the centre, -a at a partner
+                iy, ix = np.nonzero(accept)
+                a_acc = a[iy, ix]
+                k_acc = choice[iy, ix]
+                delta = np.zeros((n_acc, 9), dtype=np.float64)
+                delta[:, 4] = a_acc
+                py, px = oy + iy * step, ox + ix * step
+                hpad[1 + py, 1 + px] = 1 - hm[iy, ix]
+                sw = k_acc < 8
+                if sw.any():
+                    dys = np.array([d[0] for d in _SWAPS])[k_acc[sw]]
+                    dxs = np.array([d[1] for d in _SWAPS])[k_acc[sw]]
+                    delta[np.flatnonzero(sw), (dys + 1) * 3 + (dxs + 1)] = -a_acc[sw]
+                    hpad[1 + py[sw] + dys, 1 + px[sw] + dxs] = hm[iy[sw], ix[sw]]
+
+                centre = (pad + py) * cep.shape[1] + (pad + px)
+                np.add.at(cep_flat, (centre[:, None] + window).ravel(), (delta @ spread).ravel())
+        if changed == 0:
+            return
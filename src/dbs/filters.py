@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Human visual system model for direct binary search.
+
+The eye is modelled as a Gaussian low-pass filter h̃ of standard deviation
+`sigma` pixels. DBS needs the filter's autocorrelation c_pp = h̃ ⋆ h̃, again a
+Gaussian (std ``sigma * sqrt(2)``), and the perceived error of a halftone is
+the energy of the filtered error ``h̃ * (halftone - gray)``.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Literal, Optional, Union
+
+import numpy as np
+
+from ..utils.grayscale import grayscale
+from ..utils.tone import ToneCurve
+
+
+def gaussian_taps(std: float, radius: int) -> np.ndarray:
+    """1D Gaussian ``exp(-t²/(2 std²))`` for t in [-radius, radius] (peak 1)."""
+    t = np.arange(-radius, radius + 1, dtype=np.float64)
+    return np.exp(-(t * t) / (2.0 * std * std))
+
+
+def autocorrelation_radius(sigma: float) -> int:
+    """Support radius of c_pp: three standard deviations (``3 * sigma * sqrt(2)``)."""
+    return max(1, math.ceil(3.0 * sigma * math.sqrt(2.0)))
+
+
+def hvs_autocorrelation(sigma: float = 1.5) -> np.ndarray:
+    """
+    Autocorrelation c_pp of the Gaussian HVS filter.
+
+    Parameters
+    ----------
+    sigma : float, default 1.5
+        Standard deviation of the HVS filter in pixels (grows with viewing
+        distance and print resolution).
+
+    Returns
+    -------
+    np.ndarray
+        (2R+1, 2R+1) float64 kernel with peak ``c_pp[R, R] = 1``, where
+        R = `autocorrelation_radius` (the scale does not affect DBS decisions).
+
+    Raises
+    ------
+    ValueError
+        If `sigma` <= 0.
+    """
+    if sigma <= 0:
+        raise ValueError("sigma must be > 0")
+    taps = gaussian_taps(sigma * math.sqrt(2.0), autocorrelation_radius(sigma))
+    return np.outer(taps, taps)
+
+
+def separable_filter(plane: np.ndarray, taps: np.ndarray) -> np.ndarray:
+    """Filter a 2D plane with ``outer(taps, taps)``, zero outside (same size, float64)."""
+    r = taps.size // 2
+    h, w = plane.shape
+    pad = np.zeros((h + 2 * r, w + 2 * r), dtype=np.float64)
+    pad[r:r + h, r:r + w] = plane
+    rows = np.zeros((h + 2 * r, w), dtype=np.float64)
+    for t, c in enumerate(taps):
+        rows += c * pad[:, t:t + w]
+    res = np.zeros((h, w), dtype=np.float64)
+    for t, c in enumerate(taps):
+        res += c * rows[t:t + h]
+    return res
+
+
+def hvs_error(
+    bw: np.ndarray,
+    img: np.ndarray,
+    *,
+    sigma: float = 1.5,
+    tone: Optional[ToneCurve] = None,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+) -> float:
+    """
+    Perceived error of a halftone: mean squared HVS-filtered error.
+
+    Parameters
+    ----------
+    bw : np.ndarray
+        (H, W) halftone, any `*_bw` output (nonzero = white).
+    img : np.ndarray
+        The image it renders, (H, W) or (H, W, C).
+    sigma : float, default 1.5
+        Standard deviation of the HVS filter in pixels.
+    tone : ToneCurve | None, default None
+        Tone curve folded into the grayscale conversion of `img`.
+    dtype : {"u8","f32"} | np.dtype | type, default "u8"
+        Gray-conversion path of `img`, as for the `*_bw` functions.
+
+    Returns
+    -------
+    float
+        Mean of ``(h̃ * (bw - gray))²`` with gray in [0, 1]; lower is better.
+    """
+    if sigma <= 0:
+        raise ValueError("sigma must be > 0")
+    g = grayscale(img, dtype, tone=tone).astype(np.float64) / 255.0
+    e = (np.asarray(bw) > 0) - g
+    filtered = separable_filter(e, gaussian_taps(sigma, max(1, math.ceil(3.0 * sigma))))
+    return float(np.mean(filtered * filtered))
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Dot diffusion dithering.
+
+This subpackage provides Knuth's dot diffusion, an error-diffusion-like
+method whose pixels are processed class by class, each class in one
+vectorized step, together with class matrices (Knuth's and generated ones).
+"""
+
+from __future__ import annotations
+
+from .class_matrix import (
+    KNUTH_8,
+    OPTIMIZED_8,
+    class_matrix_stats,
+    optimized_class_matrix,
+    resolve_class_matrix,
+)
+from .dot_diff import DotDiffuser, dot_diff_bw
+
+__all__ = [
+    "dot_diff_bw",
+    "DotDiffuser",
+    "KNUTH_8",
+    "OPTIMIZED_8",
+    "optimized_class_matrix",
+    "resolve_class_matrix",
+    "class_matrix_stats",
+]
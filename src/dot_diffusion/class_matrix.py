@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""Class matrices for dot diffusion.
+
+A class matrix is an n×n permutation of ``0 .. n²-1`` tiled over the image;
+pixels are processed class by class and pass their error only to neighbours
+of a higher class. Pixels without higher neighbours ("barons") drop their
+error, and those with a single one ("near-barons") pass all of it to one
+pixel, so good matrices have few of both.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Tuple, Union
+
+import numpy as np
+
+from ..ordered.group.bayer import bayer_matrix
+
+# Knuth's 8×8 class matrix ("Digital halftones by dot diffusion", 1987):
+# 2 barons, 2 near-barons
+KNUTH_8: np.ndarray = np.array(
+    [
+        [34, 48, 40, 32, 29, 15, 23, 31],
+        [42, 58, 56, 53, 21, 5, 7, 10],
+        [50, 62, 61, 45, 13, 1, 2, 18],
+        [38, 46, 54, 37, 25, 17, 9, 26],
+        [28, 14, 22, 30, 35, 49, 41, 33],
+        [20, 4, 6, 11, 43, 59, 57, 52],
+        [12, 0, 3, 19, 51, 63, 60, 44],
+        [24, 16, 8, 27, 39, 47, 55, 36],
+    ],
+    dtype=np.intp,
+)
+KNUTH_8.setflags(write=False)
+
+# optimized_class_matrix(8), stored to skip the search: 2 barons, 2 near-barons,
+# and fewer neighbours with close classes than KNUTH_8
+OPTIMIZED_8: np.ndarray = np.array(
+    [
+        [43, 20, 8, 36, 6, 28, 61, 60],
+        [51, 34, 50, 47, 18, 40, 52, 13],
+        [2, 59, 58, 26, 7, 31, 5, 38],
+        [49, 57, 48, 37, 15, 23, 14, 22],
+        [30, 39, 9, 29, 4, 24, 32, 41],
+        [3, 19, 1, 21, 44, 12, 53, 16],
+        [46, 27, 11, 33, 45, 54, 42, 56],
+        [10, 35, 0, 25, 17, 55, 63, 62],
+    ],
+    dtype=np.intp,
+)
+OPTIMIZED_8.setflags(write=False)
+
+# 8-neighbourhood of a pixel
+NEIGHBOURS: Tuple[Tuple[int, int], ...] = (
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1), (0, 1),
+    (1, -1), (1, 0), (1, 1),
+)
+
+
+def higher_neighbours(matrix: np.ndarray) -> np.ndarray:
+    """Number of higher-class 8-neighbours of every cell of the tiled matrix."""
+    m = np.asarray(matrix)
+    return sum(
+        (np.roll(m, (-dy, -dx), axis=(0, 1)) > m).astype(np.intp) for dy, dx in NEIGHBOURS
+    )
+
+
+def class_matrix_stats(matrix: np.ndarray) -> Tuple[int, int]:
+    """
+    Baron and near-baron counts of a class matrix.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        n×n class matrix (tiled, so neighbours wrap around).
+
+    Returns
+    -------
+    (barons, near_barons) : tuple of int
+        Cells with no, and with exactly one, higher-class neighbour.
+    """
+    higher = higher_neighbours(matrix)
+    return int(np.count_nonzero(higher == 0)), int(np.count_nonzero(higher == 1))
+
+
+def _neighbour_index(n: int) -> np.ndarray:
+    """(8, n*n) flat indices of the wrapped 8-neighbours of each cell."""
+    idx = np.arange(n * n).reshape(n, n)
+    return np.stack([np.roll(idx, (-dy, -dx), axis=(0, 1)).ravel() for dy, dx in NEIGHBOURS])
+
+
+def _cost(flat: np.ndarray, nb: np.ndarray, n: int) -> int:
+    """Search objective: barons, near-barons, and neighbours with close classes."""
+    classes = flat[nb]
+    higher = np.count_nonzero(classes > flat, axis=0)
+    barons = np.count_nonzero(higher == 0)
+    near = np.count_nonzero(higher == 1)
+    # Neighbours processed within n steps of each other pile error onto the
+    # same few pixels (each pair is seen from both ends)
+    close = np.count_nonzero(np.abs(classes - flat) < n) // 2
+    return int(16 * barons + 4 * near + close)
+
+
+@lru_cache(maxsize=16)
+def optimized_class_matrix(n: int = 8, *, seed: int = 0, iterations: int = 20000) -> np.ndarray:
+    """
+    Generate an n×n class matrix with few barons and dispersed class order.
+
+    Starts from the Bayer order (maximally dispersed; a random order when `n`
+    is not a power of two) and hill-climbs over random pair swaps that do not
+    increase the cost: barons first, then near-barons, then 8-neighbours whose
+    classes are less than n apart. Deterministic for a given `seed`; results
+    are cached.
+
+    Parameters
+    ----------
+    n : int, default 8
+        Matrix size (>= 2).
+    seed : int, default 0
+        Seed of the swap sequence.
+    iterations : int, default 20000
+        Number of swaps tried.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only n×n permutation of ``0 .. n²-1``.
+
+    Raises
+    ------
+    ValueError
+        If `n` < 2.
+    """
+    if n < 2:
+        raise ValueError("Class matrix size must be >= 2")
+    rng = np.random.default_rng(seed)
+    if n & (n - 1) == 0:
+        m = np.argsort(bayer_matrix(n), axis=None).argsort().reshape(n, n)
+    else:
+        m = rng.permutation(n * n).reshape(n, n)
+
+    flat = m.ravel()
+    nb = _neighbour_index(n)
+    cost = _cost(flat, nb, n)
+    for a, b in rng.integers(0, n * n, size=(iterations, 2)):
+        if a == b:
+            continue
+        flat[a], flat[b] = flat[b], flat[a]
+        new = _cost(flat, nb, n)
+        if new <= cost:
+            cost = new
+        else:
+            flat[a], flat[b] = flat[b], flat[a]
+    m.setflags(write=False)
+    return m
+
+
+def resolve_class_matrix(spec: Union[str, np.ndarray] = "knuth") -> np.ndarray:
+    """
+    Resolve a class matrix specification.
+
+    Parameters
+    ----------
+    spec : {"knuth", "optimized"} | np.ndarray, default "knuth"
+        Knuth's 8×8 matrix, the 8×8 `optimized_class_matrix` (stored), or an
+        explicit n×n permutation of ``0 .. n²-1``.
+
+    Returns
+    -------
+    np.ndarray
+        n×n integer class matrix.
+
+    Raises
+    ------
+    ValueError
+        If `spec` is an unknown name or not a square permutation matrix.
+    """
+    if isinstance(spec, str):
+        if spec == "knuth":
+            return KNUTH_8
+        if spec == "optimized":
+            return OPTIMIZED_8
+        raise ValueError("class matrix must be 'knuth', 'optimized' or an n×n array")
+    m = np.asarray(spec)
+    if m.ndim != 2 or m.shape[0] != m.shape[1] or m.shape[0] < 2:
+        raise ValueError("Class matrix must be a square 2D array of size >= 2")
+    if not np.array_equal(np.sort(m, axis=None), np.arange(m.size)):
+        raise ValueError("Class matrix must be a permutation of 0 .. n*n-1")
+    return m.astype(np.intp, copy=False)
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""Knuth's dot diffusion.
+
+Pixels are processed class by class in the order of a tiled class matrix and
+diffuse their error only to 8-neighbours of a higher class (orthogonal weight
+2, diagonal weight 1, normalized over those neighbours). All pixels of one
+class form a strided lattice of the image, so each class step is a handful of
+vectorized slice operations: n² Python-level steps whatever the image size.
+"""
+
+from __future__ import annotations
+
+from typing import List, Literal, Optional, Tuple, Union
+
+import numpy as np
+
+from ..utils.ditherer import Ditherer
+from ..utils.grayscale import grayscale, map_threshold_graydomain
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace, output_dtype, prepare_output
+from .class_matrix import NEIGHBOURS, resolve_class_matrix
+
+# (lattice slices, [(neighbour slices, error sub-slices, weight)]) per class
+ClassStep = Tuple[
+    Tuple[slice, slice],
+    List[Tuple[Tuple[slice, slice], Tuple[slice, slice], float]],
+]
+
+
+def _lattice_range(phase: int, d: int, length: int, n: int) -> Tuple[int, int]:
+    """Lattice indices [j0, j1) of ``phase + n*j`` whose neighbour at `d` is inside the axis."""
+    count = -(-(length - phase) // n) if phase < length else 0
+    j0 = 1 if phase + d < 0 else 0
+    j1 = min(count, -(-(length - phase - d) // n))
+    return j0, j1
+
+
+def class_steps(matrix: np.ndarray, h: int, w: int) -> List[ClassStep]:
+    """
+    Processing plan of an (h, w) image for a class matrix.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        n×n class matrix.
+    h, w : int
+        Image size.
+
+    Returns
+    -------
+    list
+        One entry per class, in class order: the slices selecting the pixels
+        of that class, and for each higher-class neighbour the slices of the
+        neighbour pixels, the matching sub-slices of the class lattice and
+        the normalized weight. Taps falling outside the image are dropped, so
+        border pixels lose that share of their error.
+    """
+    n = matrix.shape[0]
+    order = np.argsort(matrix, axis=None)
+    steps: List[ClassStep] = []
+    for flat in order:
+        py, px = divmod(int(flat), n)
+        k = matrix[py, px]
+        nbs = []
+        for dy, dx in NEIGHBOURS:
+            if matrix[(py + dy) % n, (px + dx) % n] > k:
+                nbs.append((dy, dx, 2.0 if dy == 0 or dx == 0 else 1.0))
+        total = sum(wt for _, _, wt in nbs)
+
+        taps = []
+        for dy, dx, wt in nbs:
+            jy0, jy1 = _lattice_range(py, dy, h, n)
+            jx0, jx1 = _lattice_range(px, dx, w, n)
+            if jy1 <= jy0 or jx1 <= jx0:
+                continue
+            dst = (
+                slice(py + dy + n * jy0, py + dy + n * (jy1 - 1) + 1, n),
+                slice(px + dx + n * jx0, px + dx + n * (jx1 - 1) + 1, n),
+            )
+            taps.append((dst, (slice(jy0, jy1), slice(jx0, jx1)), wt / total))
+        steps.append(((slice(py, h, n), slice(px, w, n)), taps))
+    return steps
+
+
+def dot_diff_bw(
+    img: np.ndarray,
+    *,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+    class_matrix: Union[Literal["knuth", "optimized"], np.ndarray] = "knuth",
+    threshold: Union[int, float] = 128,
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+) -> np.ndarray:
+    """
+    Apply dot diffusion dithering.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Input image (H, W) or (H, W, C). Converted to grayscale internally.
+    dtype : {"u8","f32"} | np.dtype | type, optional
+        Output dtype for the binarized image. Default "u8".
+    class_matrix : {"knuth", "optimized"} | np.ndarray, optional
+        Knuth's 8×8 class matrix, the generated 8×8 one (see
+        `optimized_class_matrix`), or any n×n permutation of ``0 .. n²-1``.
+        Default "knuth".
+    threshold : int | float, optional
+        Global threshold for binarization. Default 128.
+    tone : ToneCurve | None, optional
+        Tone curve folded into the grayscale conversion. Default None.
+    out : np.ndarray | None, optional
+        Preallocated (H, W) output, written in place and returned. Default None.
+    workspace : Workspace | None, optional
+        Reusable scratch buffers (gray plane, error plane). Default None.
+
+    Returns
+    -------
+    np.ndarray
+        Dithered 1-bit image mapped to `dtype` (`out` when given).
+
+    Raises
+    ------
+    ValueError
+        If `class_matrix` is unknown or not a square permutation matrix.
+    """
+    matrix = resolve_class_matrix(class_matrix)
+    h, w = img.shape[:2]
+    return _dot_diffuse(
+        img,
+        class_steps(matrix, h, w),
+        map_threshold_graydomain(threshold, dtype),
+        dtype=dtype,
+        tone=tone,
+        out=out,
+        workspace=workspace,
+    )
+
+
+def _dot_diffuse(
+    img: np.ndarray,
+    steps: List[ClassStep],
+    thr: float,
+    *,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type],
+    tone: Optional[ToneCurve],
+    out: Optional[np.ndarray],
+    workspace: Optional[Workspace],
+) -> np.ndarray:
+    """Class loop of `dot_diff_bw`, for a precomputed plan and a gray-domain threshold."""
+    h, w = img.shape[:2]
+    dither_img = prepare_output((h, w), dtype, out)
+    g = grayscale(img, dtype, tone=tone, workspace=workspace)
+
+    # Gray values plus the error received so far, float32 [0..255]
+    if workspace is None:
+        v = g.astype(np.float32)
+    else:
+        v = workspace.get("dot_plane", (h, w))
+        v[...] = g
+
+    for src, taps in steps:
+        vals = v[src]
+        on = vals >= thr
+        dither_img[src] = on
+        if taps:
+            err = vals - on * np.float32(255.0)
+            for dst, sub, wn in taps:
+                v[dst] += err[sub] * wn
+    return dither_img
+
+
+class DotDiffuser(Ditherer):
+    """
+    Dot diffusion with its class matrix resolved once.
+
+    The per-class plan is built for the first frame size and rebuilt only
+    when the size changes; the workspace keeps the gray and error planes.
+    Results equal `dot_diff_bw` with the same arguments.
+
+    Parameters
+    ----------
+    class_matrix : {"knuth", "optimized"} | np.ndarray, default "knuth"
+        Class matrix (see `dot_diff_bw`).
+    threshold : int | float, default 128
+        Global threshold for binarization.
+    dtype : {"u8","f32"} | np.dtype | type, default "u8"
+        Output dtype.
+    tone : ToneCurve | None, default None
+        Tone curve folded into the grayscale conversion.
+    workspace : Workspace | None, default None
+        Scratch buffers; a new one by default.
+
+    Raises
+    ------
+    ValueError
+        If `class_matrix` is unknown or not a square permutation matrix.
+    """
+
+    def __init__(
+        self,
+        class_matrix: Union[Literal["knuth", "optimized"], np.ndarray] = "knuth",
+        *,
+        threshold: Union[int, float] = 128,
+        dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+        tone: Optional[ToneCurve] = None,
+        workspace: Optional[Workspace] = None,
+    ) -> None:
+        super().__init__(workspace)
+        self.matrix = resolve_class_matrix(class_matrix)
+        self.dtype = dtype
+        self.tone = tone
+        self.out_dtype = output_dtype(dtype)
+        self._thr = map_threshold_graydomain(threshold, dtype)
+        self._plan: Tuple[Tuple[int, int], List[ClassStep]] = ((-1, -1), [])
+
+    def output_shape(self, shape: Tuple[int, ...]) -> Tuple[int, ...]:
+        """(H, W) for an (H, W[, C]) frame."""
+        return tuple(shape[:2])
+
+    def __call__(self, img: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dither one frame (see `dot_diff_bw`), into `out` when given."""
+        size = (img.shape[0], img.shape[1])
+        if self._plan[0] != size:
+            self._plan = (size, class_steps(self.matrix, *size))
+        return _dot_diffuse(
+            img,
+            self._plan[1],
+            self._thr,
+            dtype=self.dtype,
+            tone=self.tone,
+            out=out,
+            workspace=self.workspace,
+        )
@@ -7,8 +7,11 @@ methods for black-white image processing.
 
 from __future__ import annotations
 
-from .err_diff import error_diff_bw
+from .err_diff import ErrorDiffuser, error_diff_bw
+from .multiscale import multiscale_bw
 
 __all__ = [
     "error_diff_bw",
+    "ErrorDiffuser",
+    "multiscale_bw",
 ]
@@ -2,17 +2,27 @@
 """Generic error diffusion dithering.
 
 Implements a black-white error diffusion method supporting all kernels
-defined in ``DITHERING_KERNELS`` with serpentine scanning and alias resolution.
+defined in ``DITHERING_KERNELS`` with serpentine scanning and alias resolution,
+as a function and as a reusable `ErrorDiffuser` object. Runs of saturated
+pixels (pure black or white) with no pending error, common on document
+scans, are written as whole slices instead of pixel by pixel.
 """
 
 from __future__ import annotations
 
-from typing import List, Literal, Tuple, Union
+from typing import Iterable, List, Literal, Optional, Tuple, Union
 
 import numpy as np
 
-from ..utils.grayscale import binarize, grayscale, map_threshold_graydomain
-from .kernels import DITHERING_KERNELS, KERNEL_ALIASES, resolve_kernel_name
+from ..utils.ditherer import Ditherer, Rect, dirty_slices
+from ..utils.grayscale import grayscale, map_threshold_graydomain
+from ..utils.prep_img import gray_input_scale
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace, output_dtype, prepare_output
+from .kernels import CompiledKernel, compile_kernel
+
+# Shortest run of saturated, error-free pixels written as one slice
+_MIN_RUN = 16
 
 
 def error_diff_bw(
@@ -22,6 +32,13 @@ def error_diff_bw(
     kernel_type: str = "floyd_steinberg",
     threshold: Union[int, float] = 128,
     serpentine: bool = True,
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+    band_rows: Optional[int] = None,
+    resume: bool = False,
+    row_offset: int = 0,
+    input_scale: Optional[float] = None,
 ) -> np.ndarray:
     """Apply error diffusion dithering with the specified kernel.
 
@@ -37,67 +54,320 @@ def error_diff_bw(
         Global threshold for binarization. Default 128.
     serpentine : bool, optional
         Alternate scan direction per row (True) or always left→right (False).
+    tone : ToneCurve | None, optional
+        Tone curve folded into the grayscale conversion. Default None.
+    out : np.ndarray | None, optional
+        Preallocated (H, W) output, written in place and returned. Default None.
+    workspace : Workspace | None, optional
+        Reusable scratch buffers (gray plane, error rows). Default None.
+    band_rows : int | None, optional
+        Convert the input to grayscale this many rows at a time instead of all
+        at once; with memory-mapped `img` and `out`, memory stays bounded by
+        one band. The error rows carry over between bands. Default None.
+    resume : bool, optional
+        Continue from the error rows the previous call left in `workspace`
+        (the rows directly above `img`), so an image can be fed to successive
+        calls band by band. Default False.
+    row_offset : int, optional
+        Row index of ``img[0]`` in the full image (serpentine direction). Default 0.
+    input_scale : float | None, optional
+        Factor mapping `img` to [0..255] (see `gray_input_scale`); None derives
+        it from `img`, once for all bands. Pass the full image's factor when
+        feeding an image band by band. Default None.
 
     Returns
     -------
     np.ndarray
-        Dithered 1-bit image mapped to `dtype`.
+        Dithered 1-bit image mapped to `dtype` (`out` when given).
+
+    Raises
+    ------
+    ValueError
+        If the kernel is unknown or non-causal, `band_rows` < 1, or `resume` is
+        set without a matching carried state in `workspace`.
     """
-    kname = resolve_kernel_name(kernel_type)
-    if kname not in DITHERING_KERNELS:
-        raise ValueError(
-            f"Unsupported kernel '{kname}'. "
-            f"Supported: {list(DITHERING_KERNELS.keys()) + list(KERNEL_ALIASES.keys())}"
-        )
+    kernel = compile_kernel(kernel_type)
+    if band_rows is not None and band_rows < 1:
+        raise ValueError("band_rows must be >= 1")
+    return _diffuse_bw(
+        img,
+        kernel,
+        map_threshold_graydomain(threshold, dtype),
+        dtype=dtype,
+        serpentine=serpentine,
+        tone=tone,
+        out=out,
+        workspace=workspace,
+        band_rows=band_rows,
+        resume=resume,
+        row_offset=row_offset,
+        input_scale=input_scale,
+    )
 
-    offsets, denom = DITHERING_KERNELS[kname]
 
-    # Check causality (our scan is top-down; dy<0 would target already-processed rows)
-    if any(dy_dx[0] < 0 for dy_dx, _ in offsets):
-        raise ValueError(
-            f"Kernel '{kname}' is non-causal (contains dy < 0). "
-            f"Use a causal variant (dy >= 0) or a different scan strategy."
-        )
+def _diffuse_bw(
+    img: np.ndarray,
+    kernel: CompiledKernel,
+    thr: float,
+    *,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type],
+    serpentine: bool,
+    tone: Optional[ToneCurve],
+    out: Optional[np.ndarray],
+    workspace: Optional[Workspace],
+    band_rows: Optional[int],
+    resume: bool,
+    row_offset: int,
+    input_scale: Optional[float],
+) -> np.ndarray:
+    """Scan loop of `error_diff_bw`, for a compiled kernel and a gray-domain threshold."""
+    max_dy = kernel.max_dy
+    h, w = img.shape[:2]
+    if band_rows is None:
+        band_rows = max(1, h)
+    elif input_scale is None and band_rows < h:
+        input_scale = gray_input_scale(img, band_rows)
 
-    # Normalize offsets and find max_dy
-    norm_offsets: List[Tuple[int, int, float]] = []
-    max_dy = 0
-    dden = float(denom)
-    for (dy_dx, w) in offsets:
-        dy, dx = dy_dx
-        max_dy = max(max_dy, dy)
-        norm_offsets.append((dy, dx, float(w) / dden))
-
-    # Grayscale buffer in float32 [0..255]
-    g = grayscale(img, dtype)  # (H, W)
-    h, w = g.shape
-    thr = map_threshold_graydomain(threshold, dtype)
-
-    # Output as u8 {0,255} then format to requested dtype
-    dither_img = np.empty((h, w), dtype=np.uint8)
+    # Output {0,1} written straight into the requested dtype
+    dither_img = prepare_output((h, w), dtype, out)
     # Error ring buffers: err_rows[0] is current row; err_rows[dy] future rows
-    err_rows = [np.zeros(w, dtype=np.float32) for _ in range(max_dy + 1)]
+    if workspace is None:
+        err_rows = [np.zeros(w, dtype=np.float32) for _ in range(max_dy + 1)]
+    else:
+        err_rows = [workspace.zeros(f"err_row{i}", (w,)) for i in range(max_dy + 1)]
+    if resume:
+        if workspace is None or not workspace.has("err_carry", (max_dy + 1, w)):
+            raise ValueError("resume requires the workspace of the previous band")
+        for row, carried in zip(err_rows, workspace.get("err_carry", (max_dy + 1, w))):
+            row[...] = carried
 
     for y in range(h):
-        flip = serpentine and (y & 1)
+        if y % band_rows == 0:
+            # Grayscale buffer in float32 [0..255] for the next band
+            y0 = y
+            g = grayscale(
+                img[y0:y0 + band_rows],
+                dtype,
+                tone=tone,
+                workspace=workspace,
+                input_scale=input_scale,
+            )
+        flip = serpentine and ((y + row_offset) & 1)
         for dy in range(1, max_dy + 1):
             err_rows[dy].fill(0.0)
 
-        xs = range(w - 1, -1, -1) if flip else range(0, w)
-        for x in xs:
-            old = float(g[y, x]) + err_rows[0][x]
-            new = 255.0 if old >= thr else 0.0
-            dither_img[y, x] = 255 if new > 0.0 else 0
-            e = old - new
+        offsets = kernel.mirrored if flip else kernel.offsets
+        grow, out_row = g[y - y0], dither_img[y]
 
-            # Diffuse error
-            for dy, dx, wn in norm_offsets:
-                xx = x + (-dx if flip else dx)
-                yy = y + dy
-                if 0 <= xx < w and 0 <= yy < h:
-                    err_rows[dy][xx] += e * wn
+        # Saturated pixels without pending error quantize exactly (zero error)
+        skip = grow == 255
+        if thr > 0:
+            skip |= grow == 0
+        skip &= err_rows[0] == 0
+        if np.count_nonzero(skip) < _MIN_RUN:
+            xs = range(w - 1, -1, -1) if flip else range(0, w)
+            _diffuse_span(xs, grow, out_row, err_rows, offsets, thr, w)
+        else:
+            _diffuse_row_skipping(skip, flip, grow, out_row, err_rows, offsets, thr, w)
 
         # Roll ring buffer: next row becomes current
         err_rows = err_rows[1:] + err_rows[:1]
 
-    return binarize(dither_img, dtype)
+    if workspace is not None:
+        # Carried into the next band by `resume`
+        np.stack(err_rows, out=workspace.get("err_carry", (max_dy + 1, w)))
+    return dither_img
+
+
+def _diffuse_span(
+    xs: range,
+    grow: np.ndarray,
+    out_row: np.ndarray,
+    err_rows: List[np.ndarray],
+    offsets: Tuple[Tuple[int, int, float], ...],
+    thr: float,
+    w: int,
+) -> None:
+    """Quantize the pixels `xs` of one row in order, diffusing their errors."""
+    for x in xs:
+        old = float(grow[x]) + err_rows[0][x]
+        new = 255.0 if old >= thr else 0.0
+        out_row[x] = 1 if new > 0.0 else 0
+        e = old - new
+
+        # Diffuse error (rows below the last one stay in the ring for `resume`)
+        for dy, dx, wn in offsets:
+            xx = x + dx
+            if 0 <= xx < w:
+                err_rows[dy][xx] += e * wn
+
+
+def _diffuse_row_skipping(
+    skip: np.ndarray,
+    flip: bool,
+    grow: np.ndarray,
+    out_row: np.ndarray,
+    err_rows: List[np.ndarray],
+    offsets: Tuple[Tuple[int, int, float], ...],
+    thr: float,
+    w: int,
+) -> None:
+    """
+    Scan one row, writing runs of `skip` pixels as whole slices.
+
+    A saturated pixel with no pending error quantizes to itself and diffuses
+    nothing, so a run of them only needs its output written. Pixels scanned
+    before a run may still push error into its first few positions; the run is
+    cut at the first one holding error when the scan reaches it.
+    """
+    edges = np.flatnonzero(np.diff(skip, prepend=False, append=False))
+    starts, stops = edges[0::2].tolist(), edges[1::2].tolist()
+    runs = [(s, e) for s, e in zip(starts, stops) if e - s >= _MIN_RUN]
+    if not flip:
+        pos = 0
+        for s, e in runs:
+            _diffuse_span(range(pos, s), grow, out_row, err_rows, offsets, thr, w)
+            held = np.flatnonzero(err_rows[0][s:e])
+            cut = s + int(held[0]) if held.size else e
+            out_row[s:cut] = grow[s:cut] != 0
+            _diffuse_span(range(cut, e), grow, out_row, err_rows, offsets, thr, w)
+            pos = e
+        _diffuse_span(range(pos, w), grow, out_row, err_rows, offsets, thr, w)
+    else:
+        pos = w
+        for s, e in reversed(runs):
+            _diffuse_span(range(pos - 1, e - 1, -1), grow, out_row, err_rows, offsets, thr, w)
+            held = np.flatnonzero(err_rows[0][s:e])
+            cut = s + int(held[-1]) + 1 if held.size else s
+            out_row[cut:e] = grow[cut:e] != 0
+            _diffuse_span(range(cut - 1, s - 1, -1), grow, out_row, err_rows, offsets, thr, w)
+            pos = s
+        _diffuse_span(range(pos - 1, -1, -1), grow, out_row, err_rows, offsets, thr, w)
+
+
+class ErrorDiffuser(Ditherer):
+    """
+    Error diffusion with its kernel and threshold compiled once.
+
+    The configuration is fixed at construction; every call reuses the
+    compiled kernel tables and the ditherer's workspace (gray plane, error
+    rows). Results equal `error_diff_bw` with the same arguments.
+
+    Frames are scanned in bands of `checkpoint_rows` rows, keeping the error
+    rows carried into each band, so `update` can rescan a changed frame from
+    the band holding its first dirty row instead of from the top.
+
+    Parameters
+    ----------
+    kernel_type : str, default "floyd_steinberg"
+        Name or alias of the diffusion kernel.
+    threshold : int | float, default 128
+        Global threshold for binarization.
+    serpentine : bool, default True
+        Alternate scan direction per row.
+    dtype : {"u8","f32"} | np.dtype | type, default "u8"
+        Output dtype.
+    tone : ToneCurve | None, default None
+        Tone curve folded into the grayscale conversion.
+    checkpoint_rows : int, default 64
+        Rows between saved error states.
+    workspace : Workspace | None, default None
+        Scratch buffers; a new one by default.
+
+    Raises
+    ------
+    ValueError
+        If the kernel is unknown or non-causal, or `checkpoint_rows` < 1.
+
+    Examples
+    --------
+    >>> stucki = ErrorDiffuser("stucki", serpentine=True)
+    >>> out = stucki(img)
+    >>> outs = stucki.process_batch(frames)
+    >>> stucki.update(edited, out, [(120, 40, 16, 200)])  # rescans rows >= 64
+    """
+
+    def __init__(
+        self,
+        kernel_type: str = "floyd_steinberg",
+        *,
+        threshold: Union[int, float] = 128,
+        serpentine: bool = True,
+        dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+        tone: Optional[ToneCurve] = None,
+        checkpoint_rows: int = 64,
+        workspace: Optional[Workspace] = None,
+    ) -> None:
+        super().__init__(workspace)
+        if checkpoint_rows < 1:
+            raise ValueError("checkpoint_rows must be >= 1")
+        self.kernel = compile_kernel(kernel_type)
+        self.serpentine = serpentine
+        self.dtype = dtype
+        self.tone = tone
+        self.checkpoint_rows = checkpoint_rows
+        self.out_dtype = output_dtype(dtype)
+        self._thr = map_threshold_graydomain(threshold, dtype)
+        # (H, W) of the frame the saved error states belong to
+        self._checkpoint_shape: Optional[Tuple[int, int]] = None
+
+    def output_shape(self, shape: Tuple[int, ...]) -> Tuple[int, ...]:
+        """(H, W) for an (H, W[, C]) frame."""
+        return tuple(shape[:2])
+
+    def __call__(self, img: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dither one frame (see `error_diff_bw`), into `out` when given."""
+        return self._scan(img, out, 0)
+
+    def update(self, img: np.ndarray, prev: np.ndarray, rects: Iterable[Rect]) -> np.ndarray:
+        """
+        Rescan from the first dirty row down (see `Ditherer.update`).
+
+        Rows above the first dirty one are unchanged and so is the error they
+        carry, so the scan resumes from the saved state of the band holding
+        that row. `prev` must be this ditherer's latest result (the saved
+        states describe the last frame it scanned); the whole frame is
+        rescanned when there are none for this frame size.
+        """
+        self._check_prev(img, prev)
+        slices = dirty_slices(rects, img.shape)
+        if not slices:
+            return prev
+        if self._checkpoint_shape != tuple(img.shape[:2]):
+            return self._scan(img, prev, 0)
+        first = min(ys.start for ys, _ in slices)
+        return self._scan(img, prev, first // self.checkpoint_rows * self.checkpoint_rows)
+
+    def _scan(self, img: np.ndarray, out: Optional[np.ndarray], start: int) -> np.ndarray:
+        """Scan rows ``start:`` band by band, saving the error carried into each band."""
+        h, w = img.shape[:2]
+        # The input range of the whole frame, not of each band
+        scale = gray_input_scale(img)
+        out = prepare_output((h, w), self.dtype, out)
+        step = self.checkpoint_rows
+        carry_shape = (self.kernel.max_dy + 1, w)
+        saved = self.workspace.get(
+            "err_checkpoints", (max(1, -(-h // step)),) + carry_shape
+        )
+        self._checkpoint_shape = None
+        if start > 0:
+            self.workspace.get("err_carry", carry_shape)[...] = saved[start // step]
+        for y0 in range(start, h, step):
+            if y0 > 0:
+                saved[y0 // step] = self.workspace.get("err_carry", carry_shape)
+            _diffuse_bw(
+                img[y0:y0 + step],
+                self.kernel,
+                self._thr,
+                dtype=self.dtype,
+                serpentine=self.serpentine,
+                tone=self.tone,
+                out=out[y0:y0 + step],
+                workspace=self.workspace,
+                band_rows=None,
+                resume=y0 > 0,
+                row_offset=y0,
+                input_scale=scale,
+            )
+        self._checkpoint_shape = (h, w)
+        return out
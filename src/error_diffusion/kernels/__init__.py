@@ -11,6 +11,8 @@ from .kernels import (
     ALIASES_FAMILY,
     DITHERING_KERNELS,
     KERNEL_ALIASES,
+    CompiledKernel,
+    compile_kernel,
     get_kernel_info,
     list_available_kernels,
     list_kernel_aliases,
@@ -23,6 +25,8 @@ __all__ = [
     "KERNEL_ALIASES",
     "ALIASES_FAMILY",
     "resolve_kernel_name",
+    "CompiledKernel",
+    "compile_kernel",
     "get_kernel_info",
     "list_available_kernels",
     "list_kernel_aliases",
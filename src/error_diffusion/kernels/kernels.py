@@ -6,10 +6,13 @@ Exposes:
 - DITHERING_KERNELS: flat map of canonical kernels -> (offsets, denom)
 - KERNEL_ALIASES: alias -> canonical
 - Helpers to resolve names and inspect/list kernels
+- compile_kernel: validated, normalized kernel tables for the scan loops
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
 from itertools import chain
 from typing import Any, Dict, List, Tuple
 
@@ -94,6 +97,74 @@ def resolve_kernel_name(name: str) -> str:
     return KERNEL_ALIASES.get(name, name)
 
 
+@dataclass(frozen=True)
+class CompiledKernel:
+    """
+    Causal diffusion kernel with its weights normalized, ready for a scan loop.
+
+    Attributes
+    ----------
+    name : str
+        Canonical kernel name.
+    offsets : tuple of (dy, dx, weight)
+        Targets of a left→right scan, weights divided by the denominator.
+    mirrored : tuple of (dy, dx, weight)
+        The same with `dx` negated, for right→left (serpentine) rows.
+    max_dy : int
+        Number of rows below the current one the kernel reaches.
+    """
+
+    name: str
+    offsets: Tuple[Tuple[int, int, float], ...]
+    mirrored: Tuple[Tuple[int, int, float], ...]
+    max_dy: int
+
+
+@lru_cache(maxsize=None)
+def compile_kernel(name: str) -> CompiledKernel:
+    """
+    Resolve, validate and normalize a kernel (cached per name or alias).
+
+    Parameters
+    ----------
+    name : str
+        Kernel name or alias.
+
+    Returns
+    -------
+    CompiledKernel
+        Normalized offsets for both scan directions.
+
+    Raises
+    ------
+    ValueError
+        If the kernel is unknown or non-causal (contains dy < 0).
+    """
+    kname = resolve_kernel_name(name)
+    if kname not in DITHERING_KERNELS:
+        raise ValueError(
+            f"Unsupported kernel '{kname}'. "
+            f"Supported: {list(DITHERING_KERNELS.keys()) + list(KERNEL_ALIASES.keys())}"
+        )
+    offsets, denom = DITHERING_KERNELS[kname]
+
+    # Our scans are top-down; dy<0 would target already-processed rows
+    if any(dy_dx[0] < 0 for dy_dx, _ in offsets):
+        raise ValueError(
+            f"Kernel '{kname}' is non-causal (contains dy < 0). "
+            f"Use a causal variant (dy >= 0) or a different scan strategy."
+        )
+
+    dden = float(denom)
+    norm = tuple((dy, dx, float(w) / dden) for (dy, dx), w in offsets)
+    return CompiledKernel(
+        name=kname,
+        offsets=norm,
+        mirrored=tuple((dy, -dx, wn) for dy, dx, wn in norm),
+        max_dy=max((dy for dy, _, _ in norm), default=0),
+    )
+
+
 def get_kernel_info(name: str) -> Dict[str, Any]:
     """Inspect kernel details by name or alias."""
     kname = resolve_kernel_name(name)
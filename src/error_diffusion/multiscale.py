@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""Multiscale (pyramid) error diffusion.
+
+Dots are assigned top-down over a quadtree of block sums, after Katsavounidis
+and Kuo: the top level receives ``round(total gray mass)`` dots, and every
+node splits its dot count among its four children. A node's rounding error
+(its dot count minus its gray mass) is diffused to its children in
+proportion to their room (space left for dots when it is positive, mass
+when negative), then the children are rounded so their counts add up to the
+parent's. Every level is one whole-array operation, so there is no
+per-pixel serial dependency and local averages are exact at every scale.
+"""
+
+from __future__ import annotations
+
+from typing import List, Literal, Optional, Union
+
+import numpy as np
+
+from ..utils.grayscale import grayscale
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace, prepare_output
+
+# Bias added to the children's remainders, in (0,0),(0,1),(1,0),(1,1) order: near
+# ties, extra dots follow the 2×2 Bayer order (0,0), (1,1), (0,1), (1,0). A real
+# bias (not just a tie-break) keeps dots of adjacent blocks from clumping along
+# their shared edges when remainders differ only by image noise.
+_CHILD_PRIORITY = np.array([0.45, 0.15, 0.0, 0.3])
+
+
+def _block_sums(a: np.ndarray) -> np.ndarray:
+    """Sums of the 2×2 blocks of an (2h, 2w) array."""
+    h, w = a.shape
+    return a.reshape(h // 2, 2, w // 2, 2).sum(axis=(1, 3))
+
+
+def _children(a: np.ndarray) -> np.ndarray:
+    """(h*w, 4) children of each node, from the (2h, 2w) level below."""
+    h, w = a.shape
+    return a.reshape(h // 2, 2, w // 2, 2).transpose(0, 2, 1, 3).reshape(-1, 4)
+
+
+def split_quota(
+    quota: np.ndarray,
+    mass: np.ndarray,
+    cap: np.ndarray,
+    priority: np.ndarray,
+) -> np.ndarray:
+    """
+    Split integer dot counts among groups of children.
+
+    Parameters
+    ----------
+    quota : np.ndarray
+        (G,) dot count of each group, with ``0 <= quota <= cap.sum(1)``.
+    mass : np.ndarray
+        (G, K) gray mass of each child (``0 <= mass <= cap``).
+    cap : np.ndarray
+        (G, K) pixels under each child.
+    priority : np.ndarray
+        (K,) bias added to the children's remainders when ranking them for
+        the leftover dots.
+
+    Returns
+    -------
+    np.ndarray
+        (G, K) integer counts, ``0 <= count <= cap``, summing to `quota`.
+    """
+    d = quota - mass.sum(axis=1)
+    room = np.where((d > 0)[:, None], cap - mass, mass)
+    total = room.sum(axis=1)
+    share = np.divide(d, total, out=np.zeros_like(d), where=total > 0)
+    target = np.clip(mass + share[:, None] * room, 0.0, cap)
+
+    base = np.floor(target)
+    extra = np.rint(quota - base.sum(axis=1)).astype(np.intp)
+    # Children with the largest remainders get one more dot each
+    key = (target - base) + priority
+    key[base >= cap] = -1.0
+    rank = np.argsort(np.argsort(-key, axis=1), axis=1)
+    return base + (rank < extra[:, None])
+
+
+def multiscale_bw(
+    img: np.ndarray,
+    *,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+) -> np.ndarray:
+    """
+    Apply multiscale (pyramid) error diffusion.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Input image (H, W) or (H, W, C). Converted to grayscale internally.
+    dtype : {"u8","f32"} | np.dtype | type, optional
+        Output dtype for the binarized image. Default "u8".
+    tone : ToneCurve | None, optional
+        Tone curve folded into the grayscale conversion. Default None.
+    out : np.ndarray | None, optional
+        Preallocated (H, W) output, written in place and returned. Default None.
+    workspace : Workspace | None, optional
+        Reusable scratch buffers (gray plane). Default None.
+
+    Returns
+    -------
+    np.ndarray
+        Dithered 1-bit image mapped to `dtype` (`out` when given). Its number
+        of white pixels in every aligned 2^k block is within about one of the
+        block's gray mass.
+    """
+    h, w = img.shape[:2]
+    dither_img = prepare_output((h, w), dtype, out)
+    if h == 0 or w == 0:
+        return dither_img
+    g = grayscale(img, dtype, tone=tone, workspace=workspace)
+
+    # Pad to multiples of 2^levels (the largest power of two <= min(h, w))
+    levels = min(h, w).bit_length() - 1
+    step = 1 << levels
+    hp, wp = -(-h // step) * step, -(-w // step) * step
+    mass = np.zeros((hp, wp), dtype=np.float64)
+    np.divide(g, 255.0, out=mass[:h, :w])
+    cap = np.zeros((hp, wp), dtype=np.float64)
+    cap[:h, :w] = 1.0
+
+    masses: List[np.ndarray] = [mass]
+    caps: List[np.ndarray] = [cap]
+    for _ in range(levels):
+        masses.append(_block_sums(masses[-1]))
+        caps.append(_block_sums(caps[-1]))
+
+    # Top level: one group holding every top node
+    top_mass, top_cap = masses[-1], caps[-1]
+    total = np.rint(np.array([top_mass.sum()]))
+    priority = -1e-9 * np.arange(top_mass.size)
+    quota = split_quota(total, top_mass.reshape(1, -1), top_cap.reshape(1, -1), priority)
+    quota = quota.reshape(top_mass.shape)
+
+    for lvl in range(levels, 0, -1):
+        hc, wc = masses[lvl - 1].shape
+        child = split_quota(
+            quota.reshape(-1),
+            _children(masses[lvl - 1]),
+            _children(caps[lvl - 1]),
+            _CHILD_PRIORITY,
+        )
+        quota = child.reshape(hc // 2, wc // 2, 2, 2).transpose(0, 2, 1, 3).reshape(hc, wc)
+
+    np.greater(quota[:h, :w], 0.5, out=dither_img, casting="unsafe")
+    return dither_img
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""Hybrid dithering for mixed documents.
+
+This subpackage classifies image blocks as text/line art or photographic
+in one vectorized pass, thresholds the former and error-diffuses the
+latter, blending the two at region boundaries.
+"""
+
+from __future__ import annotations
+
+from .classify import block_stats, classify_blocks
+from .hybrid import hybrid_bw
+
+__all__ = [
+    "hybrid_bw",
+    "classify_blocks",
+    "block_stats",
+]
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Text/photo block classification for hybrid dithering.
+
+Every block gets a 256-bin histogram (one `bincount` per block row) and Otsu's
+two-class split is evaluated for all blocks at once from cumulative sums. A
+block is text/line art when its histogram is strongly bimodal (Otsu
+separability ``η = σ_B² / σ_T²``) with well separated modes, or when it is
+flat and close to paper white or ink black; anything else is photographic.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from ..utils.histogram import N_BINS
+
+# Flat blocks (std below this) are text when their mean is this close to 0 or 255
+_FLAT_STD = 6.0
+_PAPER_MARGIN = 48.0
+
+
+def block_stats(g: np.ndarray, block: int) -> Tuple[np.ndarray, ...]:
+    """
+    Per-block mean, standard deviation and Otsu bimodality of a gray plane.
+
+    Parameters
+    ----------
+    g : np.ndarray
+        (H, W) gray plane with integral values in [0..255] (uint8 or float32).
+    block : int
+        Block side in pixels; partial blocks at the right/bottom edges are
+        padded by edge replication.
+
+    Returns
+    -------
+    (mean, std, eta, contrast) : tuple of np.ndarray
+        (ceil(H / block), ceil(W / block)) float64 arrays: block mean and
+        standard deviation, Otsu separability η in [0, 1] (0 for flat blocks)
+        and the distance between the two Otsu class means.
+    """
+    h, w = g.shape
+    nby, nbx = -(-h // block), -(-w // block)
+    pad = ((0, nby * block - h), (0, nbx * block - w))
+    q = np.pad(np.asarray(g, dtype=np.intp), pad, "edge")
+
+    # (nby * nbx, 256) histograms, one bincount per row of blocks
+    col_id = (np.arange(nbx * block) // block) * N_BINS
+    hist = np.empty((nby, nbx * N_BINS), dtype=np.float64)
+    for by in range(nby):
+        ids = q[by * block:(by + 1) * block] + col_id
+        hist[by] = np.bincount(ids.ravel(), minlength=nbx * N_BINS)
+    p = hist.reshape(-1, N_BINS) / float(block * block)
+
+    levels = np.arange(N_BINS, dtype=np.float64)
+    omega = np.cumsum(p, axis=1)
+    mu = np.cumsum(p * levels, axis=1)
+    mu_t = mu[:, -1:]
+    var_t = (p * (levels - mu_t) ** 2).sum(axis=1)
+
+    # Between-class variance for every split; splits with an empty class are 0
+    denom = omega * (1.0 - omega)
+    var_b = np.divide(
+        (mu_t * omega - mu) ** 2, denom, out=np.zeros_like(p), where=denom > 1e-12
+    )
+    best = var_b.argmax(axis=1)
+    rows = np.arange(p.shape[0])
+    eta = np.divide(var_b[rows, best], var_t, out=np.zeros_like(var_t), where=var_t > 1e-12)
+    w0, m = omega[rows, best], mu[rows, best]
+    m0 = np.divide(m, w0, out=np.zeros_like(m), where=w0 > 0)
+    m1 = np.divide(mu_t[:, 0] - m, 1.0 - w0, out=np.zeros_like(m), where=w0 < 1)
+
+    shape = (nby, nbx)
+    return (
+        mu_t.reshape(shape),
+        np.sqrt(var_t).reshape(shape),
+        eta.reshape(shape),
+        (m1 - m0).reshape(shape),
+    )
+
+
+def classify_blocks(
+    g: np.ndarray,
+    *,
+    block: int = 32,
+    min_bimodality: float = 0.85,
+    min_contrast: float = 128.0,
+) -> np.ndarray:
+    """
+    Classify the blocks of a gray plane as photographic or text/line art.
+
+    Parameters
+    ----------
+    g : np.ndarray
+        (H, W) gray plane with integral values in [0..255] (uint8 or float32).
+    block : int, default 32
+        Block side in pixels.
+    min_bimodality : float, default 0.85
+        Smallest Otsu separability η of a text block.
+    min_contrast : float, default 128
+        Smallest distance between the Otsu class means of a text block.
+
+    Returns
+    -------
+    np.ndarray
+        (ceil(H / block), ceil(W / block)) bool array, True for photo blocks.
+        Text blocks with at least 6 photo neighbours (of 8) count as photo, so
+        photos do not get holes where they happen to be bimodal.
+    """
+    mean, std, eta, contrast = block_stats(g, block)
+    flat = std < _FLAT_STD
+    paper = (mean <= _PAPER_MARGIN) | (mean >= 255.0 - _PAPER_MARGIN)
+    text = np.where(flat, paper, (eta >= min_bimodality) & (contrast >= min_contrast))
+    photo = ~text
+
+    padded = np.pad(photo, 1, "edge").astype(np.int8)
+    nby, nbx = photo.shape
+    neighbours = sum(
+        padded[1 + dy:1 + dy + nby, 1 + dx:1 + dx + nbx]
+        for dy in (-1, 0, 1)
+        for dx in (-1, 0, 1)
+        if dy or dx
+    )
+    return photo | (neighbours >= 6)
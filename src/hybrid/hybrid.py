@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""Block-classified hybrid dithering for mixed documents.
+
+The page is thresholded as a whole (one vectorized pass), and error diffusion
+runs only over the bounding boxes of connected photo regions found by
+`classify_blocks`, so the serial scan costs scale with the photographic area
+rather than the page area. Across region boundaries the two results are mixed
+by an ordered (Bayer) pattern whose density ramps over `blend` pixels, so no
+hard seam shows between the thresholded and the diffused parts.
+"""
+
+from __future__ import annotations
+
+from typing import Literal, Optional, Union
+
+import numpy as np
+from scipy import ndimage
+
+from ..error_diffusion import error_diff_bw
+from ..error_diffusion.kernels import compile_kernel
+from ..naive import threshold_bw
+from ..ordered.group.bayer import bayer_matrix
+from ..utils.grayscale import grayscale
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace
+from .classify import classify_blocks
+
+
+def _box_blur(a: np.ndarray, r: int) -> np.ndarray:
+    """Separable (2r+1)² box mean with edge replication."""
+    for axis in (0, 1):
+        pad = [(0, 0), (0, 0)]
+        pad[axis] = (r + 1, r)
+        c = np.cumsum(np.pad(a, pad, "edge"), axis=axis)
+        n = a.shape[axis]
+        a = (np.take(c, np.arange(2 * r + 1, 2 * r + 1 + n), axis=axis)
+             - np.take(c, np.arange(n), axis=axis)) / (2 * r + 1)
+    return a
+
+
+def hybrid_bw(
+    img: np.ndarray,
+    *,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+    kernel_type: str = "floyd_steinberg",
+    threshold: Union[int, float] = 128,
+    text_method: Literal[
+        "global", "mean", "percentile", "otsu", "niblack", "sauvola", "bradley"
+    ] = "global",
+    serpentine: bool = True,
+    block: int = 32,
+    min_bimodality: float = 0.85,
+    min_contrast: float = 128.0,
+    blend: int = 8,
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+) -> np.ndarray:
+    """
+    Threshold text/line-art blocks and error-diffuse photo blocks.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Input image (H, W) or (H, W, C). Converted to grayscale internally.
+    dtype : {"u8","f32"} | np.dtype | type, optional
+        Output dtype for the binarized image. Default "u8".
+    kernel_type : str, optional
+        Diffusion kernel of the photo regions. Default "floyd_steinberg".
+    threshold : int | float, optional
+        Threshold of the diffusion, and of the text regions with
+        ``text_method="global"``. Default 128.
+    text_method : str, optional
+        `threshold_bw` method for the text regions. Default "global".
+    serpentine : bool, optional
+        Alternate the diffusion scan direction per row. Default True.
+    block : int, optional
+        Classification block side in pixels (>= 4). Default 32.
+    min_bimodality : float, optional
+        Smallest Otsu separability of a text block (see `classify_blocks`). Default 0.85.
+    min_contrast : float, optional
+        Smallest distance between the Otsu class means of a text block. Default 128.
+    blend : int, optional
+        Half-width in pixels of the transition between the two methods, at
+        most ``block // 2``; 0 switches at block edges. Default 8.
+    tone : ToneCurve | None, optional
+        Tone curve folded into the grayscale conversion. Default None.
+    out : np.ndarray | None, optional
+        Preallocated (H, W) output, written in place and returned. Default None.
+    workspace : Workspace | None, optional
+        Reusable scratch buffers (gray plane, error rows). Default None.
+
+    Returns
+    -------
+    np.ndarray
+        Dithered 1-bit image mapped to `dtype` (`out` when given).
+
+    Raises
+    ------
+    ValueError
+        If `block` < 4, `blend` is outside [0, block // 2], or the kernel or
+        `text_method` is unknown.
+    """
+    if block < 4:
+        raise ValueError("block must be >= 4")
+    if not 0 <= blend <= block // 2:
+        raise ValueError("blend must be between 0 and block // 2")
+    compile_kernel(kernel_type)
+    h, w = img.shape[:2]
+
+    g = grayscale(img, dtype, tone=tone, workspace=workspace)
+    photo = classify_blocks(
+        g, block=block, min_bimodality=min_bimodality, min_contrast=min_contrast
+    )
+    # Text everywhere first; `g` may share the workspace buffer, so it is not used after this
+    dither_img = threshold_bw(
+        img,
+        dtype=dtype,
+        threshold=threshold,
+        method=text_method,
+        tone=tone,
+        out=out,
+        workspace=workspace,
+    )
+    if not photo.any():
+        return dither_img
+
+    # Share of the diffused result per pixel: 1 inside photo blocks, ramping to 0 outside
+    weight = np.repeat(np.repeat(photo.astype(np.float32), block, 0), block, 1)[:h, :w]
+    if blend > 0:
+        weight = _box_blur(weight, blend)
+    bayer = bayer_matrix(8)
+
+    # The ramp reaches at most half a block into text blocks
+    reach = ndimage.binary_dilation(photo, np.ones((3, 3), bool)) if blend > 0 else photo
+    labels, _ = ndimage.label(reach)
+    for sl in ndimage.find_objects(labels):
+        y0, y1 = sl[0].start * block, min(h, sl[0].stop * block)
+        x0, x1 = sl[1].start * block, min(w, sl[1].stop * block)
+        diffused = error_diff_bw(
+            img[y0:y1, x0:x1],
+            dtype=dtype,
+            kernel_type=kernel_type,
+            threshold=threshold,
+            serpentine=serpentine,
+            tone=tone,
+            workspace=workspace,
+            row_offset=y0,
+        )
+        pattern = bayer[np.ix_(np.arange(y0, y1) % 8, np.arange(x0, x1) % 8)]
+        take = weight[y0:y1, x0:x1] > pattern
+        dither_img[y0:y1, x0:x1][take] = diffused[take]
+    return dither_img
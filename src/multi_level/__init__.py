@@ -7,8 +7,9 @@ dithering, including palette-based error diffusion.
 
 from __future__ import annotations
 
-from .palette import palette_bw
+from .palette import PaletteDiffuser, palette_bw
 
 __all__ = [
     "palette_bw",
+    "PaletteDiffuser",
 ]
@@ -2,49 +2,29 @@
 """Palette-based error diffusion dithering.
 
 This module provides an implementation of error diffusion dithering
-to a fixed RGB palette using canonical kernels such as Floyd-Steinberg.
+to a fixed RGB palette using canonical kernels such as Floyd-Steinberg,
+as a function and as a reusable `PaletteDiffuser` object.
 """
 
 from __future__ import annotations
 
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 import numpy as np
 
-from ..error_diffusion.kernels import (
-    DITHERING_KERNELS,
-    KERNEL_ALIASES,
-    resolve_kernel_name,
-)
-from ..utils.prep_img import tuple_prepare_img
-from .nearest import nearest_color
+from ..error_diffusion.kernels import CompiledKernel, compile_kernel
+from ..utils.ditherer import Ditherer
+from ..utils.prep_img import prepare_rgb_rows, quantize_to_uint8, rgb_input_scale
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace, prepare_output
 
 
 def normalize_kernel(
     kernel_type: str,
 ) -> Tuple[List[Tuple[int, int, float]], int]:
     """Resolve and normalize a diffusion kernel."""
-    kname = resolve_kernel_name(kernel_type)
-    if kname not in DITHERING_KERNELS:
-        raise ValueError(
-            f"Unsupported kernel '{kernel_type}'. "
-            f"Supported: {list(DITHERING_KERNELS.keys()) + list(KERNEL_ALIASES.keys())}"
-        )
-    offsets, denom = DITHERING_KERNELS[kname]
-    if any(dy_dx[0] < 0 for dy_dx, _ in offsets):
-        raise ValueError(
-            f"Kernel '{kname}' is non-causal (contains dy < 0). "
-            f"Use a causal variant (dy >= 0) or a different traversal."
-        )
-
-    norm_offsets: List[Tuple[int, int, float]] = []
-    max_dy = 0
-    dden = float(denom)
-    for (dy_dx, w) in offsets:
-        dy, dx = dy_dx
-        max_dy = max(max_dy, dy)
-        norm_offsets.append((dy, dx, float(w) / dden))
-    return norm_offsets, max_dy
+    kernel = compile_kernel(kernel_type)
+    return list(kernel.offsets), kernel.max_dy
 
 
 def validate_palette(palette: Iterable[Tuple[int, int, int]]) -> np.ndarray:
@@ -61,6 +41,9 @@ def palette_bw(
     kernel_type: str = "floyd_steinberg",
     *,
     serpentine: bool = True,
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
 ) -> np.ndarray:
     """
     Apply palette-based error diffusion dithering.
@@ -68,42 +51,101 @@ def palette_bw(
     Parameters
     ----------
     img : np.ndarray
-        Input RGB image (H, W, 3), dtype uint8.
+        Input RGB(A) image (H, W, 3/4), any numeric dtype; may be a memmap.
+        Rows are converted to float32 one at a time, so no full-size copy is made.
     palette : Iterable[Tuple[int, int, int]]
         List of palette entries (R, G, B) with values in [0, 255].
     kernel_type : str, default "floyd_steinberg"
         The diffusion kernel name or alias.
     serpentine : bool, default True
         Whether to alternate scanline direction.
+    tone : ToneCurve | None, default None
+        Tone curve applied to each channel (via its 256-entry LUT) before diffusion.
+    out : np.ndarray | None, default None
+        Preallocated (H, W, 3) uint8 output, written in place and returned.
+    workspace : Workspace | None, default None
+        Reusable scratch buffers (error rows, converted input row) shared across calls.
 
     Returns
     -------
     np.ndarray
         Dithered RGB image (H, W, 3) using colors from the palette.
-    """
-    norm_offsets, max_dy = normalize_kernel(kernel_type)
-    rgb, _, _, _ = tuple_prepare_img(img, "u8")
-    palette_f32 = validate_palette(palette)
 
-    h, w, _ = rgb.shape
-    dither_img = np.empty((h, w, 3), dtype=np.uint8)
-    err_rows = [np.zeros((w, 3), dtype=np.float32) for _ in range(max_dy + 1)]
+    Raises
+    ------
+    ValueError
+        If the input image is not (H, W, 3/4).
+    """
+    return _diffuse_palette(
+        img,
+        validate_palette(palette),
+        compile_kernel(kernel_type),
+        serpentine=serpentine,
+        tone=tone,
+        out=out,
+        workspace=workspace,
+    )
+
+
+def _diffuse_palette(
+    img: np.ndarray,
+    palette_f32: np.ndarray,
+    kernel: CompiledKernel,
+    *,
+    serpentine: bool,
+    tone: Optional[ToneCurve],
+    out: Optional[np.ndarray],
+    workspace: Optional[Workspace],
+) -> np.ndarray:
+    """Scan loop of `palette_bw`, for a validated (K, 3) float32 palette and a compiled kernel."""
+    if img.ndim != 3 or img.shape[2] < 3:
+        raise ValueError("Input image must be HxWx3 or HxWx4.")
+    max_dy = kernel.max_dy
+
+    if tone is not None:
+        # uint8 input is a view here; the tone LUT is applied per row below
+        src = quantize_to_uint8(img[..., :3])
+        scale = 1.0
+    else:
+        src = img
+        scale = rgb_input_scale(img)
+
+    h, w, _ = img.shape
+    dither_img = prepare_output((h, w, 3), "u8", out)
+    if workspace is None:
+        err_rows = [np.zeros((w, 3), dtype=np.float32) for _ in range(max_dy + 1)]
+    else:
+        err_rows = [workspace.zeros(f"err_row{i}", (w, 3)) for i in range(max_dy + 1)]
+    if workspace is None:
+        row = np.empty((1, w, 3), dtype=np.float32)
+    else:
+        row = workspace.get("rgb_row", (1, w, 3))
+    tone_row = None if tone is None else np.empty((w, 3), dtype=np.uint8)
 
     for y in range(h):
         flip = serpentine and (y & 1)
         for dy in range(1, max_dy + 1):
             err_rows[dy].fill(0.0)
 
+        if tone_row is None:
+            prepare_rgb_rows(src, y, y + 1, scale, out=row)
+        else:
+            np.take(tone.channel_lut, src[y], out=tone_row)
+            row[0] = tone_row
+        rgb_y = row[0]
+
         xs = range(w - 1, -1, -1) if flip else range(0, w)
+        offsets = kernel.mirrored if flip else kernel.offsets
         for x in xs:
-            old = rgb[y, x] + err_rows[0][x]
-            new_col_f32, _ = nearest_color(old, palette_f32)
-            new_col_u8 = new_col_f32.astype(np.uint8)
-            dither_img[y, x] = new_col_u8
+            old = rgb_y[x] + err_rows[0][x]
+            # `nearest_color` without its per-pixel validation of the palette
+            diffs = palette_f32 - old
+            new_col_f32 = palette_f32[np.argmin(np.einsum("ij,ij->i", diffs, diffs))]
+            dither_img[y, x] = new_col_f32
 
             e = old - new_col_f32
-            for dy, dx, wn in norm_offsets:
-                xx = x + (-dx if flip else dx)
+            for dy, dx, wn in offsets:
+                xx = x + dx
                 yy = y + dy
                 if 0 <= xx < w and 0 <= yy < h:
                     err_rows[dy][xx] += e * wn
@@ -111,3 +153,69 @@ def palette_bw(
         err_rows = err_rows[1:] + err_rows[:1]
 
     return dither_img
+
+
+class PaletteDiffuser(Ditherer):
+    """
+    Palette error diffusion with its palette and kernel validated once.
+
+    The configuration is fixed at construction; every call reuses the
+    float32 palette, the compiled kernel tables and the ditherer's workspace
+    (error rows, converted input row). Results equal `palette_bw` with the
+    same arguments.
+
+    Parameters
+    ----------
+    palette : Iterable[Tuple[int, int, int]]
+        Palette entries (R, G, B) with values in [0, 255].
+    kernel_type : str, default "floyd_steinberg"
+        The diffusion kernel name or alias.
+    serpentine : bool, default True
+        Whether to alternate scanline direction.
+    tone : ToneCurve | None, default None
+        Tone curve applied to each channel before diffusion.
+    workspace : Workspace | None, default None
+        Scratch buffers; a new one by default.
+
+    Raises
+    ------
+    ValueError
+        If the palette is not (K, 3), or the kernel is unknown or non-causal.
+
+    Examples
+    --------
+    >>> cga = PaletteDiffuser([(0, 0, 0), (85, 255, 255), (255, 85, 255), (255, 255, 255)])
+    >>> outs = cga.process_batch(frames)   # (N, H, W, 3) uint8
+    """
+
+    def __init__(
+        self,
+        palette: Iterable[Tuple[int, int, int]],
+        kernel_type: str = "floyd_steinberg",
+        *,
+        serpentine: bool = True,
+        tone: Optional[ToneCurve] = None,
+        workspace: Optional[Workspace] = None,
+    ) -> None:
+        super().__init__(workspace)
+        self.palette = validate_palette(palette)
+        self.palette.setflags(write=False)
+        self.kernel = compile_kernel(kernel_type)
+        self.serpentine = serpentine
+        self.tone = tone
+
+    def output_shape(self, shape: Tuple[int, ...]) -> Tuple[int, ...]:
+        """(H, W, 3) for an (H, W, 3/4) frame."""
+        return (shape[0], shape[1], 3)
+
+    def __call__(self, img: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dither one frame (see `palette_bw`), into `out` when given."""
+        return _diffuse_palette(
+            img,
+            self.palette,
+            self.kernel,
+            serpentine=self.serpentine,
+            tone=self.tone,
+            out=out,
+            workspace=self.workspace,
+        )
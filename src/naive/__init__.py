@@ -2,13 +2,15 @@
 """Naive threshold-based dithering methods.
 
 This subpackage provides simple binarization approaches without
-error diffusion, including global, mean, percentile, and Otsu thresholding.
+error diffusion, including global, mean, percentile, and Otsu thresholding,
+plus local (Niblack, Sauvola, Bradley) thresholds.
 """
 
 from __future__ import annotations
 
-from .threshold import threshold_bw
+from .threshold import ThresholdDitherer, threshold_bw
 
 __all__ = [
     "threshold_bw",
+    "ThresholdDitherer",
 ]
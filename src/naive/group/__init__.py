@@ -2,19 +2,40 @@
 """Thresholding methods for naive dithering.
 
 This package-level module exposes multiple threshold selection strategies
-(global, mean, percentile, and Otsu) under a unified namespace.
+(global, mean, percentile, and Otsu) under a unified namespace. The
+``*_hist`` variants evaluate the same statistics from a 256-bin histogram;
+the local methods (Niblack, Sauvola, Bradley) build per-pixel threshold maps;
+multi-Otsu splits the histogram into several classes.
 """
 
 from __future__ import annotations
 
 from .globalg import global_threshold
-from .mean import mean_threshold
-from .otsu import otsu_threshold
-from .percentile import percentile_threshold
+from .local import (
+    bradley_threshold,
+    integral_images,
+    local_mean_std,
+    niblack_threshold,
+    sauvola_threshold,
+)
+from .mean import mean_threshold, mean_threshold_hist
+from .multi_otsu import multi_otsu_levels, multi_otsu_thresholds
+from .otsu import otsu_threshold, otsu_threshold_hist
+from .percentile import percentile_threshold, percentile_threshold_hist
 
 __all__ = [
     "global_threshold",
     "mean_threshold",
     "percentile_threshold",
     "otsu_threshold",
+    "mean_threshold_hist",
+    "percentile_threshold_hist",
+    "otsu_threshold_hist",
+    "integral_images",
+    "local_mean_std",
+    "niblack_threshold",
+    "sauvola_threshold",
+    "bradley_threshold",
+    "multi_otsu_thresholds",
+    "multi_otsu_levels",
 ]
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""Local (adaptive) threshold selection via integral images.
+
+Windowed means and variances come from summed-area tables, so each pixel
+costs O(1) regardless of the window size. Windows are clipped at the image
+border (each pixel averages only the pixels that exist).
+
+All functions take a gray band plus the local row range to evaluate; a band
+that includes ``window // 2`` halo rows above and below the target rows gives
+exactly the same thresholds as the full image, since integer box sums are
+exact in float64.
+
+References
+----------
+- Niblack, "An Introduction to Digital Image Processing", 1986.
+- Sauvola & Pietikäinen, "Adaptive document image binarization", 2000.
+- Bradley & Roth, "Adaptive Thresholding Using the Integral Image", 2007.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def integral_images(
+    gray: np.ndarray,
+    out: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute zero-padded summed-area tables of values and squared values.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        2D array of grayscale intensities in the [0..255] gray domain.
+    out : tuple of np.ndarray | None, default None
+        Two C-contiguous float64 buffers of at least (H + 1, W + 1) rows and
+        columns (e.g. from `Workspace.get`); their leading rows/columns receive
+        the tables, so no other temporaries are allocated.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        ``(S1, S2)``, float64 arrays of shape (H + 1, W + 1) where
+        ``S[y, x]`` is the sum over ``gray[:y, :x]`` (views of `out` when given).
+    """
+    h, w = gray.shape
+    if out is None:
+        s1 = np.empty((h + 1, w + 1), dtype=np.float64)
+        s2 = np.empty((h + 1, w + 1), dtype=np.float64)
+    else:
+        s1, s2 = (s[:h + 1, :w + 1] for s in out)
+    for s in (s1, s2):
+        s[0] = 0.0
+        s[1:, 0] = 0.0
+    s1[1:, 1:] = gray
+    np.cumsum(s1[1:, 1:], axis=0, out=s1[1:, 1:])
+    np.cumsum(s1[1:, 1:], axis=1, out=s1[1:, 1:])
+    np.square(gray, dtype=np.float64, out=s2[1:, 1:])
+    np.cumsum(s2[1:, 1:], axis=0, out=s2[1:, 1:])
+    np.cumsum(s2[1:, 1:], axis=1, out=s2[1:, 1:])
+    return s1, s2
+
+
+def local_mean_std(
+    gray: np.ndarray,
+    window: int,
+    row_start: int = 0,
+    row_stop: Optional[int] = None,
+    integrals: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Windowed mean and standard deviation for rows ``[row_start, row_stop)``.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        2D gray band (target rows plus any halo rows).
+    window : int
+        Odd window side length (>= 3).
+    row_start : int, default 0
+        First target row, local to `gray`.
+    row_stop : int | None, default None
+        End of the target rows (exclusive); defaults to all rows.
+    integrals : tuple of np.ndarray | None, default None
+        Buffers for the summed-area tables (see `integral_images`).
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        ``(mean, std)`` float64 arrays of shape (row_stop - row_start, W).
+
+    Raises
+    ------
+    ValueError
+        If `window` is not an odd integer >= 3.
+    """
+    if window < 3 or window % 2 == 0:
+        raise ValueError("window must be an odd integer >= 3")
+
+    h, w = gray.shape
+    row_stop = h if row_stop is None else row_stop
+    r = window // 2
+    s1, s2 = integral_images(gray, integrals)
+
+    ys = np.arange(row_start, row_stop)
+    xs = np.arange(w)
+    y_lo, y_hi = np.clip(ys - r, 0, h), np.clip(ys + r + 1, 0, h)
+    x_lo, x_hi = np.clip(xs - r, 0, w), np.clip(xs + r + 1, 0, w)
+    count = ((y_hi - y_lo)[:, None] * (x_hi - x_lo)[None, :]).astype(np.float64)
+
+    def box(s: np.ndarray) -> np.ndarray:
+        return (
+            s[np.ix_(y_hi, x_hi)] - s[np.ix_(y_lo, x_hi)]
+            - s[np.ix_(y_hi, x_lo)] + s[np.ix_(y_lo, x_lo)]
+        )
+
+    mean = box(s1) / count
+    var = box(s2) / count - mean * mean
+    np.maximum(var, 0.0, out=var)
+    return mean, np.sqrt(var)
+
+
+def niblack_threshold(
+    gray: np.ndarray,
+    window: int = 15,
+    k: float = -0.2,
+    row_start: int = 0,
+    row_stop: Optional[int] = None,
+    integrals: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Niblack local threshold ``T = m + k * s``.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        2D gray band in the [0..255] gray domain.
+    window : int, default 15
+        Odd window side length.
+    k : float, default -0.2
+        Weight of the local standard deviation.
+    row_start, row_stop : int, optional
+        Target rows, local to `gray` (see `local_mean_std`).
+    integrals : tuple of np.ndarray | None, optional
+        Buffers for the summed-area tables (see `integral_images`).
+
+    Returns
+    -------
+    np.ndarray
+        Threshold map (float64) for the target rows.
+    """
+    mean, std = local_mean_std(gray, window, row_start, row_stop, integrals)
+    return mean + k * std
+
+
+def sauvola_threshold(
+    gray: np.ndarray,
+    window: int = 15,
+    k: float = 0.2,
+    r: float = 128.0,
+    row_start: int = 0,
+    row_stop: Optional[int] = None,
+    integrals: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Sauvola local threshold ``T = m * (1 + k * (s / R - 1))``.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        2D gray band in the [0..255] gray domain.
+    window : int, default 15
+        Odd window side length.
+    k : float, default 0.2
+        Sensitivity to the local standard deviation.
+    r : float, default 128.0
+        Dynamic range R of the standard deviation.
+    row_start, row_stop : int, optional
+        Target rows, local to `gray` (see `local_mean_std`).
+    integrals : tuple of np.ndarray | None, optional
+        Buffers for the summed-area tables (see `integral_images`).
+
+    Returns
+    -------
+    np.ndarray
+        Threshold map (float64) for the target rows.
+    """
+    mean, std = local_mean_std(gray, window, row_start, row_stop, integrals)
+    return mean * (1.0 + k * (std / float(r) - 1.0))
+
+
+def bradley_threshold(
+    gray: np.ndarray,
+    window: int = 15,
+    t: float = 0.15,
+    row_start: int = 0,
+    row_stop: Optional[int] = None,
+    integrals: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Bradley-Roth local threshold ``T = m * (1 - t)``.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        2D gray band in the [0..255] gray domain.
+    window : int, default 15
+        Odd window side length.
+    t : float, default 0.15
+        Fraction below the local mean at which a pixel turns black.
+    row_start, row_stop : int, optional
+        Target rows, local to `gray` (see `local_mean_std`).
+    integrals : tuple of np.ndarray | None, optional
+        Buffers for the summed-area tables (see `integral_images`).
+
+    Returns
+    -------
+    np.ndarray
+        Threshold map (float64) for the target rows.
+    """
+    mean, _ = local_mean_std(gray, window, row_start, row_stop, integrals)
+    return mean * (1.0 - t)
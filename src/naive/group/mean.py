@@ -2,7 +2,7 @@
 """Mean threshold selection for binarization.
 
 This module computes a threshold as the mean grayscale intensity
-of the input image.
+of the input image, either from the pixels or from a 256-bin histogram.
 """
 
 from __future__ import annotations
@@ -27,3 +27,26 @@ def mean_threshold(
         Mean intensity value, used as threshold.
     """
     return float(np.mean(gray_f32))
+
+
+def mean_threshold_hist(
+    hist: np.ndarray
+) -> float:
+    """
+    Compute the mean-intensity threshold from a gray-level histogram.
+
+    Parameters
+    ----------
+    hist : np.ndarray
+        (256,) histogram of gray levels (see `gray_histogram`).
+
+    Returns
+    -------
+    float
+        Mean intensity value (128.0 for an empty histogram).
+    """
+    n = int(hist.sum())
+    if n == 0:
+        return 128.0
+    levels = np.arange(hist.size, dtype=np.float64)
+    return float(np.dot(hist.astype(np.float64), levels) / n)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Multi-threshold Otsu via dynamic programming over the histogram.
+
+Splitting the 256 gray levels into `classes` contiguous classes so that the
+between-class variance is maximal is equivalent to maximizing
+``sum_c S_c**2 / P_c`` (class mass P_c, first moment S_c). With cumulative
+sums both are O(1) per class span, and the best split of levels ``[0, b)``
+into c classes extends the best split into c - 1 classes, giving an
+O(classes * 256**2) dynamic program instead of an O(256**(classes - 1)) search.
+
+References
+----------
+- Liao, Chen & Chung, "A Fast Algorithm for Multilevel Thresholding", 2001.
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+
+
+def _multi_otsu_bounds(
+    hist: np.ndarray,
+    classes: int
+) -> Tuple[List[int], np.ndarray, np.ndarray]:
+    """Optimal class boundaries plus cumulative mass and first moment."""
+    if classes < 2 or classes > 256:
+        raise ValueError("classes must be in [2, 256]")
+    hist = np.asarray(hist, dtype=np.float64)
+    n_levels = hist.size
+
+    p = np.concatenate(([0.0], np.cumsum(hist)))
+    s = np.concatenate(([0.0], np.cumsum(hist * np.arange(n_levels))))
+
+    # cost[a, b]: contribution S**2 / P of a class spanning levels [a, b)
+    dp_mass = p[None, :] - p[:, None]
+    dp_moment = s[None, :] - s[:, None]
+    cost = np.zeros_like(dp_mass)
+    np.divide(dp_moment * dp_moment, dp_mass, out=cost, where=dp_mass > 0)
+    cost[np.tril_indices(n_levels + 1)] = -np.inf  # spans need a < b
+
+    # best[b]: best score for levels [0, b) split into c classes
+    best = cost[0].copy()
+    back = np.zeros((classes, n_levels + 1), dtype=np.intp)
+    for c in range(1, classes):
+        cand = best[:, None] + cost
+        back[c] = np.argmax(cand, axis=0)
+        best = cand[back[c], np.arange(n_levels + 1)]
+
+    bounds: List[int] = []
+    b = n_levels
+    for c in range(classes - 1, 0, -1):
+        b = int(back[c, b])
+        bounds.append(b)
+    return bounds[::-1], p, s
+
+
+def multi_otsu_thresholds(
+    hist: np.ndarray,
+    classes: int = 3
+) -> List[int]:
+    """
+    Compute ``classes - 1`` thresholds maximizing the between-class variance.
+
+    Parameters
+    ----------
+    hist : np.ndarray
+        (256,) histogram of gray levels (see `gray_histogram`).
+    classes : int, default 3
+        Number of classes (2..256).
+
+    Returns
+    -------
+    List[int]
+        Increasing thresholds; each is the first gray level of the next class,
+        so ``np.digitize(gray, thresholds)`` yields class indices. (For two
+        classes this is ``otsu_threshold_hist(hist) + 1``.)
+
+    Raises
+    ------
+    ValueError
+        If `classes` is outside [2, 256].
+    """
+    bounds, _, _ = _multi_otsu_bounds(hist, classes)
+    return bounds
+
+
+def multi_otsu_levels(
+    hist: np.ndarray,
+    classes: int = 3
+) -> np.ndarray:
+    """
+    Compute palette gray levels of the multi-Otsu split.
+
+    Inner classes are represented by their means; the outer levels are pinned
+    to the darkest and brightest occupied gray levels, so a palette built from
+    them spans the image's full tonal range.
+
+    Parameters
+    ----------
+    hist : np.ndarray
+        (256,) histogram of gray levels (see `gray_histogram`).
+    classes : int, default 3
+        Number of classes (2..256).
+
+    Returns
+    -------
+    np.ndarray
+        uint8 array of at most `classes` strictly increasing levels; empty
+        classes and levels that coincide after rounding are dropped (a
+        two-tone image yields its two tones). An empty histogram gives
+        ``[0, 255]``.
+
+    Raises
+    ------
+    ValueError
+        If `classes` is outside [2, 256].
+    """
+    bounds, p, s = _multi_otsu_bounds(hist, classes)
+    occupied = np.flatnonzero(np.asarray(hist) > 0)
+    if occupied.size == 0:
+        return np.array([0, 255], dtype=np.uint8)
+    edges = [0] + bounds + [np.asarray(hist).size]
+
+    levels = [
+        (s[b] - s[a]) / (p[b] - p[a])
+        for a, b in zip(edges[:-1], edges[1:])
+        if p[b] > p[a]
+    ]
+    levels[0] = occupied[0]
+    levels[-1] = occupied[-1]
+    return np.unique(np.clip(np.rint(levels), 0, 255).astype(np.uint8))
@@ -10,6 +10,8 @@ from __future__ import annotations
 
 import numpy as np
 
+from ...utils.histogram import gray_histogram
+
 
 def otsu_threshold(
     gray_u8: np.ndarray
@@ -27,8 +29,26 @@ def otsu_threshold(
     int
         Optimal threshold value in [0, 255].
     """
-    # Histogram of grayscale values
-    hist = np.bincount(gray_u8.ravel(), minlength=256).astype(np.float64)
+    return otsu_threshold_hist(gray_histogram(gray_u8))
+
+
+def otsu_threshold_hist(
+    hist: np.ndarray
+) -> int:
+    """
+    Compute Otsu's threshold from a gray-level histogram.
+
+    Parameters
+    ----------
+    hist : np.ndarray
+        (256,) histogram of gray levels (see `gray_histogram`).
+
+    Returns
+    -------
+    int
+        Optimal threshold value in [0, 255].
+    """
+    hist = np.asarray(hist, dtype=np.float64)
     total = hist.sum()
     if total == 0:
         return 128
@@ -3,7 +3,7 @@
 
 This module implements a simple thresholding method where the
 threshold value is chosen as a given percentile of the grayscale
-intensity distribution.
+intensity distribution, either from the pixels or from a 256-bin histogram.
 """
 
 from __future__ import annotations
@@ -31,3 +31,48 @@ def percentile_threshold(
         The intensity value corresponding to the requested percentile.
     """
     return float(np.percentile(gray_f32, percentile))
+
+
+def percentile_threshold_hist(
+    hist: np.ndarray,
+    percentile: float
+) -> float:
+    """
+    Compute a percentile threshold from a gray-level histogram.
+
+    Matches ``np.percentile`` (linear interpolation between closest ranks)
+    in O(256), without sorting the pixels.
+
+    Parameters
+    ----------
+    hist : np.ndarray
+        (256,) histogram of gray levels (see `gray_histogram`).
+    percentile : float
+        Percentile in [0, 100] to compute as the threshold.
+
+    Returns
+    -------
+    float
+        The intensity value corresponding to the requested percentile
+        (128.0 for an empty histogram).
+
+    Raises
+    ------
+    ValueError
+        If `percentile` is outside [0, 100].
+    """
+    if not 0.0 <= percentile <= 100.0:
+        raise ValueError("percentile must be in [0, 100]")
+    cum = np.cumsum(hist)
+    n = int(cum[-1])
+    if n == 0:
+        return 128.0
+
+    pos = (n - 1) * (float(percentile) / 100.0)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, n - 1)
+
+    # Value at 0-based rank r is the first level whose cumulative count exceeds r
+    v_lo = float(np.searchsorted(cum, lo, side="right"))
+    v_hi = float(np.searchsorted(cum, hi, side="right"))
+    return v_lo + (v_hi - v_lo) * (pos - lo)
@@ -2,17 +2,98 @@
 """Naive threshold-based dithering methods.
 
 Implements global, mean, percentile, and Otsu thresholds for converting
-an image to black-white without error diffusion.
+an image to black-white without error diffusion. Image statistics come from
+a single 256-bin histogram, which may be precomputed by the caller or
+accumulated band by band.
+
+Local methods (Niblack, Sauvola, Bradley) threshold each pixel against its
+window statistics, computed from integral images in O(1) per pixel; they run
+band by band (optionally on a thread pool) with a halo of ``window // 2`` rows.
+
+`ThresholdDitherer` is the reusable-object form; with a fixed global threshold
+its `update` re-thresholds only the dirty rectangles of a frame.
 """
 
 from __future__ import annotations
 
-from typing import Literal, Union
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Literal, Optional, Tuple, Union
 
 import numpy as np
 
-from ..utils.grayscale import binarize, grayscale
-from .group import global_threshold, mean_threshold, otsu_threshold, percentile_threshold
+from ..utils.ditherer import Ditherer, Rect, dirty_slices
+from ..utils.grayscale import grayscale
+from ..utils.histogram import N_BINS, gray_histogram
+from ..utils.prep_img import gray_input_scale
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace, output_dtype, prepare_output
+from .group import (
+    bradley_threshold,
+    global_threshold,
+    mean_threshold_hist,
+    niblack_threshold,
+    otsu_threshold_hist,
+    percentile_threshold_hist,
+    sauvola_threshold,
+)
+
+_METHODS = ("global", "mean", "percentile", "otsu")
+_LOCAL_METHODS = {
+    "niblack": (niblack_threshold, -0.2),
+    "sauvola": (sauvola_threshold, 0.2),
+    "bradley": (bradley_threshold, 0.15),
+}
+_ALL_METHODS = "'global', 'mean', 'percentile', 'otsu', 'niblack', 'sauvola', 'bradley'"
+
+
+def select_threshold(
+    method: Literal["global", "mean", "percentile", "otsu"],
+    hist: Optional[np.ndarray],
+    *,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+    threshold: Union[int, float] = 128,
+    percentile: float = 50.0,
+) -> float:
+    """
+    Resolve the gray-domain threshold for a naive method.
+
+    Parameters
+    ----------
+    method : {"global", "mean", "percentile", "otsu"}
+        Threshold selection strategy.
+    hist : np.ndarray | None
+        (256,) gray-level histogram of the image; unused for "global".
+    dtype : {"u8", "f32"} | np.dtype | type, default "u8"
+        Dtype semantics used to map `threshold` into the gray domain.
+    threshold : int | float, default 128
+        Global threshold used when `method="global"`.
+    percentile : float, default 50.0
+        Percentile used when `method="percentile"` (0..100).
+
+    Returns
+    -------
+    float
+        Threshold in the [0..255] gray domain.
+
+    Raises
+    ------
+    ValueError
+        If `method` is not supported, or `hist` is missing for a statistic.
+    """
+    if method == "global":
+        return float(global_threshold(threshold, dtype))
+    if method not in _METHODS:
+        raise ValueError("method must be one of: 'global', 'mean', 'percentile', 'otsu'")
+    if hist is None:
+        raise ValueError(f"method '{method}' requires a gray-level histogram")
+
+    if method == "mean":
+        return mean_threshold_hist(hist)
+    if method == "percentile":
+        return percentile_threshold_hist(hist, percentile)
+    return float(otsu_threshold_hist(hist))
 
 
 def threshold_bw(
@@ -20,8 +101,19 @@ def threshold_bw(
     *,
     dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
     threshold: Union[int, float] = 128,
-    method: Literal["global", "mean", "percentile", "otsu"] = "global",
+    method: Literal[
+        "global", "mean", "percentile", "otsu", "niblack", "sauvola", "bradley"
+    ] = "global",
     percentile: float = 50.0,
+    hist: Optional[np.ndarray] = None,
+    band_rows: Optional[int] = None,
+    window: int = 15,
+    k: Optional[float] = None,
+    workers: Optional[int] = 1,
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+    input_scale: Optional[float] = None,
 ) -> np.ndarray:
     """
     Apply a naive thresholding method to produce a binary (black-white) image.
@@ -34,10 +126,39 @@ def threshold_bw(
         Output dtype for the binarized image.
     threshold : int | float, default 128
         Global threshold used when `method="global"`. Interpreted in gray domain.
-    method : {"global", "mean", "percentile", "otsu"}, default "global"
-        Threshold selection strategy.
+    method : {"global", "mean", "percentile", "otsu", "niblack", "sauvola", "bradley"}
+        Threshold selection strategy, default "global". The last three are local
+        (per-pixel window) thresholds.
     percentile : float, default 50.0
         Percentile used when `method="percentile"` (0..100).
+    hist : np.ndarray | None, default None
+        Precomputed (256,) gray-level histogram of `img` (see `gray_histogram`).
+        Lets several methods share one pass over the pixels.
+    band_rows : int | None, default None
+        Process the image in bands of this many rows: one pass accumulates the
+        histogram (unless `hist` is given), a second thresholds band by band.
+        Suited to (e.g. memory-mapped) images larger than RAM; the result does
+        not depend on the band height.
+    window : int, default 15
+        Odd window side length for the local methods.
+    k : float | None, default None
+        Local method parameter: Niblack/Sauvola ``k`` (defaults -0.2 / 0.2) or
+        Bradley ``t`` (default 0.15).
+    workers : int | None, default 1
+        Threads for the local methods' bands; ``None`` uses all CPUs. Without
+        `band_rows`, the image is split into one band per worker.
+    tone : ToneCurve | None, default None
+        Tone curve folded into the grayscale conversion.
+    out : np.ndarray | None, default None
+        Preallocated (H, W) output, written in place and returned.
+    workspace : Workspace | None, default None
+        Reusable scratch buffers (gray plane, conversion accumulators, the
+        local methods' summed-area tables); with an `IntermediateCache` also
+        the shared gray plane and histogram.
+    input_scale : float | None, default None
+        Factor mapping `img` to [0..255] (see `gray_input_scale`); None derives
+        it from `img`. Pass the full image's factor when thresholding it in
+        separate bands or tiles.
 
     Returns
     -------
@@ -48,20 +169,238 @@ def threshold_bw(
     Raises
     ------
     ValueError
-        If `method` is not one of the supported options.
+        If `method` is not one of the supported options, or `band_rows` < 1.
     """
-    g = grayscale(img, dtype)
+    if method in _LOCAL_METHODS:
+        return _threshold_local(
+            img,
+            method,
+            dtype=dtype,
+            window=window,
+            k=k,
+            band_rows=band_rows,
+            workers=workers,
+            tone=tone,
+            out=out,
+            workspace=workspace,
+            input_scale=input_scale,
+        )
+    if method not in _METHODS:
+        raise ValueError(f"method must be one of: {_ALL_METHODS}")
+    out = prepare_output(img.shape[:2], dtype, out)
 
-    if method == "global":
-        thr = global_threshold(threshold, dtype)
-    elif method == "mean":
-        thr = mean_threshold(g)
-    elif method == "percentile":
-        thr = percentile_threshold(g, percentile)
-    elif method == "otsu":
-        thr = otsu_threshold(g.astype(np.uint8))
+    # Results are {0, 1} in the output dtype (what `binarize` yields), so compare directly
+    if band_rows is None:
+        g = grayscale(img, dtype, tone=tone, workspace=workspace, input_scale=input_scale)
+        if hist is None and method != "global":
+            if workspace is None:
+                hist = gray_histogram(g)
+            else:
+                hist = workspace.image_memo(
+                    img, "hist", (g.dtype.str, tone), lambda: gray_histogram(g)
+                )
+        thr = select_threshold(
+            method, hist, dtype=dtype, threshold=threshold, percentile=percentile
+        )
+        np.greater_equal(g, thr, out=out)
+        return out
+
+    if band_rows < 1:
+        raise ValueError("band_rows must be >= 1")
+    h = img.shape[0]
+    if input_scale is None:
+        input_scale = gray_input_scale(img, band_rows)
+
+    def gray_band(y0: int) -> np.ndarray:
+        band = img[y0:y0 + band_rows]
+        buf = None if workspace is None else workspace.get("gray", band.shape[:2])
+        return grayscale(
+            band, dtype, out=buf, tone=tone, workspace=workspace, input_scale=input_scale
+        )
+
+    if hist is None and method != "global":
+        hist = np.zeros(N_BINS, dtype=np.int64)
+        for y0 in range(0, h, band_rows):
+            gray_histogram(gray_band(y0), hist)
+    thr = select_threshold(method, hist, dtype=dtype, threshold=threshold, percentile=percentile)
+
+    for y0 in range(0, h, band_rows):
+        g = gray_band(y0)
+        np.greater_equal(g, thr, out=out[y0:y0 + g.shape[0]])
+    return out
+
+
+def _threshold_local(
+    img: np.ndarray,
+    method: str,
+    *,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type],
+    window: int,
+    k: Optional[float],
+    band_rows: Optional[int],
+    workers: Optional[int],
+    tone: Optional[ToneCurve],
+    out: Optional[np.ndarray],
+    workspace: Optional[Workspace],
+    input_scale: Optional[float],
+) -> np.ndarray:
+    """
+    Band-parallel local thresholding; each band reads `window // 2` halo rows.
+
+    With a workspace, each thread's summed-area tables come from it, sized for
+    the tallest band and reused across bands and calls.
+    """
+    fn, k_default = _LOCAL_METHODS[method]
+    k_val = k_default if k is None else float(k)
+    if window < 3 or window % 2 == 0:
+        raise ValueError("window must be an odd integer >= 3")
+
+    h, w = img.shape[:2]
+    n_workers = (os.cpu_count() or 1) if workers is None else max(1, int(workers))
+    if band_rows is None:
+        band_rows = max(1, -(-h // n_workers))
+    elif band_rows < 1:
+        raise ValueError("band_rows must be >= 1")
+
+    r = window // 2
+    out = prepare_output((h, w), dtype, out)
+    if input_scale is None:
+        input_scale = gray_input_scale(img)
+
+    starts = range(0, h, band_rows)
+    n_threads = min(n_workers, len(starts))
+
+    # One pair of table buffers per thread, fetched here: workspaces are not thread-safe
+    slots: queue.SimpleQueue[Optional[Tuple[np.ndarray, np.ndarray]]] = queue.SimpleQueue()
+    table_shape = (min(h, band_rows + 2 * r) + 1, w + 1)
+    for i in range(max(1, n_threads)):
+        if workspace is None:
+            slots.put(None)
+        else:
+            slots.put((
+                workspace.get(f"integral_s1_{i}", table_shape, np.float64),
+                workspace.get(f"integral_s2_{i}", table_shape, np.float64),
+            ))
+
+    def run_band(y0: int) -> None:
+        y1 = min(h, y0 + band_rows)
+        a, b = max(0, y0 - r), min(h, y1 + r)
+        g = grayscale(img[a:b], dtype, tone=tone, input_scale=input_scale)
+        tables = slots.get()
+        try:
+            thr = fn(g, window, k_val, row_start=y0 - a, row_stop=y1 - a, integrals=tables)
+        finally:
+            slots.put(tables)
+        np.greater_equal(g[y0 - a:y1 - a], thr, out=out[y0:y1])
+
+    if n_workers == 1 or len(starts) <= 1:
+        for y0 in starts:
+            run_band(y0)
     else:
-        raise ValueError("method must be one of: 'global', 'mean', 'percentile', 'otsu'")
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            list(pool.map(run_band, starts))
+    return out
+
+
+class ThresholdDitherer(Ditherer):
+    """
+    Thresholding with its method fixed at construction.
+
+    Results equal `threshold_bw` with the same arguments. With
+    ``method="global"`` every pixel depends on its own value only, so `update`
+    re-thresholds just the dirty rectangles; the image-statistics and local
+    methods re-threshold the whole frame.
+
+    Parameters
+    ----------
+    threshold : int | float, default 128
+        Threshold of ``method="global"``, in the gray domain of `dtype`.
+    method : {"global", "mean", "percentile", "otsu", "niblack", "sauvola", "bradley"}
+        Threshold selection strategy, default "global".
+    percentile : float, default 50.0
+        Percentile used when `method="percentile"`.
+    window : int, default 15
+        Odd window side length for the local methods.
+    k : float | None, default None
+        Local method parameter (see `threshold_bw`).
+    dtype : {"u8", "f32"} | np.dtype | type, default "u8"
+        Output dtype.
+    tone : ToneCurve | None, default None
+        Tone curve folded into the grayscale conversion.
+    workspace : Workspace | None, default None
+        Scratch buffers; a new one by default.
+
+    Raises
+    ------
+    ValueError
+        If `method` is not supported.
+
+    Examples
+    --------
+    >>> ui = ThresholdDitherer(140)
+    >>> screen = ui(frame)
+    >>> ui.update(next_frame, screen, [(y, x, h, w)])
+    """
+
+    def __init__(
+        self,
+        threshold: Union[int, float] = 128,
+        *,
+        method: Literal[
+            "global", "mean", "percentile", "otsu", "niblack", "sauvola", "bradley"
+        ] = "global",
+        percentile: float = 50.0,
+        window: int = 15,
+        k: Optional[float] = None,
+        dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+        tone: Optional[ToneCurve] = None,
+        workspace: Optional[Workspace] = None,
+    ) -> None:
+        super().__init__(workspace)
+        if method not in _METHODS and method not in _LOCAL_METHODS:
+            raise ValueError(f"method must be one of: {_ALL_METHODS}")
+        self.threshold = threshold
+        self.method = method
+        self.percentile = percentile
+        self.window = window
+        self.k = k
+        self.dtype = dtype
+        self.tone = tone
+        self.out_dtype = output_dtype(dtype)
+
+    def output_shape(self, shape: Tuple[int, ...]) -> Tuple[int, ...]:
+        """(H, W) for an (H, W[, C]) frame."""
+        return tuple(shape[:2])
+
+    def __call__(self, img: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Threshold one frame (see `threshold_bw`), into `out` when given."""
+        return threshold_bw(
+            img,
+            dtype=self.dtype,
+            threshold=self.threshold,
+            method=self.method,
+            percentile=self.percentile,
+            window=self.window,
+            k=self.k,
+            tone=self.tone,
+            out=out,
+            workspace=self.workspace,
+        )
 
-    dither_img = np.where(g >= thr, 255, 0).astype(np.uint8)
-    return binarize(dither_img, dtype)
+    def update(self, img: np.ndarray, prev: np.ndarray, rects: Iterable[Rect]) -> np.ndarray:
+        """Re-threshold the dirty rectangles (global method; see `Ditherer.update`)."""
+        if self.method != "global":
+            return super().update(img, prev, rects)
+        self._check_prev(img, prev)
+        scale = gray_input_scale(img)
+        for ys, xs in dirty_slices(rects, img.shape):
+            threshold_bw(
+                img[ys, xs],
+                dtype=self.dtype,
+                threshold=self.threshold,
+                tone=self.tone,
+                out=prev[ys, xs],
+                workspace=self.workspace,
+                input_scale=scale,
+            )
+        return prev
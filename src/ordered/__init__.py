@@ -2,13 +2,14 @@
 """Ordered dithering algorithms.
 
 This package provides implementations of ordered dithering methods,
-such as Bayer matrices and halftone spot functions.
+such as Bayer matrices, halftone spot functions and blue-noise tiles.
 """
 
 from __future__ import annotations
 
-from .ordered import ordered_bw
+from .ordered import OrderedDitherer, ordered_bw
 
 __all__ = [
     "ordered_bw",
+    "OrderedDitherer",
 ]
@@ -3,11 +3,13 @@
 
 from __future__ import annotations
 
-from typing import Literal, Union
+from typing import Literal, Optional, Tuple, Union
 
 import numpy as np
 
-from ...utils.grayscale import binarize, grayscale
+from ...utils.tone import ToneCurve
+from ...utils.workspace import Workspace
+from .tiling import ordered_threshold_bw
 
 # Predefined Bayer matrices (normalized to [0,1))
 BAYER_2: np.ndarray = (1 / 4) * np.array(
@@ -84,6 +86,12 @@ def bayer_bw(
     *,
     matrix: np.ndarray = BAYER_8,
     dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+    band_rows: Optional[int] = None,
+    origin: Tuple[int, int] = (0, 0),
+    input_scale: Optional[float] = None,
 ) -> np.ndarray:
     """
     Ordered dithering (Bayer) to 1-bit.
@@ -91,11 +99,25 @@ def bayer_bw(
     Parameters
     ----------
     img : np.ndarray
-        Grayscale image (H, W). Values can be uint8 [0..255] or float in [0..1].
+        Image (H, W) or (H, W, C). Values can be uint8 [0..255] or float in [0..1].
     matrix : np.ndarray, default BAYER_8
         Bayer matrix normalized to [0, 1).
     dtype : {"u8","f32"} | np.dtype | type, default "u8"
         Output dtype. 'u8' → {0,255}; float dtypes → {0.0,1.0}; other ints → {0,max(dtype)}.
+    tone : ToneCurve | None, default None
+        Tone curve folded into the grayscale conversion.
+    out : np.ndarray | None, default None
+        Preallocated (H, W) output, written in place and returned.
+    workspace : Workspace | None, default None
+        Reusable scratch buffers (gray plane, tiled threshold plane).
+    band_rows : int | None, default None
+        Process the image in bands of this many rows (e.g. memory-mapped
+        input/output); a multiple of the matrix size keeps one threshold band.
+    origin : tuple of int, default (0, 0)
+        Position of ``img[0, 0]`` in the full image (tile phase for bands/tiles).
+    input_scale : float | None, default None
+        Factor mapping `img` to [0..255] (see `gray_input_scale`); pass the full
+        image's factor when dithering it in separate bands or tiles.
 
     Returns
     -------
@@ -105,10 +127,11 @@ def bayer_bw(
     Raises
     ------
     ValueError
-        If `img` is not grayscale, or `matrix` is not square, or its size is not a power of two.
+        If `img` is not (H, W) or (H, W, C), or `matrix` is not square, or its size is not
+        a power of two, or `band_rows` < 1.
     """
-    if img.ndim != 2:
-        raise ValueError("Input image must be grayscale (H, W)")
+    if img.ndim not in (2, 3):
+        raise ValueError("Input image must be (H, W) or (H, W, C)")
 
     if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
         raise ValueError("Matrix must be a square 2D array")
@@ -117,11 +140,16 @@ def bayer_bw(
     if n < 2 or (n & (n - 1)) != 0:
         raise ValueError("Matrix size must be a power of two (2, 4, 8, 16, ...)")
 
-    h, w = img.shape
-    tiles_y = (h + n - 1) // n
-    tiles_x = (w + n - 1) // n
-
-    gray_img = grayscale(img, dtype=dtype)  # float32 in gray domain
-    thresh = np.tile(matrix, (tiles_y, tiles_x))[:h, :w] * 255.0
-    dithered_u8 = np.where(gray_img >= thresh, 255, 0).astype(np.uint8)
-    return binarize(dithered_u8, dtype)
+    key = ("bayer", matrix.tobytes())
+    return ordered_threshold_bw(
+        img,
+        matrix,
+        key,
+        dtype=dtype,
+        tone=tone,
+        out=out,
+        workspace=workspace,
+        band_rows=band_rows,
+        origin=origin,
+        input_scale=input_scale,
+    )
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Blue-noise threshold tiles (void-and-cluster) and ordered dithering (B/W).
+
+Ulichney's void-and-cluster method ranks the pixels of a toroidal tile so
+that every threshold level leaves evenly spread, isotropic dots with no
+low-frequency structure. The energy of a dot pattern (its convolution with a
+wrapped Gaussian) is updated by adding or removing one shifted kernel per
+step, so building a 64x64 tile takes well under a second; tiles are cached
+per configuration.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Literal, Optional, Tuple, Union
+
+import numpy as np
+
+from ...utils.tone import ToneCurve
+from ...utils.workspace import Workspace
+from .tiling import ordered_threshold_bw
+
+# Share of the tile set in the initial pattern
+_INITIAL_FILL = 0.1
+
+
+def _wrapped_gaussian(n: int, sigma: float) -> np.ndarray:
+    """(n, n) Gaussian centred on (0, 0) with toroidal distances."""
+    d = np.minimum(np.arange(n), n - np.arange(n)).astype(np.float64)
+    g = np.exp(-(d * d) / (2.0 * sigma * sigma))
+    return np.outer(g, g)
+
+
+@lru_cache(maxsize=8)
+def blue_noise_matrix(n: int = 64, sigma: float = 1.5, seed: int = 0) -> np.ndarray:
+    """
+    Generate an nxn blue-noise threshold tile normalized to [0, 1).
+
+    Parameters
+    ----------
+    n : int, default 64
+        Tile side (>= 4). The tile wraps seamlessly, so any size tiles an image.
+    sigma : float, default 1.5
+        Standard deviation of the Gaussian energy filter in pixels.
+    seed : int, default 0
+        Seed of the random initial pattern; the result is deterministic.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only nxn float32 matrix holding ranks ``k / n²``, k = 0 .. n² - 1.
+
+    Raises
+    ------
+    ValueError
+        If `n` < 4 or `sigma` <= 0.
+    """
+    if n < 4:
+        raise ValueError("Blue-noise tile size must be >= 4")
+    if sigma <= 0:
+        raise ValueError("sigma must be > 0")
+
+    size = n * n
+    kernel = _wrapped_gaussian(n, sigma)
+    kernel_f = np.fft.rfft2(kernel)
+
+    def energy_of(p: np.ndarray) -> np.ndarray:
+        return np.fft.irfft2(np.fft.rfft2(p) * kernel_f, s=(n, n)).ravel()
+
+    def toggle(energy: np.ndarray, p: np.ndarray, i: int, on: bool) -> None:
+        y, x = divmod(i, n)
+        p[i] = on
+        shifted = np.roll(kernel, (y, x), axis=(0, 1)).ravel()
+        if on:
+            energy += shifted
+        else:
+            energy -= shifted
+
+    def tightest_cluster(energy: np.ndarray, p: np.ndarray) -> int:
+        return int(np.where(p, energy, -np.inf).argmax())
+
+    def largest_void(energy: np.ndarray, p: np.ndarray) -> int:
+        return int(np.where(p, np.inf, energy).argmin())
+
+    # Initial pattern: random dots, relaxed by moving the tightest cluster to the largest void
+    rng = np.random.default_rng(seed)
+    ones = max(1, int(size * _INITIAL_FILL))
+    initial = np.zeros(size, dtype=bool)
+    initial[rng.choice(size, ones, replace=False)] = True
+    energy = energy_of(initial.reshape(n, n).astype(np.float64))
+    for _ in range(4 * size):
+        cluster = tightest_cluster(energy, initial)
+        toggle(energy, initial, cluster, False)
+        void = largest_void(energy, initial)
+        toggle(energy, initial, void, True)
+        if void == cluster:
+            break
+
+    rank = np.empty(size, dtype=np.int64)
+
+    # Phase 1: remove the tightest clusters of the initial pattern, ranks ones-1 .. 0
+    p = initial.copy()
+    e = energy.copy()
+    for r in range(ones - 1, -1, -1):
+        cluster = tightest_cluster(e, p)
+        toggle(e, p, cluster, False)
+        rank[cluster] = r
+
+    # Phase 2: fill the largest voids, ranks ones .. n²-1. Past half fill this is the
+    # tightest cluster of the (minority) zeros, whose energy is sum(kernel) - e.
+    p = initial.copy()
+    e = energy.copy()
+    for r in range(ones, size):
+        void = largest_void(e, p)
+        toggle(e, p, void, True)
+        rank[void] = r
+
+    tile = (rank.reshape(n, n) / float(size)).astype(np.float32)
+    tile.flags.writeable = False
+    return tile
+
+
+def blue_noise_bw(
+    img: np.ndarray,
+    *,
+    n: int = 64,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+    band_rows: Optional[int] = None,
+    origin: Tuple[int, int] = (0, 0),
+    input_scale: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Ordered dithering against a tiled blue-noise threshold matrix to 1-bit.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Image (H, W) or (H, W, C). Values can be uint8 [0..255] or float in [0..1].
+    n : int, default 64
+        Side of the blue-noise tile (see `blue_noise_matrix`).
+    dtype : {"u8","f32"} | np.dtype | type, default "u8"
+        Output dtype. 'u8' → {0,255}; float dtypes → {0.0,1.0}; other ints → {0,max(dtype)}.
+    tone : ToneCurve | None, default None
+        Tone curve folded into the grayscale conversion.
+    out : np.ndarray | None, default None
+        Preallocated (H, W) output, written in place and returned.
+    workspace : Workspace | None, default None
+        Reusable scratch buffers (gray plane, tiled threshold plane).
+    band_rows : int | None, default None
+        Process the image in bands of this many rows (e.g. memory-mapped
+        input/output).
+    origin : tuple of int, default (0, 0)
+        Position of ``img[0, 0]`` in the full image (tile phase for bands/tiles).
+    input_scale : float | None, default None
+        Factor mapping `img` to [0..255] (see `gray_input_scale`); pass the full
+        image's factor when dithering it in separate bands or tiles.
+
+    Returns
+    -------
+    np.ndarray
+        Binarized image with values mapped according to `dtype`.
+
+    Raises
+    ------
+    ValueError
+        If `img` is not (H, W) or (H, W, C), `n` < 4, or `band_rows` < 1.
+    """
+    if img.ndim not in (2, 3):
+        raise ValueError("Input image must be (H, W) or (H, W, C)")
+
+    return ordered_threshold_bw(
+        img,
+        blue_noise_matrix(n),
+        ("blue_noise", n),
+        dtype=dtype,
+        tone=tone,
+        out=out,
+        workspace=workspace,
+        band_rows=band_rows,
+        origin=origin,
+        input_scale=input_scale,
+    )
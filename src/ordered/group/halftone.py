@@ -3,12 +3,14 @@
 
 from __future__ import annotations
 
-from typing import Literal, Union
+from typing import Literal, Optional, Tuple, Union
 
 import numpy as np
 
-from ...utils.grayscale import binarize, grayscale
+from ...utils.tone import ToneCurve
+from ...utils.workspace import Workspace
 from .spot import spot_threshold
+from .tiling import ordered_threshold_bw
 
 
 def halftone_bw(
@@ -18,6 +20,12 @@ def halftone_bw(
     angle_deg: float = 45.0,
     dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
     spot: Literal["cos+cos", "cosx", "cosx+2cosy"] = "cos+cos",
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+    band_rows: Optional[int] = None,
+    origin: Tuple[int, int] = (0, 0),
+    input_scale: Optional[float] = None,
 ) -> np.ndarray:
     """
     Apply halftone ordered dithering (spot function) to a grayscale or RGB image.
@@ -34,6 +42,20 @@ def halftone_bw(
         Output dtype. 'u8' → {0,255}; float dtypes → {0.0,1.0}; other ints → {0,max(dtype)}.
     spot : {"cos+cos", "cosx", "cosx+2cosy"}, default="cos+cos"
         Spot function used to build the threshold tile.
+    tone : ToneCurve | None, default=None
+        Tone curve folded into the grayscale conversion.
+    out : np.ndarray | None, default=None
+        Preallocated (H, W) output, written in place and returned.
+    workspace : Workspace | None, default=None
+        Reusable scratch buffers (gray plane, tiled threshold plane).
+    band_rows : int | None, default=None
+        Process the image in bands of this many rows (e.g. memory-mapped
+        input/output); a multiple of `size` keeps one threshold band.
+    origin : tuple of int, default=(0, 0)
+        Position of ``img[0, 0]`` in the full image (tile phase for bands/tiles).
+    input_scale : float | None, default=None
+        Factor mapping `img` to [0..255] (see `gray_input_scale`); pass the full
+        image's factor when dithering it in separate bands or tiles.
 
     Returns
     -------
@@ -43,20 +65,22 @@ def halftone_bw(
     Raises
     ------
     ValueError
-        If `size` < 2.
+        If `size` < 2, or `band_rows` < 1.
     """
     if size < 2:
         raise ValueError("Halftone tile size must be >= 2")
 
-    g = grayscale(img, dtype)
-    height, width = g.shape
-
-    # Tile blocks to cover the image area
     tile = spot_threshold(size=size, angle_deg=angle_deg, spot=spot)
-    width_blocks = (width + size - 1) // size
-    height_blocks = (height + size - 1) // size
-
-    # Tile and crop to image size; scale thresholds to gray domain [0..255]
-    T = np.tile(tile, (height_blocks, width_blocks))[:height, :width] * 255.0
-    dither_img = np.where(g >= T, 255, 0).astype(np.uint8)
-    return binarize(dither_img, dtype)
+    key = ("halftone", size, float(angle_deg), spot)
+    return ordered_threshold_bw(
+        img,
+        tile,
+        key,
+        dtype=dtype,
+        tone=tone,
+        out=out,
+        workspace=workspace,
+        band_rows=band_rows,
+        origin=origin,
+        input_scale=input_scale,
+    )
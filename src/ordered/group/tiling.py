@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Tiled threshold planes shared by Bayer and halftone dithering."""
+
+from __future__ import annotations
+
+from typing import Hashable, Literal, Optional, Tuple, Union
+
+import numpy as np
+
+from ...utils.grayscale import grayscale
+from ...utils.prep_img import gray_input_scale
+from ...utils.tone import ToneCurve
+from ...utils.workspace import Workspace, prepare_output
+
+
+def tiled_threshold_rows(
+    tile: np.ndarray,
+    row_start: int,
+    rows: int,
+    width: int,
+    col_start: int = 0,
+) -> np.ndarray:
+    """
+    Threshold plane for image rows ``[row_start, row_start + rows)``.
+
+    Parameters
+    ----------
+    tile : np.ndarray
+        2D threshold tile normalized to [0, 1).
+    row_start : int
+        First image row; selects the tile's vertical phase.
+    rows : int
+        Number of rows.
+    width : int
+        Image width.
+    col_start : int, default 0
+        Column of the first pixel; selects the tile's horizontal phase.
+
+    Returns
+    -------
+    np.ndarray
+        (rows, width) thresholds in the [0..255] gray domain.
+    """
+    ty, tx = tile.shape
+    py, px = row_start % ty, col_start % tx
+    reps_y = (py + rows + ty - 1) // ty
+    reps_x = (px + width + tx - 1) // tx
+    return np.tile(tile, (reps_y, reps_x))[py:py + rows, px:px + width] * 255.0
+
+
+def ordered_threshold_bw(
+    img: np.ndarray,
+    tile: np.ndarray,
+    key: Hashable,
+    *,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type],
+    tone: Optional[ToneCurve],
+    out: Optional[np.ndarray],
+    workspace: Optional[Workspace],
+    band_rows: Optional[int],
+    origin: Tuple[int, int] = (0, 0),
+    input_scale: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Compare the gray image against a tiled threshold plane, band by band.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Input image (H, W) or (H, W, C); may be a memmap.
+    tile : np.ndarray
+        2D threshold tile normalized to [0, 1).
+    key : Hashable
+        Identifies `tile` for workspace memoization of threshold planes.
+    dtype : {"u8","f32"} | np.dtype | type
+        Output dtype.
+    tone : ToneCurve | None
+        Tone curve folded into the grayscale conversion.
+    out : np.ndarray | None
+        Preallocated (H, W) output (may be a memmap).
+    workspace : Workspace | None
+        Reusable gray and threshold buffers.
+    band_rows : int | None
+        Rows per band; ``None`` processes the image in one band.
+    origin : tuple of int, default (0, 0)
+        Position of ``img[0, 0]`` in the full image, so bands or tiles processed
+        separately keep the tile phase.
+    input_scale : float | None, default None
+        Factor mapping `img` to [0..255] (see `gray_input_scale`); None derives
+        it from `img`, once for all bands.
+
+    Returns
+    -------
+    np.ndarray
+        {0, 1} image in the output dtype (`out` when given).
+
+    Raises
+    ------
+    ValueError
+        If `band_rows` < 1.
+    """
+    h, w = img.shape[:2]
+    oy, ox = int(origin[0]), int(origin[1])
+    out = prepare_output((h, w), dtype, out)
+    if band_rows is None:
+        band_rows = max(1, h)
+    elif band_rows < 1:
+        raise ValueError("band_rows must be >= 1")
+    if input_scale is None and band_rows < h:
+        input_scale = gray_input_scale(img, band_rows)
+
+    for y0 in range(0, h, band_rows):
+        y1 = min(h, y0 + band_rows)
+        g = grayscale(img[y0:y1], dtype, tone=tone, workspace=workspace, input_scale=input_scale)
+
+        def build(y0: int = y0, rows: int = y1 - y0) -> np.ndarray:
+            return tiled_threshold_rows(tile, oy + y0, rows, w, ox)
+
+        if workspace is None:
+            thresh = build()
+        else:
+            band_key = (key, (oy + y0) % tile.shape[0], ox % tile.shape[1], y1 - y0, w)
+            thresh = workspace.memo("threshold", band_key, build)
+
+        # {0, 1} in the output dtype, as `binarize` would produce
+        np.greater_equal(g, thresh, out=out[y0:y1])
+    return out
@@ -4,26 +4,49 @@
 This module provides ordered dithering methods, including:
 - Bayer matrix dithering of configurable size
 - Halftone dithering with spot functions and arbitrary angles
+- Blue-noise (void-and-cluster) threshold tiles, stable across video frames
+- `OrderedDitherer`, a reusable object holding the threshold tile
 """
 
 from __future__ import annotations
 
-from typing import Literal, Union
+from collections import OrderedDict
+from typing import Hashable, Iterable, Literal, Optional, Tuple, Union
 
 import numpy as np
 
+from ..utils.ditherer import Ditherer, Rect, dirty_slices
+from ..utils.grayscale import grayscale
+from ..utils.prep_img import gray_input_scale
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace, output_dtype
 from .group.bayer import bayer_bw, bayer_matrix
+from .group.blue_noise import blue_noise_bw, blue_noise_matrix
 from .group.halftone import halftone_bw
+from .group.spot import spot_threshold
+from .group.tiling import ordered_threshold_bw, tiled_threshold_rows
+
+# Bytes of threshold planes `OrderedDitherer.update` keeps (least recently used dropped)
+_PLANE_CACHE_BYTES = 32 << 20
+
+# Rectangles of at most this many tiles index the tile directly instead of caching a plane
+_DIRECT_TILES = 4
 
 
 def ordered_bw(
     img: np.ndarray,
     *,
-    kind: Literal["bayer", "halftone"] = "bayer",
+    kind: Literal["bayer", "halftone", "blue_noise"] = "bayer",
     n: int = 8,
     angle_deg: float = 45.0,
     spot: Literal["cos+cos", "cosx", "cosx+2cosy"] = "cos+cos",
     dtype: Union[Literal["u8", "f32"], np.dtype, type] = "u8",
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+    band_rows: Optional[int] = None,
+    origin: Tuple[int, int] = (0, 0),
+    input_scale: Optional[float] = None,
 ) -> np.ndarray:
     """
     Apply ordered dithering to an image.
@@ -32,16 +55,33 @@ def ordered_bw(
     ----------
     img : np.ndarray
         Input image (grayscale or RGB).
-    kind : {"bayer", "halftone"}, default="bayer"
+    kind : {"bayer", "halftone", "blue_noise"}, default="bayer"
         Type of ordered dithering to apply.
     n : int, default=8
-        Size of Bayer matrix or halftone tile (must be power of two for Bayer).
+        Size of Bayer matrix, halftone or blue-noise tile (must be power of two
+        for Bayer, >= 4 for blue noise).
     angle_deg : float, default=45.0
         Halftone angle in degrees (only used if kind="halftone").
     spot : {"cos+cos", "cosx", "cosx+2cosy"}, default="cos+cos"
         Spot function used for halftone dithering.
     dtype : {"u8", "f32"} or np.dtype or type, default="u8"
         Output data type.
+    tone : ToneCurve or None, default=None
+        Tone curve folded into the grayscale conversion.
+    out : np.ndarray or None, default=None
+        Preallocated (H, W) output, written in place and returned.
+    workspace : Workspace or None, default=None
+        Reusable scratch buffers (gray plane, tiled threshold plane).
+    band_rows : int or None, default=None
+        Process the image in bands of this many rows (bounded memory for
+        memory-mapped input/output).
+    origin : tuple of int, default=(0, 0)
+        Position of ``img[0, 0]`` in the full image, keeping the tile phase when
+        an image is dithered in separate bands or tiles.
+    input_scale : float or None, default=None
+        Factor mapping `img` to [0..255] (see `gray_input_scale`); None derives
+        it from `img`, once for all bands. Pass the full image's factor when
+        dithering it in separate bands or tiles.
 
     Returns
     -------
@@ -51,10 +91,181 @@ def ordered_bw(
     Raises
     ------
     ValueError
-        If `kind` is not one of {"bayer", "halftone"}.
+        If `kind` is not one of {"bayer", "halftone", "blue_noise"}.
     """
     if kind == "bayer":
-        return bayer_bw(img, matrix=bayer_matrix(n), dtype=dtype)
+        return bayer_bw(
+            img,
+            matrix=bayer_matrix(n),
+            dtype=dtype,
+            tone=tone,
+            out=out,
+            workspace=workspace,
+            band_rows=band_rows,
+            origin=origin,
+            input_scale=input_scale,
+        )
     if kind == "halftone":
-        return halftone_bw(img, size=n, angle_deg=angle_deg, spot=spot, dtype=dtype)
-    raise ValueError("kind must be 'bayer' or 'halftone'")
+        return halftone_bw(
+            img,
+            size=n,
+            angle_deg=angle_deg,
+            spot=spot,
+            dtype=dtype,
+            tone=tone,
+            out=out,
+            workspace=workspace,
+            band_rows=band_rows,
+            origin=origin,
+            input_scale=input_scale,
+        )
+    if kind == "blue_noise":
+        return blue_noise_bw(
+            img,
+            n=n,
+            dtype=dtype,
+            tone=tone,
+            out=out,
+            workspace=workspace,
+            band_rows=band_rows,
+            origin=origin,
+            input_scale=input_scale,
+        )
+    raise ValueError("kind must be 'bayer', 'halftone' or 'blue_noise'")
+
+
+class OrderedDitherer(Ditherer):
+    """
+    Ordered dithering with its threshold tile built once.
+
+    The configuration is fixed at construction; every call reuses the tile,
+    and the ditherer's workspace keeps the tiled threshold plane and gray
+    buffer, so same-sized frames only convert and compare. Results equal
+    `ordered_bw` with the same arguments.
+
+    Parameters
+    ----------
+    kind : {"bayer", "halftone", "blue_noise"}, default="bayer"
+        Type of ordered dithering. Blue noise has no visible tile structure,
+        and like every fixed tile keeps static content identical from frame to
+        frame.
+    n : int, default=8
+        Size of Bayer matrix (power of two), halftone tile (>= 2) or blue-noise
+        tile (>= 4; 64 is typical).
+    angle_deg : float, default=45.0
+        Halftone angle in degrees (only used if kind="halftone").
+    spot : {"cos+cos", "cosx", "cosx+2cosy"}, default="cos+cos"
+        Spot function used for halftone dithering.
+    dtype : {"u8", "f32"} or np.dtype or type, default="u8"
+        Output data type.
+    tone : ToneCurve or None, default=None
+        Tone curve folded into the grayscale conversion.
+    workspace : Workspace or None, default=None
+        Scratch buffers; a new one by default.
+
+    Raises
+    ------
+    ValueError
+        If `kind` is unknown or `n` is invalid for it.
+
+    Examples
+    --------
+    >>> bayer = OrderedDitherer("bayer", 4)
+    >>> outs = bayer.process_batch(frames)
+    >>> bayer.update(frame, outs[-1], [(y, x, h, w)])
+    """
+
+    def __init__(
+        self,
+        kind: Literal["bayer", "halftone", "blue_noise"] = "bayer",
+        n: int = 8,
+        *,
+        angle_deg: float = 45.0,
+        spot: Literal["cos+cos", "cosx", "cosx+2cosy"] = "cos+cos",
+        dtype: Union[Literal["u8", "f32"], np.dtype, type] = "u8",
+        tone: Optional[ToneCurve] = None,
+        workspace: Optional[Workspace] = None,
+    ) -> None:
+        super().__init__(workspace)
+        if kind == "bayer":
+            self.tile = bayer_matrix(n)
+            self._key: Hashable = ("bayer", self.tile.tobytes())
+        elif kind == "halftone":
+            if n < 2:
+                raise ValueError("Halftone tile size must be >= 2")
+            self.tile = spot_threshold(size=n, angle_deg=angle_deg, spot=spot)
+            self._key = ("halftone", n, float(angle_deg), spot)
+        elif kind == "blue_noise":
+            self.tile = blue_noise_matrix(n)
+            self._key = ("blue_noise", n)
+        else:
+            raise ValueError("kind must be 'bayer', 'halftone' or 'blue_noise'")
+        self.kind = kind
+        self.dtype = dtype
+        self.tone = tone
+        self.out_dtype = output_dtype(dtype)
+        # Threshold planes of dirty rectangles, by (phase y, phase x, rows, cols)
+        self._planes: "OrderedDict[Tuple[int, int, int, int], np.ndarray]" = OrderedDict()
+        self._plane_bytes = 0
+
+    def output_shape(self, shape: Tuple[int, ...]) -> Tuple[int, ...]:
+        """(H, W) for an (H, W[, C]) frame."""
+        return tuple(shape[:2])
+
+    def _plane(self, y0: int, x0: int, rows: int, cols: int) -> np.ndarray:
+        """Threshold plane of the rectangle at (y0, x0), from a size-bounded LRU."""
+        ty, tx = self.tile.shape
+        if rows * cols <= _DIRECT_TILES * ty * tx:
+            ys = np.arange(y0, y0 + rows) % ty
+            xs = np.arange(x0, x0 + cols) % tx
+            return self.tile[np.ix_(ys, xs)] * 255.0
+        key = (y0 % ty, x0 % tx, rows, cols)
+        plane = self._planes.get(key)
+        if plane is not None:
+            self._planes.move_to_end(key)
+            return plane
+        plane = tiled_threshold_rows(self.tile, y0, rows, cols, x0)
+        self._planes[key] = plane
+        self._plane_bytes += plane.nbytes
+        while self._plane_bytes > _PLANE_CACHE_BYTES and len(self._planes) > 1:
+            _, old = self._planes.popitem(last=False)
+            self._plane_bytes -= old.nbytes
+        return plane
+
+    def __call__(self, img: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dither one frame (see `ordered_bw`), into `out` when given."""
+        return ordered_threshold_bw(
+            img,
+            self.tile,
+            self._key,
+            dtype=self.dtype,
+            tone=self.tone,
+            out=out,
+            workspace=self.workspace,
+            band_rows=None,
+        )
+
+    def update(self, img: np.ndarray, prev: np.ndarray, rects: Iterable[Rect]) -> np.ndarray:
+        """
+        Re-dither only the tile-aligned dirty rectangles (see `Ditherer.update`).
+
+        Each pixel depends on its own value and tile position only, so every
+        rectangle is dithered on its own. Rectangles of a few tiles index the
+        tile directly; the threshold planes of larger ones are kept in a
+        size-bounded LRU (32 MiB), so repeated updates of the same aligned
+        rectangles reuse them while arbitrary edits cannot grow memory.
+        """
+        self._check_prev(img, prev)
+        scale = gray_input_scale(img)
+        for ys, xs in dirty_slices(rects, img.shape, self.tile.shape):
+            g = grayscale(
+                img[ys, xs],
+                self.dtype,
+                tone=self.tone,
+                workspace=self.workspace,
+                input_scale=scale,
+            )
+            thresh = self._plane(ys.start, xs.start, g.shape[0], g.shape[1])
+            # {0, 1} in the output dtype, as `ordered_threshold_bw` writes
+            np.greater_equal(g, thresh, out=prev[ys, xs])
+        return prev
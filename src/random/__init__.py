@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 """Random dithering package initializer.
 
-Exposes the `random_bw` function for noise-based dithering.
+Exposes the `random_bw` function for noise-based dithering and the reusable
+`RandomDitherer`.
 """
 
 from __future__ import annotations
 
-from .noise import random_bw
+from .noise import RandomDitherer, random_bw
 
 __all__ = [
     "random_bw",
+    "RandomDitherer",
 ]
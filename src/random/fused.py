@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Fused, band-parallel noise thresholding.
+
+Generates float32 noise one band of rows at a time, adds it to the gray band
+(or to the threshold, for jitter) in place, and compares straight into the
+output buffer. Bands run on a thread pool; NumPy releases the GIL inside the
+generator fills and ufuncs, so bands progress concurrently.
+
+Noise sources:
+- "spawn": one ``SeedSequence.spawn`` child stream per band
+- "counter": coordinate-keyed noise from `counter_uniform` / `counter_normal`
+
+Bands have a fixed height, so the result depends on `band_rows` (for "spawn")
+but never on the number of workers.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Optional, Tuple
+
+import numpy as np
+
+from .group.counter import counter_normal, counter_uniform, resolve_counter_seed
+
+
+def fused_random_bw(
+    g: np.ndarray,
+    thr: float,
+    *,
+    out: np.ndarray,
+    mode: Literal["additive", "jitter"] = "additive",
+    distribution: Literal["uniform", "normal"] = "uniform",
+    noise_amp: float = 12.75,
+    generator: Literal["spawn", "counter"] = "spawn",
+    seed: Optional[int] = None,
+    origin: Tuple[int, int] = (0, 0),
+    band_rows: int = 256,
+    workers: Optional[int] = 1,
+    packed: bool = False,
+) -> np.ndarray:
+    """
+    Threshold `g` against per-pixel noise into a preallocated output.
+
+    Parameters
+    ----------
+    g : np.ndarray
+        Grayscale plane (H, W) in the [0..255] gray domain.
+    thr : float
+        Threshold in the gray domain.
+    out : np.ndarray
+        Destination. Shape (H, W) with any numeric dtype (receives {0, 1}), or,
+        when `packed` is True, uint8 of shape (H, ceil(W / 8)) receiving
+        MSB-first packed bits (``np.packbits`` layout).
+    mode : {"additive", "jitter"}, default "additive"
+        Add noise to the gray values, or to the threshold.
+    distribution : {"uniform", "normal"}, default "uniform"
+        U(-A, A) or N(0, (A/2)^2) with ``A = noise_amp``.
+    noise_amp : float, default 12.75
+        Noise amplitude A in gray levels.
+    generator : {"spawn", "counter"}, default "spawn"
+        Per-band source of noise (see module docstring).
+    seed : int | None, default None
+        Seed for the noise streams.
+    origin : tuple[int, int], default (0, 0)
+        Absolute (y, x) of `g` in a larger image (counter generator only).
+    band_rows : int, default 256
+        Rows per band; each band is one unit of work.
+    workers : int | None, default 1
+        Number of threads; ``None`` uses ``os.cpu_count()``.
+    packed : bool, default False
+        Write bit-packed rows instead of one element per pixel.
+
+    Returns
+    -------
+    np.ndarray
+        `out`, filled.
+
+    Raises
+    ------
+    ValueError
+        If `out` has the wrong shape/dtype, or an option is invalid.
+    """
+    if g.ndim != 2:
+        raise ValueError("Gray plane must be 2D (H, W)")
+    if band_rows < 1:
+        raise ValueError("band_rows must be >= 1")
+    if generator not in ("spawn", "counter"):
+        raise ValueError("generator must be 'spawn' or 'counter'")
+    if distribution not in ("uniform", "normal"):
+        raise ValueError("distribution must be 'uniform' or 'normal'")
+    if mode not in ("additive", "jitter"):
+        raise ValueError("mode must be 'additive' or 'jitter'")
+
+    h, w = g.shape
+    if packed:
+        if out.shape != (h, (w + 7) // 8) or out.dtype != np.uint8:
+            raise ValueError(f"Packed output must be uint8 with shape {(h, (w + 7) // 8)}")
+    elif out.shape != (h, w):
+        raise ValueError(f"Output shape {out.shape} does not match image shape {(h, w)}")
+
+    n_bands = (h + band_rows - 1) // band_rows
+    children = np.random.SeedSequence(seed).spawn(n_bands) if generator == "spawn" else []
+    key = resolve_counter_seed(seed) if generator == "counter" else 0
+    oy, ox = int(origin[0]), int(origin[1])
+    amp = float(noise_amp)
+    thr_f = np.float32(thr)
+
+    def run_band(i: int) -> None:
+        y0 = i * band_rows
+        y1 = min(h, y0 + band_rows)
+        shape = (y1 - y0, w)
+
+        if generator == "spawn":
+            rng = np.random.Generator(np.random.PCG64(children[i]))
+            noise = np.empty(shape, dtype=np.float32)
+            if distribution == "uniform":
+                rng.random(dtype=np.float32, out=noise)
+                noise *= np.float32(2.0 * amp)
+                noise -= np.float32(amp)
+            else:
+                rng.standard_normal(dtype=np.float32, out=noise)
+                noise *= np.float32(amp / 2.0)
+        elif distribution == "uniform":
+            noise = counter_uniform(-amp, amp, shape, key, (oy + y0, ox))
+        else:
+            noise = counter_normal(0.0, amp / 2.0, shape, key, (oy + y0, ox))
+
+        # Reuse the noise band as the comparison operand (no extra temporaries)
+        if mode == "additive":
+            noise += g[y0:y1]
+            lhs, rhs = noise, thr_f
+        else:
+            noise += thr_f
+            lhs, rhs = g[y0:y1], noise
+
+        if packed:
+            out[y0:y1] = np.packbits(np.greater_equal(lhs, rhs), axis=1)
+        elif out.dtype == np.uint8:
+            np.greater_equal(lhs, rhs, out=out[y0:y1].view(np.bool_))
+        else:
+            out[y0:y1] = np.greater_equal(lhs, rhs)
+
+    n_workers = (os.cpu_count() or 1) if workers is None else max(1, int(workers))
+    if n_workers == 1 or n_bands == 1:
+        for i in range(n_bands):
+            run_band(i)
+    else:
+        with ThreadPoolExecutor(max_workers=min(n_workers, n_bands)) as pool:
+            list(pool.map(run_band, range(n_bands)))
+    return out
@@ -3,10 +3,22 @@
 
 from __future__ import annotations
 
+from .counter import (
+    counter_bits,
+    counter_integers,
+    counter_normal,
+    counter_uniform,
+    resolve_counter_seed,
+)
 from .normal import normal_distribution
 from .uniform import uniform_distrib
 
 __all__ = [
+    "counter_bits",
+    "counter_integers",
+    "counter_normal",
+    "counter_uniform",
+    "resolve_counter_seed",
     "normal_distribution",
     "uniform_distrib",
 ]
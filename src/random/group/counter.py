@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Counter-based (coordinate-keyed) noise generators for random dithering.
+
+Every sample is a pure function of ``(seed, y, x)``: a SplitMix64 hash of the
+absolute pixel coordinates under a seed-derived key. Unlike a sequential
+generator, any band or tile of the image can be generated on its own (in any
+order, on any worker) and still be bit-identical to the same region of a
+full-size draw.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_MASK_64 = (1 << 64) - 1
+_INV_2_24 = 1.0 / float(1 << 24)
+
+
+def _splitmix64(z: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer on a uint64 array (wrapping arithmetic, in place)."""
+    z ^= z >> np.uint64(30)
+    z *= _MIX_1
+    z ^= z >> np.uint64(27)
+    z *= _MIX_2
+    z ^= z >> np.uint64(31)
+    return z
+
+
+def resolve_counter_seed(seed: Optional[int] = None) -> int:
+    """
+    Resolve a user seed into a 64-bit key for the counter-based generators.
+
+    Parameters
+    ----------
+    seed : Optional[int], default=None
+        Non-negative integer seed. ``None`` draws fresh OS entropy; resolve it
+        once and pass the result to every band so they share one noise field.
+
+    Returns
+    -------
+    int
+        Seed reduced to the unsigned 64-bit range.
+
+    Raises
+    ------
+    ValueError
+        If `seed` is negative.
+    """
+    if seed is None:
+        return int(np.random.SeedSequence().entropy) & _MASK_64
+    if int(seed) < 0:
+        raise ValueError("seed must be a non-negative integer")
+    return int(seed) & _MASK_64
+
+
+def counter_bits(
+    size: tuple[int, int],
+    seed: Optional[int] = None,
+    origin: Tuple[int, int] = (0, 0),
+) -> np.ndarray:
+    """
+    Generate 64 random bits per pixel keyed on absolute coordinates.
+
+    Parameters
+    ----------
+    size : tuple[int, int]
+        Shape ``(rows, cols)`` of the requested region.
+    seed : Optional[int], default=None
+        Seed for the noise field (see `resolve_counter_seed`).
+    origin : tuple[int, int], default=(0, 0)
+        Absolute ``(y, x)`` of the region's top-left pixel in the full image.
+
+    Returns
+    -------
+    np.ndarray
+        2D uint64 array of hashed bits.
+
+    Raises
+    ------
+    ValueError
+        If the region lies outside the supported ``[0, 2**32)`` coordinate range.
+    """
+    rows, cols = int(size[0]), int(size[1])
+    y0, x0 = int(origin[0]), int(origin[1])
+    if min(rows, cols, y0, x0) < 0 or max(y0 + rows, x0 + cols) > (1 << 32):
+        raise ValueError("counter noise coordinates must lie in [0, 2**32)")
+
+    key = _splitmix64(np.array([resolve_counter_seed(seed)], dtype=np.uint64))
+    ys = np.arange(y0, y0 + rows, dtype=np.uint64) << np.uint64(32)
+    xs = np.arange(x0, x0 + cols, dtype=np.uint64)
+
+    # SplitMix64 stream: state_i = key + (i + 1) * golden, i = (y << 32) | x
+    z = ys[:, None] | xs[None, :]
+    z += np.uint64(1)
+    z *= _GOLDEN
+    z += key[0]
+    return _splitmix64(z)
+
+
+def counter_uniform(
+    low: float,
+    high: float,
+    size: tuple[int, int],
+    seed: Optional[int] = None,
+    origin: Tuple[int, int] = (0, 0),
+) -> np.ndarray:
+    """
+    Generate coordinate-keyed uniformly distributed noise in ``[low, high)``.
+
+    Parameters
+    ----------
+    low : float
+        Lower bound of the distribution range.
+    high : float
+        Upper bound of the distribution range.
+    size : tuple[int, int]
+        Output shape of the noise array.
+    seed : Optional[int], default=None
+        Seed for the noise field (see `resolve_counter_seed`).
+    origin : tuple[int, int], default=(0, 0)
+        Absolute ``(y, x)`` of the region's top-left pixel in the full image.
+
+    Returns
+    -------
+    np.ndarray
+        2D array of uniformly distributed noise values (float32).
+    """
+    u = (counter_bits(size, seed, origin) >> np.uint64(40)).astype(np.float64) * _INV_2_24
+    return (low + (high - low) * u).astype(np.float32)
+
+
+def counter_normal(
+    mean: float,
+    stddev: float,
+    size: tuple[int, int],
+    seed: Optional[int] = None,
+    origin: Tuple[int, int] = (0, 0),
+) -> np.ndarray:
+    """
+    Generate coordinate-keyed Gaussian noise (Box-Muller on the hashed bits).
+
+    Parameters
+    ----------
+    mean : float
+        Mean of the normal distribution.
+    stddev : float
+        Standard deviation of the distribution.
+    size : tuple[int, int]
+        Output shape of the noise array.
+    seed : Optional[int], default=None
+        Seed for the noise field (see `resolve_counter_seed`).
+    origin : tuple[int, int], default=(0, 0)
+        Absolute ``(y, x)`` of the region's top-left pixel in the full image.
+
+    Returns
+    -------
+    np.ndarray
+        2D array of normally distributed noise values (float32).
+    """
+    bits = counter_bits(size, seed, origin)
+    # Two independent 24-bit uniforms per pixel: u1 in (0, 1], u2 in [0, 1)
+    u1 = ((bits >> np.uint64(40)) + np.uint64(1)).astype(np.float64) * _INV_2_24
+    u2 = (bits & np.uint64(0xFFFFFF)).astype(np.float64) * _INV_2_24
+    z = np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+    return (mean + stddev * z).astype(np.float32)
+
+
+def counter_integers(
+    low: int,
+    high: int,
+    size: tuple[int, int],
+    seed: Optional[int] = None,
+    origin: Tuple[int, int] = (0, 0),
+) -> np.ndarray:
+    """
+    Generate coordinate-keyed uniform integers in ``[low, high)``.
+
+    Parameters
+    ----------
+    low : int
+        Inclusive lower bound.
+    high : int
+        Exclusive upper bound (``high - low`` must be in ``[1, 2**32]``).
+    size : tuple[int, int]
+        Output shape of the noise array.
+    seed : Optional[int], default=None
+        Seed for the noise field (see `resolve_counter_seed`).
+    origin : tuple[int, int], default=(0, 0)
+        Absolute ``(y, x)`` of the region's top-left pixel in the full image.
+
+    Returns
+    -------
+    np.ndarray
+        2D int64 array of uniformly distributed integers.
+
+    Raises
+    ------
+    ValueError
+        If the range is empty or wider than ``2**32``.
+    """
+    span = int(high) - int(low)
+    if span < 1 or span > (1 << 32):
+        raise ValueError("high - low must be in [1, 2**32]")
+
+    # Multiply-shift range reduction on the top 32 bits (no modulo bias)
+    top = counter_bits(size, seed, origin) >> np.uint64(32)
+    vals = (top * np.uint64(span)) >> np.uint64(32)
+    return vals.astype(np.int64) + int(low)
@@ -4,16 +4,26 @@
 Implements two modes:
 - additive: add noise to grayscale then threshold
 - jitter: jitter the threshold per pixel using noise
-Supports uniform and normal noise distributions.
+Supports uniform and normal noise distributions, drawn either from a single
+sequential generator, or band by band (spawned streams or a coordinate-keyed
+counter) through the fused, multithreaded path in `fused`. `RandomDitherer`
+fixes a counter-keyed noise field, so its frames share one pattern and its
+`update` re-dithers only dirty rectangles.
 """
 
 from __future__ import annotations
 
-from typing import Literal, Optional, Union
+from typing import Iterable, Literal, Optional, Tuple, Union
 
 import numpy as np
 
+from ..utils.ditherer import Ditherer, Rect, dirty_slices
 from ..utils.grayscale import binarize, grayscale, map_threshold_graydomain
+from ..utils.prep_img import gray_input_scale
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace, output_dtype, prepare_output
+from .fused import fused_random_bw
+from .group.counter import resolve_counter_seed
 from .group.normal import normal_distribution
 from .group.uniform import uniform_distrib
 from .mode.additive import addition
@@ -29,6 +39,15 @@ def random_bw(
     distribution: Literal["uniform", "normal"] = "uniform",
     amount: float = 0.05,
     seed: Optional[int] = None,
+    generator: Literal["sequential", "spawn", "counter"] = "sequential",
+    origin: Tuple[int, int] = (0, 0),
+    band_rows: int = 256,
+    workers: Optional[int] = 1,
+    packed: bool = False,
+    out: Optional[np.ndarray] = None,
+    tone: Optional[ToneCurve] = None,
+    workspace: Optional[Workspace] = None,
+    input_scale: Optional[float] = None,
 ) -> np.ndarray:
     """
     Apply noise-based dithering (additive or threshold jitter).
@@ -54,6 +73,32 @@ def random_bw(
         E.g., 0.05 → amplitude ≈ 12.75.
     seed : int | None, default None
         RNG seed for reproducibility.
+    generator : {"sequential", "spawn", "counter"}, default "sequential"
+        - "sequential": one full-size draw from ``np.random.default_rng(seed)``
+        - "spawn": float32 noise per band from ``SeedSequence(seed).spawn`` streams,
+          fused with thresholding (see `fused_random_bw`)
+        - "counter": noise keyed on ``(seed, y, x)``, fused and generated band by
+          band; any tiling of the image yields bit-identical output
+    origin : tuple[int, int], default (0, 0)
+        Absolute ``(y, x)`` of `img` inside a larger image (counter generator only).
+        Dithering a tile with its origin reproduces that region of the full result.
+    band_rows : int, default 256
+        Rows per noise band ("spawn"/"counter"); bounds the noise temporaries.
+    workers : int | None, default 1
+        Threads used for the bands ("spawn"/"counter"); ``None`` uses all CPUs.
+        The result does not depend on this value.
+    packed : bool, default False
+        Return MSB-first bit-packed rows, uint8 (H, ceil(W / 8)) ("spawn"/"counter").
+    out : np.ndarray | None, default None
+        Preallocated output: (H, W) of any dtype, or the packed shape when
+        `packed` is True. The "spawn"/"counter" paths write into it directly.
+    tone : ToneCurve | None, default None
+        Tone curve folded into the grayscale conversion.
+    workspace : Workspace | None, default None
+        Reusable scratch buffers (gray plane, conversion accumulators).
+    input_scale : float | None, default None
+        Factor mapping `img` to [0..255] (see `gray_input_scale`); None derives
+        it from `img`. Pass the full image's factor when dithering tiles of it.
 
     Returns
     -------
@@ -63,16 +108,47 @@ def random_bw(
     Raises
     ------
     ValueError
-        If `distribution` or `mode` is invalid, or `amount` is negative.
+        If `distribution`, `mode` or `generator` is invalid, `amount` is negative,
+        `band_rows` < 1, or `packed`/`workers` are used with "sequential".
     """
     if amount < 0:
         raise ValueError("amount must be >= 0")
+    if distribution not in ("uniform", "normal"):
+        raise ValueError("distribution must be 'uniform' or 'normal'")
+    if mode not in ("additive", "jitter"):
+        raise ValueError("mode must be 'additive' or 'jitter'")
 
-    g = grayscale(img, dtype)
+    g = grayscale(img, dtype, tone=tone, workspace=workspace, input_scale=input_scale)
     thr = map_threshold_graydomain(threshold, dtype)
     noise_amp = float(amount) * 255.0
     h, w = g.shape
 
+    if generator in ("spawn", "counter"):
+        if packed and out is None:
+            out = np.empty((h, (w + 7) // 8), dtype=np.uint8)
+        elif not packed:
+            out = prepare_output((h, w), dtype, out)
+        return fused_random_bw(
+            g,
+            thr,
+            out=out,
+            mode=mode,
+            distribution=distribution,
+            noise_amp=noise_amp,
+            generator=generator,
+            seed=seed,
+            origin=origin,
+            band_rows=band_rows,
+            workers=workers,
+            packed=packed,
+        )
+    if generator != "sequential":
+        raise ValueError("generator must be 'sequential', 'spawn' or 'counter'")
+    if packed or workers != 1:
+        raise ValueError("packed and workers require generator='spawn' or 'counter'")
+    if out is not None:
+        out = prepare_output((h, w), dtype, out)
+
     if distribution == "uniform":
         noise = uniform_distrib(-noise_amp, noise_amp, size=(h, w), seed=seed)
     elif distribution == "normal":
@@ -81,10 +157,124 @@ def random_bw(
         raise ValueError("distribution must be 'uniform' or 'normal'")
 
     if mode == "additive":
-        out = addition(g, noise, thr, dtype=dtype)
+        bw = addition(g, noise, thr, dtype=output_dtype(dtype))
     elif mode == "jitter":
-        out = jitter(g, noise, thr, dtype=dtype)
+        bw = jitter(g, noise, thr, dtype=output_dtype(dtype))
     else:
         raise ValueError("mode must be 'additive' or 'jitter'")
 
-    return binarize(out, dtype)
+    result = binarize(bw, dtype)
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+class RandomDitherer(Ditherer):
+    """
+    Noise dithering over one fixed, coordinate-keyed noise field.
+
+    The seed is resolved once, so every frame sees the same noise and static
+    content does not flicker. Noise depends on ``(seed, y, x)`` only, so
+    `update` re-dithers just the dirty rectangles. Results equal `random_bw`
+    with ``generator="counter"`` and the resolved `seed`.
+
+    Parameters
+    ----------
+    threshold : int | float, default 128
+        Global threshold in the gray domain of `dtype`.
+    mode : {"additive", "jitter"}, default "additive"
+        Add noise to the gray values, or jitter the threshold.
+    distribution : {"uniform", "normal"}, default "uniform"
+        Noise distribution (see `random_bw`).
+    amount : float, default 0.05
+        Noise amplitude as a fraction of the 8-bit range.
+    seed : int | None, default None
+        Noise field seed; ``None`` draws one at construction.
+    dtype : {"u8","f32"} | np.dtype | type, default "u8"
+        Output dtype.
+    tone : ToneCurve | None, default None
+        Tone curve folded into the grayscale conversion.
+    workspace : Workspace | None, default None
+        Scratch buffers; a new one by default.
+
+    Raises
+    ------
+    ValueError
+        If `mode` or `distribution` is invalid, `amount` is negative or
+        `seed` is negative.
+
+    Examples
+    --------
+    >>> noise = RandomDitherer(amount=0.2, seed=7)
+    >>> screen = noise(frame)
+    >>> noise.update(next_frame, screen, [(y, x, h, w)])
+    """
+
+    def __init__(
+        self,
+        threshold: Union[int, float] = 128,
+        *,
+        mode: Literal["additive", "jitter"] = "additive",
+        distribution: Literal["uniform", "normal"] = "uniform",
+        amount: float = 0.05,
+        seed: Optional[int] = None,
+        dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+        tone: Optional[ToneCurve] = None,
+        workspace: Optional[Workspace] = None,
+    ) -> None:
+        super().__init__(workspace)
+        if amount < 0:
+            raise ValueError("amount must be >= 0")
+        if distribution not in ("uniform", "normal"):
+            raise ValueError("distribution must be 'uniform' or 'normal'")
+        if mode not in ("additive", "jitter"):
+            raise ValueError("mode must be 'additive' or 'jitter'")
+        self.threshold = threshold
+        self.mode = mode
+        self.distribution = distribution
+        self.amount = amount
+        self.seed = resolve_counter_seed(seed)
+        self.dtype = dtype
+        self.tone = tone
+        self.out_dtype = output_dtype(dtype)
+
+    def output_shape(self, shape: Tuple[int, ...]) -> Tuple[int, ...]:
+        """(H, W) for an (H, W[, C]) frame."""
+        return tuple(shape[:2])
+
+    def __call__(self, img: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dither one frame (see `random_bw`), into `out` when given."""
+        return self._dither(img, out, (0, 0), None)
+
+    def update(self, img: np.ndarray, prev: np.ndarray, rects: Iterable[Rect]) -> np.ndarray:
+        """Re-dither the dirty rectangles with their own noise (see `Ditherer.update`)."""
+        self._check_prev(img, prev)
+        scale = gray_input_scale(img)
+        for ys, xs in dirty_slices(rects, img.shape):
+            self._dither(img[ys, xs], prev[ys, xs], (ys.start, xs.start), scale)
+        return prev
+
+    def _dither(
+        self,
+        img: np.ndarray,
+        out: Optional[np.ndarray],
+        origin: Tuple[int, int],
+        input_scale: Optional[float],
+    ) -> np.ndarray:
+        """`random_bw` on the counter generator for the region at `origin`."""
+        return random_bw(
+            img,
+            dtype=self.dtype,
+            threshold=self.threshold,
+            mode=self.mode,
+            distribution=self.distribution,
+            amount=self.amount,
+            seed=self.seed,
+            generator="counter",
+            origin=origin,
+            out=out,
+            tone=self.tone,
+            workspace=self.workspace,
+            input_scale=input_scale,
+        )
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""Riemersma dithering.
+
+This subpackage diffuses error along a Hilbert curve with a decaying error
+history, with the curve orders generated vectorially and cached per size.
+"""
+
+from __future__ import annotations
+
+from .curve import hilbert_curve, hilbert_order
+from .riemersma import riemersma_bw
+
+__all__ = [
+    "riemersma_bw",
+    "hilbert_curve",
+    "hilbert_order",
+]
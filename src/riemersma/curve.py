@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Hilbert curve traversal orders for Riemersma dithering.
+
+The image is covered by power-of-two squares placed along its long side; each
+square holds a Hilbert curve from one bottom corner to the other, so the
+curves join into one continuous path, and positions outside the image are
+skipped. Curves are built vectorially (four transformed copies per level) and
+orders are cached per image size, so repeated frames of one size reuse them.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+
+def hilbert_curve(order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hilbert curve on a square of side ``2**order``.
+
+    Parameters
+    ----------
+    order : int
+        Curve level (>= 0).
+
+    Returns
+    -------
+    (x, y) : tuple of np.ndarray
+        int32 coordinates of the ``4**order`` points in visiting order; the
+        curve starts at (0, 0) and ends at (``2**order - 1``, 0).
+    """
+    x = np.zeros(1, dtype=np.int32)
+    y = np.zeros(1, dtype=np.int32)
+    for k in range(order):
+        s = 1 << k
+        # Lower-left transposed, upper-left and upper-right shifted, lower-right
+        # anti-transposed: each quarter starts next to where the last one ended
+        x, y = (
+            np.concatenate((y, x, x + s, 2 * s - 1 - y)),
+            np.concatenate((x, y + s, y + s, s - 1 - x)),
+        )
+    return x, y
+
+
+@lru_cache(maxsize=8)
+def hilbert_order(h: int, w: int) -> np.ndarray:
+    """
+    Flat pixel indices of an (h, w) image in Hilbert curve order (cached per size).
+
+    Parameters
+    ----------
+    h, w : int
+        Image size.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only (h*w,) int32 (int64 beyond 2**31 pixels) array; element k is
+        ``y * w + x`` of the k-th visited pixel. Consecutive pixels are
+        4-neighbours except where the path skips positions outside the image.
+    """
+    idx_dtype = np.int32 if h * w < 2**31 else np.int64
+    side = 1 << max(0, int(min(h, w) - 1).bit_length())
+    cx, cy = hilbert_curve(side.bit_length() - 1)
+    cx = cx.astype(idx_dtype)
+    cy = cy.astype(idx_dtype)
+    if h > w:
+        # Tall image: transposed curves, chained downwards
+        cx, cy = cy, cx
+    parts = []
+    for start in range(0, max(h, w), side):
+        xs, ys = (cx + start, cy) if h <= w else (cx, cy + start)
+        inside = (xs < w) & (ys < h)
+        parts.append(ys[inside] * w + xs[inside])
+    idx = np.concatenate(parts)
+    idx.setflags(write=False)
+    return idx
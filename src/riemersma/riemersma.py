@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Riemersma dithering.
+
+Pixels are visited along a Hilbert curve; each one receives a weighted sum of
+the last `history` errors (pixel minus output, as in Riemersma's original), the
+weights decaying geometrically from 1 (newest) to ``1 / ratio`` (oldest). With
+geometric weights the sum is updated in O(1) per pixel instead of re-weighting
+the whole history.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Literal, Optional, Union
+
+import numpy as np
+
+from ..utils.grayscale import grayscale, map_threshold_graydomain
+from ..utils.tone import ToneCurve
+from ..utils.workspace import Workspace, prepare_output
+from .curve import hilbert_order
+
+
+def riemersma_bw(
+    img: np.ndarray,
+    *,
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type] = "u8",
+    threshold: Union[int, float] = 128,
+    history: int = 16,
+    ratio: float = 16.0,
+    tone: Optional[ToneCurve] = None,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+) -> np.ndarray:
+    """
+    Apply Riemersma dithering along a Hilbert curve.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Input image (H, W) or (H, W, C). Converted to grayscale internally.
+    dtype : {"u8","f32"} | np.dtype | type, optional
+        Output dtype for the binarized image. Default "u8".
+    threshold : int | float, optional
+        Global threshold for binarization. Default 128.
+    history : int, optional
+        Number of past errors carried along the curve. Default 16.
+    ratio : float, optional
+        Weight of the newest error over the oldest one. Default 16.
+    tone : ToneCurve | None, optional
+        Tone curve folded into the grayscale conversion. Default None.
+    out : np.ndarray | None, optional
+        Preallocated (H, W) output, written in place and returned. Default None.
+    workspace : Workspace | None, optional
+        Reusable scratch buffers (gray plane, curve-ordered values). Default None.
+
+    Returns
+    -------
+    np.ndarray
+        Dithered 1-bit image mapped to `dtype` (`out` when given).
+
+    Raises
+    ------
+    ValueError
+        If `history` < 1 or `ratio` < 1.
+    """
+    if history < 1:
+        raise ValueError("history must be >= 1")
+    if ratio < 1:
+        raise ValueError("ratio must be >= 1")
+    h, w = img.shape[:2]
+    thr = map_threshold_graydomain(threshold, dtype)
+    order = hilbert_order(h, w)
+
+    g = grayscale(img, dtype, tone=tone, workspace=workspace)
+    if workspace is None:
+        vals = np.empty(h * w, dtype=g.dtype)
+        bits = np.empty(h * w, dtype=np.uint8)
+    else:
+        vals = workspace.get("curve_vals", (h * w,), g.dtype)
+        bits = workspace.get("curve_bits", (h * w,), np.uint8)
+    np.take(g.reshape(-1), order, out=vals)
+
+    # weight_j = decay**(history-1-j) for j = 0 (oldest) .. history-1 (newest)
+    decay = ratio ** (-1.0 / (history - 1)) if history > 1 else 0.0
+    oldest = 1.0 / ratio if history > 1 else 1.0
+    errs = deque([0.0] * history, maxlen=history)
+    acc = 0.0
+    res = bytearray(h * w)
+    for i, v in enumerate(vals.tolist()):
+        if v + acc >= thr:
+            res[i] = 1
+            err = v - 255.0
+        else:
+            err = float(v)
+        # Age every weight by one step and drop the oldest error
+        acc = (acc - errs[0] * oldest) * decay + err
+        errs.append(err)
+
+    bits[order] = np.frombuffer(res, dtype=np.uint8)
+    dither_img = prepare_output((h, w), dtype, out)
+    dither_img[...] = bits.reshape(h, w)
+    return dither_img
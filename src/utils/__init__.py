@@ -4,18 +4,79 @@
 This package provides helper functions for:
 - Grayscale conversion and binarization
 - Threshold mapping to grayscale domain
-- Image preparation (uint8 conversion, tuple unpacking)
+- Mergeable 256-bin gray-level histograms
+- Tone curves (sRGB linearization, levels, gamma, equalization) as LUTs
+- Reusable workspaces and output buffers, with an optional shared cache of
+  per-image intermediates
+- A base class for configured, reusable dithering objects, with incremental
+  re-dithering of dirty rectangles
+- Memory-mapped image files (.npy, uncompressed TIFF, raw)
+- Row-streaming PNG and PBM/PGM/PPM readers and writers
+- Lazy frame-sequence decoding and streaming animated GIF/APNG writers
+- Content-addressed on-disk cache of dithering results
+- Image preparation (uint8 conversion, tuple unpacking, row-wise RGB conversion)
 """
 
 from __future__ import annotations
 
-from .grayscale import binarize, grayscale, map_threshold_graydomain
-from .prep_img import to_uint8_image, tuple_prepare_img
+from .ditherer import Ditherer, dirty_slices
+from .grayscale import binarize, grayscale, luma_lut, map_threshold_graydomain
+from .histogram import gray_histogram, merge_histograms
+from .intermediates import IntermediateCache
+from .mmap_io import create_image_memmap, open_image_memmap
+from .prep_img import (
+    gray_input_scale,
+    prepare_rgb_rows,
+    quantize_to_uint8,
+    rgb_input_scale,
+    to_uint8_image,
+    tuple_prepare_img,
+)
+from .result_cache import ResultCache, image_fingerprint
+from .sequence_io import APNGWriter, FrameReader, GIFWriter, open_frame_writer
+from .stream_io import (
+    PNGReader,
+    PNGWriter,
+    PNMReader,
+    PNMWriter,
+    open_row_reader,
+    open_row_writer,
+)
+from .tone import ToneCurve
+from .workspace import Workspace, output_dtype, prepare_output
 
 __all__ = [
     "grayscale",
+    "luma_lut",
     "binarize",
     "map_threshold_graydomain",
+    "gray_histogram",
+    "merge_histograms",
+    "open_image_memmap",
+    "create_image_memmap",
+    "open_row_reader",
+    "open_row_writer",
+    "PNGReader",
+    "PNGWriter",
+    "PNMReader",
+    "PNMWriter",
+    "FrameReader",
+    "GIFWriter",
+    "APNGWriter",
+    "open_frame_writer",
+    "ResultCache",
+    "image_fingerprint",
     "tuple_prepare_img",
+    "rgb_input_scale",
+    "gray_input_scale",
+    "prepare_rgb_rows",
     "to_uint8_image",
+    "quantize_to_uint8",
+    "ToneCurve",
+    "Workspace",
+    "Ditherer",
+    "dirty_slices",
+    "IntermediateCache",
+    "output_dtype",
+    "prepare_output",
 ]
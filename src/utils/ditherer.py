@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""Base class of configured, reusable dithering objects.
+
+A `Ditherer` validates and precomputes its configuration (kernel tables,
+palette arrays, threshold tiles) once in its constructor and owns a
+`Workspace`, so dithering many same-sized frames repeats none of that work
+and reaches a steady state with no large allocations. Like its workspace, a
+ditherer is not thread-safe: give each concurrent caller its own.
+
+`Ditherer.update` re-dithers only the changed rectangles of a frame into the
+previous result; position-local methods override it to touch just those
+rectangles, the base class redoes the whole frame.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .workspace import Workspace
+
+# (y, x, h, w): top-left corner and size, like an `origin` plus a shape
+Rect = Tuple[int, int, int, int]
+
+
+def dirty_slices(
+    rects: Iterable[Rect],
+    shape: Tuple[int, ...],
+    tile: Tuple[int, int] = (1, 1),
+) -> List[Tuple[slice, slice]]:
+    """
+    Clip dirty rectangles to an image and align them to a tile grid.
+
+    Parameters
+    ----------
+    rects : iterable of (y, x, h, w)
+        Changed regions; parts outside the image are ignored.
+    shape : tuple of int
+        Image shape (H, W[, C]).
+    tile : tuple of int, default (1, 1)
+        Grid the rectangles are grown to, e.g. a threshold tile, so repeated
+        updates hit the same memoized threshold planes.
+
+    Returns
+    -------
+    list of (slice, slice)
+        Row and column slices of the non-empty aligned rectangles.
+    """
+    h, w = shape[:2]
+    ty, tx = tile
+    slices = []
+    for y, x, rh, rw in rects:
+        if rh <= 0 or rw <= 0:
+            continue
+        y0, x0 = max(0, int(y)) // ty * ty, max(0, int(x)) // tx * tx
+        y1 = min(h, -(-(int(y) + int(rh)) // ty) * ty)
+        x1 = min(w, -(-(int(x) + int(rw)) // tx) * tx)
+        if y1 > y0 and x1 > x0:
+            slices.append((slice(y0, y1), slice(x0, x1)))
+    return slices
+
+
+class Ditherer(ABC):
+    """
+    Configured dithering operation applied to frames.
+
+    Subclasses implement the abstract `__call__` and `output_shape`, and set
+    `out_dtype`.
+
+    Parameters
+    ----------
+    workspace : Workspace | None, default None
+        Scratch buffers reused by every call; a new one by default.
+
+    Examples
+    --------
+    >>> fs = ErrorDiffuser("stucki", serpentine=True)
+    >>> out = fs(img)
+    >>> video_out = fs.process_batch(frames)   # (N, H, W)
+    >>> fs.update(new_frame, out, [(y, x, h, w)])  # only what the edit affects
+    """
+
+    out_dtype: type = np.uint8
+
+    def __init__(self, workspace: Optional[Workspace] = None) -> None:
+        self.workspace = Workspace() if workspace is None else workspace
+
+    @abstractmethod
+    def __call__(self, img: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dither one frame, into `out` when given."""
+
+    @abstractmethod
+    def output_shape(self, shape: Tuple[int, ...]) -> Tuple[int, ...]:
+        """Shape of the result for an input frame of `shape`."""
+
+    def process_batch(
+        self,
+        frames: Union[np.ndarray, Sequence[np.ndarray]],
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Dither same-sized frames into one stacked array.
+
+        Parameters
+        ----------
+        frames : np.ndarray | sequence of np.ndarray
+            (N, H, W[, C]) array (may be a memmap) or N frames of equal shape.
+        out : np.ndarray | None, default None
+            Preallocated (N, ...) destination, written in place and returned.
+
+        Returns
+        -------
+        np.ndarray
+            Results stacked along the first axis (`out` when given).
+
+        Raises
+        ------
+        ValueError
+            If the frames differ in shape or `out` has the wrong shape.
+        """
+        n = len(frames)
+        if n == 0:
+            raise ValueError("process_batch needs at least one frame")
+        shape = tuple(frames[0].shape)
+        expected = (n,) + self.output_shape(shape)
+        if out is None:
+            out = np.empty(expected, dtype=self.out_dtype)
+        elif out.shape != expected:
+            raise ValueError(f"Output shape {out.shape} does not match expected shape {expected}")
+        for i in range(n):
+            frame = frames[i]
+            if tuple(frame.shape) != shape:
+                raise ValueError(f"Frame {i} has shape {frame.shape}, expected {shape}")
+            self(frame, out=out[i])
+        return out
+
+    def update(self, img: np.ndarray, prev: np.ndarray, rects: Iterable[Rect]) -> np.ndarray:
+        """
+        Re-dither the changed regions of a frame into its previous result.
+
+        Parameters
+        ----------
+        img : np.ndarray
+            The new frame, equal to the previous one outside `rects`.
+        prev : np.ndarray
+            This ditherer's result for the previous frame; updated in place.
+        rects : iterable of (y, x, h, w)
+            Changed regions (see `dirty_slices`).
+
+        Returns
+        -------
+        np.ndarray
+            `prev`, now equal to ``self(img)``. This base version re-dithers the
+            whole frame; subclasses recompute only what the rectangles affect.
+
+        Raises
+        ------
+        ValueError
+            If `prev` does not have the output shape of `img`.
+        """
+        self._check_prev(img, prev)
+        return self(img, out=prev)
+
+    def _check_prev(self, img: np.ndarray, prev: np.ndarray) -> None:
+        """Raise unless `prev` has the output shape of `img`."""
+        expected = self.output_shape(tuple(img.shape))
+        if tuple(prev.shape) != expected:
+            raise ValueError(f"prev shape {prev.shape} does not match expected shape {expected}")
@@ -1,23 +1,129 @@
 # -*- coding: utf-8 -*-
+"""Grayscale conversion and binarization helpers.
+
+uint8 inputs take a single-pass integer path (`luma_lut`): three 256-entry
+weight tables evaluate BT.601 luminance exactly in int32, chunk by chunk,
+straight into the destination buffer. Other dtypes go through float32.
+An optional `ToneCurve` swaps in its own weight tables and adds one output
+lookup, so tone mapping rides along with the conversion.
+"""
 
 from __future__ import annotations
 
-from typing import Literal, Union
+from typing import Literal, Optional, Union
 
 import numpy as np
 
-from ..utils.prep_img import process_dtype_arg
+from ..utils.prep_img import gray_input_scale, process_dtype_arg, quantize_to_uint8
+from .tone import LUMA_DENOM, LUMA_WEIGHTS, ToneCurve
+from .workspace import Workspace
+
+# BT.601 weights scaled by 10**4: Y = (2989 R + 5870 G + 1140 B) / 10000
+_LUMA_LUT = (
+    np.array(LUMA_WEIGHTS, dtype=np.int32)[:, None]
+    * np.arange(256, dtype=np.int32)[None, :]
+)
+
+
+def luma_lut(
+    img: np.ndarray,
+    out: Optional[np.ndarray] = None,
+    *,
+    chunk_rows: Optional[int] = 256,
+    tone: Optional[ToneCurve] = None,
+    workspace: Optional[Workspace] = None,
+) -> np.ndarray:
+    """
+    Convert a uint8 gray/RGB/RGBA image to BT.601 luminance with integer tables.
+
+    Each output is ``round_half_up((2989 R + 5870 G + 1140 B) / 10000)``, the same
+    value as the float path except at exact .5 ties, which float32 rounds either way.
+    With `tone`, luminance is mixed from the curve's 16-bit channel tables and
+    mapped through its output table.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        uint8 image (H, W), (H, W, 1), (H, W, 3) or (H, W, 4).
+    out : np.ndarray | None, default None
+        Destination (H, W) buffer, uint8 or float32. Allocated as float32 if None.
+    chunk_rows : int | None, default 256
+        Rows converted per step; keeps the int32 accumulators cache-sized.
+        ``None`` converts the whole image in one step.
+    tone : ToneCurve | None, default None
+        Tone curve folded into the conversion.
+    workspace : Workspace | None, default None
+        Source of the reusable int32 chunk accumulators.
+
+    Returns
+    -------
+    np.ndarray
+        `out`, holding gray levels in [0..255].
+
+    Raises
+    ------
+    TypeError
+        If `img` is not uint8, or `out` is not uint8/float32.
+    ValueError
+        If `img` or `out` has an unsupported shape.
+    """
+    a = np.asarray(img)
+    if a.dtype != np.uint8:
+        raise TypeError(f"luma_lut expects a uint8 image, got {a.dtype}")
+    if a.ndim == 3 and a.shape[2] == 1:
+        a = a[..., 0]
+    if not (a.ndim == 2 or (a.ndim == 3 and a.shape[2] >= 3)):
+        raise ValueError(
+            f"Unsupported image format: shape {a.shape}. "
+            "Expected 2D grayscale, HxWx3 RGB, or HxWx4 RGBA."
+        )
+
+    h, w = a.shape[:2]
+    if out is None:
+        out = np.empty((h, w), dtype=np.float32)
+    if out.shape != (h, w):
+        raise ValueError(f"Output shape {out.shape} does not match image shape {(h, w)}")
+    if out.dtype not in (np.uint8, np.float32):
+        raise TypeError(f"Output buffer must be uint8 or float32, got {out.dtype}")
+
+    if a.ndim == 2:
+        out[...] = a if tone is None else np.take(tone.channel_lut, a)
+        return out
+
+    tables = _LUMA_LUT if tone is None else tone.channel_tables
+    rows = h if chunk_rows is None else max(1, int(chunk_rows))
+    if workspace is None:
+        acc = np.empty((min(rows, h), w), dtype=np.int32)
+        tmp = np.empty_like(acc)
+    else:
+        acc = workspace.get("luma_acc", (min(rows, h), w), np.int32)
+        tmp = workspace.get("luma_tmp", (min(rows, h), w), np.int32)
+    for y0 in range(0, h, rows):
+        y1 = min(h, y0 + rows)
+        acc_c, tmp_c = acc[:y1 - y0], tmp[:y1 - y0]
+        np.take(tables[0], a[y0:y1, :, 0], out=acc_c)
+        np.take(tables[1], a[y0:y1, :, 1], out=tmp_c)
+        acc_c += tmp_c
+        np.take(tables[2], a[y0:y1, :, 2], out=tmp_c)
+        acc_c += tmp_c
+        acc_c += LUMA_DENOM // 2
+        acc_c //= LUMA_DENOM
+        out[y0:y1] = acc_c if tone is None else np.take(tone.output_lut, acc_c)
+    return out
 
 
 def to_grayscale(
     img: np.ndarray, 
-    dtype: Union[Literal['u8'], Literal['f32'], np.dtype, type] = 'u8'
+    dtype: Union[Literal['u8'], Literal['f32'], np.dtype, type] = 'u8',
+    scale: Optional[float] = None,
 ) -> np.ndarray:
     """
     Convert grayscale/RGB/RGBA to luminance using BT.601.
     Output dtype/range:
       - integer dtype -> full integer range of that dtype
       - floating dtype -> [0.0, 1.0]
+    `scale` is the float input factor from `gray_input_scale`; None derives it
+    from `img`.
     """
     # ITU-R BT.601 luminance coefficients
     luminance = np.array([0.2989, 0.5870, 0.1140], dtype=np.float32)
@@ -32,10 +138,12 @@ def to_grayscale(
         a_f = a.astype(np.float32) / float(in_max if in_max > 0 else 255.0)
     elif np.issubdtype(a.dtype, np.floating):
         a_f = a.astype(np.float32)
-        if a_f.size:
-            vmax = float(np.nanmax(a_f))
-            if vmax > 1.0:
-                a_f = a_f / 255.0
+        if scale is None:
+            scale = 1.0 if a_f.size and float(np.nanmax(a_f)) > 1.0 else 255.0
+        if scale == 1.0:
+            a_f = a_f / 255.0
+        elif scale != 255.0:
+            a_f *= np.float32(scale / 255.0)
     else:
         a_f = a.astype(np.float32) / 255.0
 
@@ -56,31 +164,85 @@ def to_grayscale(
     else:
         return np.clip(y01, 0.0, 1.0).astype(output_dtype)
 
-def to_grayscale_u8(img: np.ndarray) -> np.ndarray:
+def to_grayscale_u8(img: np.ndarray, scale: Optional[float] = None) -> np.ndarray:
     """Wrapper for to_grayscale with uint8 output."""
-    return to_grayscale(img, dtype='u8')
+    return to_grayscale(img, dtype='u8', scale=scale)
 
-def to_grayscale_f32(img: np.ndarray) -> np.ndarray:
+def to_grayscale_f32(img: np.ndarray, scale: Optional[float] = None) -> np.ndarray:
     """Wrapper for to_grayscale with float32 output."""
-    return to_grayscale(img, dtype='f32')
+    return to_grayscale(img, dtype='f32', scale=scale)
 
 def grayscale(
     img: np.ndarray,
-    dtype: Union[Literal['u8'], Literal['f32'], np.dtype, type] = 'u8'
+    dtype: Union[Literal['u8'], Literal['f32'], np.dtype, type] = 'u8',
+    out: Optional[np.ndarray] = None,
+    tone: Optional[ToneCurve] = None,
+    workspace: Optional[Workspace] = None,
+    band_rows: Optional[int] = None,
+    input_scale: Optional[float] = None,
 ) -> np.ndarray:
     """
     Convert image to grayscale float32 [0..255] for internal processing.
     Input can be grayscale/RGB/RGBA with uint8 [0..255] or float32 [0.0..1.0] values.
     Output is always float32 [0..255].
+    uint8 inputs use the integer `luma_lut` path; `out` (uint8 or float32, (H, W))
+    receives the result directly instead of a new array. An optional `tone` curve
+    is folded into the conversion (other input dtypes are quantized to uint8 first).
+    With a `workspace` and no `out`, the plane is its reusable "gray" buffer, or,
+    if the workspace has an `IntermediateCache`, a read-only plane shared by
+    every later call on the same image, dtype and tone curve.
+    `band_rows` converts that many rows at a time (e.g. a memory-mapped `img`
+    into a memory-mapped `out`). `input_scale` (see `gray_input_scale`) fixes
+    the [0..1] or [0..255] range of float inputs; without it the range is
+    taken from `img`, once for the whole image when banding, so the result
+    never depends on `band_rows`. Callers converting bands or tiles of a larger
+    image pass the factor of the whole image.
     """
     checker_type = isinstance(dtype, (np.dtype, type))
     checker_float = checker_type and np.issubdtype(np.dtype(dtype), np.floating)
-    if dtype == 'f32' or (checker_type and checker_float):
-        gray_img = to_grayscale_f32(img)
+    is_float_dtype = dtype == 'f32' or (checker_type and checker_float)
+
+    a = np.asarray(img)
+    if band_rows is not None:
+        if band_rows < 1:
+            raise ValueError("band_rows must be >= 1")
+        if out is None:
+            out = np.empty(a.shape[:2], dtype=np.uint8 if is_float_dtype else np.float32)
+        if input_scale is None:
+            input_scale = gray_input_scale(a, band_rows)
+        for y0 in range(0, a.shape[0], band_rows):
+            grayscale(
+                a[y0:y0 + band_rows], dtype, out=out[y0:y0 + band_rows], tone=tone,
+                workspace=workspace, input_scale=input_scale,
+            )
+        return out
+    if out is None and workspace is not None and workspace.intermediates is not None:
+        return workspace.image_memo(
+            a,
+            "gray",
+            (is_float_dtype, tone, input_scale),
+            lambda: grayscale(a, dtype, tone=tone, input_scale=input_scale),
+        )
+    if tone is not None and a.dtype != np.uint8:
+        a = quantize_to_uint8(a, input_scale)
+    if a.dtype == np.uint8:
+        if out is None:
+            out_dtype = np.uint8 if is_float_dtype else np.float32
+            if workspace is None:
+                out = np.empty(a.shape[:2], dtype=out_dtype)
+            else:
+                out = workspace.get("gray", a.shape[:2], out_dtype)
+        return luma_lut(a, out, tone=tone, workspace=workspace)
+
+    if is_float_dtype:
+        gray_img = to_grayscale_f32(img, input_scale)
         gray_img = np.clip(np.round(gray_img * 255.0), 0, 255).astype(np.uint8)
     else:
-        gray_img = to_grayscale_u8(img)
+        gray_img = to_grayscale_u8(img, input_scale)
         gray_img = gray_img.astype(np.float32)
+    if out is not None:
+        out[...] = gray_img
+        return out
     return gray_img
 
 def map_threshold_graydomain(
@@ -112,8 +274,8 @@ def binarize(
     """
     # map to requested dtype
     checker_type = isinstance(dtype, (np.dtype, type))
-    checker_float = np.issubdtype(np.dtype(dtype), np.floating)
-    checker_int = np.issubdtype(np.dtype(dtype), np.integer)
+    checker_float = checker_type and np.issubdtype(np.dtype(dtype), np.floating)
+    checker_int = checker_type and np.issubdtype(np.dtype(dtype), np.integer)
 
     if dtype == 'f32' or (checker_type and checker_float):
         out_dtype = np.float32 if dtype == 'f32' else np.dtype(dtype).type
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""256-bin gray-level histograms.
+
+A histogram is a plain int64 array of shape (256,). Histograms of disjoint
+chunks (bands, tiles, memory-mapped slices) merge by addition, so statistics
+for a whole image can be accumulated chunk by chunk and then evaluated in
+O(256) (see the ``*_threshold_hist`` functions in `naive.group`) instead of
+touching the pixels again.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+N_BINS = 256
+
+
+def gray_histogram(
+    gray: np.ndarray,
+    hist: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Count gray levels of a plane in the [0..255] gray domain.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        Grayscale values (any shape), uint8 or integral floats as returned by
+        `grayscale`.
+    hist : np.ndarray | None, default None
+        Existing (256,) int64 histogram to accumulate into (updated in place).
+
+    Returns
+    -------
+    np.ndarray
+        (256,) int64 histogram (`hist` itself when given).
+
+    Raises
+    ------
+    ValueError
+        If `hist` is not a (256,) int64 array.
+    """
+    vals = np.asarray(gray)
+    if vals.dtype != np.uint8:
+        vals = vals.astype(np.uint8)
+    counts = np.bincount(vals.ravel(), minlength=N_BINS)
+
+    if hist is None:
+        return counts.astype(np.int64, copy=False)
+    if hist.shape != (N_BINS,) or hist.dtype != np.int64:
+        raise ValueError("hist must be an int64 array of shape (256,)")
+    hist += counts
+    return hist
+
+
+def merge_histograms(*hists: np.ndarray) -> np.ndarray:
+    """Merge histograms of disjoint chunks into one (256,) int64 histogram."""
+    total = np.zeros(N_BINS, dtype=np.int64)
+    for h in hists:
+        total += h
+    return total
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""In-memory cache of per-image intermediates shared across algorithms.
+
+An `IntermediateCache` attached to a `Workspace` lets every dithering call
+made with that workspace reuse the gray plane (tone-mapped or not), the gray
+histogram and the threshold planes computed by earlier calls, instead of
+recomputing them per algorithm. Entries are read-only and the least recently
+used are dropped once the cache exceeds its memory bound.
+"""
+
+from __future__ import annotations
+
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+def _owner(arr: np.ndarray) -> np.ndarray:
+    """Outermost ndarray owning `arr`'s memory (views share their owner)."""
+    while isinstance(arr.base, np.ndarray):
+        arr = arr.base
+    return arr
+
+
+class IntermediateCache:
+    """
+    Memory-bounded LRU cache of intermediates, keyed per image.
+
+    Images are identified by identity by default: the memory they view
+    (address, shape, strides, dtype), so ``img`` and ``img[0:h]`` share
+    entries. The owning array is tracked by weak reference, so an address
+    reused after it is freed never hits. Identity keys assume images are not
+    modified in place between calls; pass ``fingerprint=True`` to key by
+    content instead (one hash pass per image and call).
+
+    Parameters
+    ----------
+    max_bytes : int, default 256 MiB
+        Total size of the cached arrays.
+    fingerprint : bool, default False
+        Key images by a content hash instead of identity.
+
+    Examples
+    --------
+    >>> ws = Workspace(intermediates=IntermediateCache())
+    >>> for kernel in ("floyd_steinberg", "stucki", "atkinson"):
+    ...     error_diff_bw(img, kernel_type=kernel, workspace=ws)  # one gray conversion
+    """
+
+    def __init__(self, max_bytes: int = 256 << 20, *, fingerprint: bool = False) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        self.max_bytes = int(max_bytes)
+        self.fingerprint = fingerprint
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._owners: Dict[Tuple, weakref.ref] = {}
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def image_key(self, img: np.ndarray) -> Hashable:
+        """Key identifying `img` (see the class docstring)."""
+        arr = np.asarray(img)
+        if self.fingerprint:
+            # imported here: result_cache depends on workspace
+            from .result_cache import image_fingerprint
+
+            return ("content", image_fingerprint(arr))
+        ident = (
+            arr.__array_interface__["data"][0],
+            arr.shape,
+            arr.strides,
+            arr.dtype.str,
+        )
+        owner = _owner(arr)
+        ref = self._owners.get(ident)
+        if ref is None or ref() is not owner:
+            # new image, or the memory now belongs to another array
+            self._drop_image(("view",) + ident)
+            self._owners[ident] = weakref.ref(owner, self._forget_owner(ident))
+        return ("view",) + ident
+
+    def memo(
+        self,
+        img: Optional[np.ndarray],
+        name: str,
+        key: Hashable,
+        build: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Return the array `name` for `img` and `key`, building it on a miss.
+
+        Parameters
+        ----------
+        img : np.ndarray | None
+            Image the array derives from; None for image-independent arrays
+            (e.g. threshold planes).
+        name : str
+            Kind of intermediate ("gray", "hist", "threshold", ...).
+        key : Hashable
+            Everything else the array depends on (dtype, tone curve, ...).
+        build : callable
+            Computes the array on a miss.
+
+        Returns
+        -------
+        np.ndarray
+            The cached array, read-only.
+        """
+        full_key = (None if img is None else self.image_key(img), name, key)
+        hit = self._entries.get(full_key)
+        if hit is not None:
+            self._entries.move_to_end(full_key)
+            self.hits += 1
+            return hit
+        self.misses += 1
+        arr = build()
+        arr.setflags(write=False)
+        if arr.nbytes <= self.max_bytes:
+            self._entries[full_key] = arr
+            self._nbytes += arr.nbytes
+            while self._nbytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._nbytes -= old.nbytes
+        return arr
+
+    def _forget_owner(self, ident: Tuple) -> Callable[[weakref.ref], None]:
+        """Weakref callback removing `ident` once its owning array is freed."""
+        owners = self._owners
+
+        def forget(ref: weakref.ref) -> None:
+            if owners.get(ident) is ref:
+                del owners[ident]
+
+        return forget
+
+    def _drop_image(self, image_key: Hashable) -> None:
+        """Forget every entry of a stale image key."""
+        for k in [k for k in self._entries if k[0] == image_key]:
+            self._nbytes -= self._entries.pop(k).nbytes
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes held by the cached arrays."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        """Number of cached arrays."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._owners.clear()
+        self._nbytes = 0
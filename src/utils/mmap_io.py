@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""Memory-mapped image sources and sinks.
+
+Images too large for RAM are opened as `np.memmap` views and processed in
+row bands by the ``band_rows`` paths of the dithering functions, which read
+and write only the rows of the current band. Supported containers:
+
+- ``.npy`` files (any dtype/shape)
+- uncompressed TIFF (classic or BigTIFF) whose strips are stored
+  contiguously, chunky planar layout, 8/16/32/64-bit samples
+- raw headerless files, given shape and dtype
+
+`create_image_memmap` writes the same containers. Bilevel outputs ({0,1}
+uint8, as returned by the ``*_bw`` functions) can be written as palette TIFFs
+mapping 0 to black and 1 to white, so they display correctly unscaled.
+"""
+
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+PathLike = Union[str, Path]
+
+_TIFF_SUFFIXES = (".tif", ".tiff")
+
+# TIFF tags
+_IMAGE_WIDTH = 256
+_IMAGE_LENGTH = 257
+_BITS_PER_SAMPLE = 258
+_COMPRESSION = 259
+_PHOTOMETRIC = 262
+_STRIP_OFFSETS = 273
+_SAMPLES_PER_PIXEL = 277
+_ROWS_PER_STRIP = 278
+_STRIP_BYTE_COUNTS = 279
+_PLANAR_CONFIG = 284
+_COLOR_MAP = 320
+_TILE_WIDTH = 322
+_SAMPLE_FORMAT = 339
+
+# TIFF field types: code -> (struct format, size)
+_TIFF_TYPES: Dict[int, Tuple[str, int]] = {
+    1: ("B", 1), 3: ("H", 2), 4: ("I", 4), 16: ("Q", 8),
+}
+_SHORT, _LONG, _LONG8 = 3, 4, 16
+
+# Target strip size when writing TIFF files
+_STRIP_BYTES = 1 << 18
+
+
+def _tiff_layout(
+    path: PathLike
+) -> Tuple[int, Tuple[int, ...], np.dtype]:
+    """Parse a TIFF header: (pixel data offset, array shape, dtype)."""
+    with open(path, "rb") as f:
+        head = f.read(16)
+        if head[:2] == b"II":
+            bo = "<"
+        elif head[:2] == b"MM":
+            bo = ">"
+        else:
+            raise ValueError(f"{path}: not a TIFF file")
+        magic = struct.unpack(bo + "H", head[2:4])[0]
+        if magic == 42:
+            big = False
+            ifd = struct.unpack(bo + "I", head[4:8])[0]
+        elif magic == 43:
+            big = True
+            ifd = struct.unpack(bo + "Q", head[8:16])[0]
+        else:
+            raise ValueError(f"{path}: not a TIFF file")
+
+        f.seek(ifd)
+        n_entries = struct.unpack(bo + ("Q" if big else "H"), f.read(8 if big else 2))[0]
+        entry_size, inline = (20, 8) if big else (12, 4)
+        raw = f.read(n_entries * entry_size)
+
+        tags: Dict[int, List[int]] = {}
+        for i in range(n_entries):
+            e = raw[i * entry_size:(i + 1) * entry_size]
+            if big:
+                tag, typ, count = struct.unpack(bo + "HHQ", e[:12])
+                value = e[12:20]
+            else:
+                tag, typ, count = struct.unpack(bo + "HHI", e[:8])
+                value = e[8:12]
+            if typ not in _TIFF_TYPES:
+                continue
+            fmt, size = _TIFF_TYPES[typ]
+            nbytes = count * size
+            if nbytes > inline:
+                pos = f.tell()
+                f.seek(struct.unpack(bo + ("Q" if big else "I"), value)[0])
+                value = f.read(nbytes)
+                f.seek(pos)
+            tags[tag] = list(struct.unpack(f"{bo}{count}{fmt}", value[:nbytes]))
+
+    def first(tag: int, default: Optional[int] = None) -> int:
+        if tag not in tags:
+            if default is None:
+                raise ValueError(f"{path}: missing TIFF tag {tag}")
+            return default
+        return tags[tag][0]
+
+    if _TILE_WIDTH in tags:
+        raise ValueError(f"{path}: tiled TIFF files cannot be memory-mapped")
+    if first(_COMPRESSION, 1) != 1:
+        raise ValueError(f"{path}: compressed TIFF files cannot be memory-mapped")
+    spp = first(_SAMPLES_PER_PIXEL, 1)
+    if spp > 1 and first(_PLANAR_CONFIG, 1) != 1:
+        raise ValueError(f"{path}: planar TIFF layout is not supported")
+    bits = set(tags.get(_BITS_PER_SAMPLE, [1]))
+    if len(bits) != 1 or next(iter(bits)) not in (8, 16, 32, 64):
+        raise ValueError(f"{path}: unsupported bits per sample {sorted(bits)}")
+    kind = {1: "u", 2: "i", 3: "f"}.get(first(_SAMPLE_FORMAT, 1))
+    if kind is None:
+        raise ValueError(f"{path}: unsupported TIFF sample format")
+    dtype = np.dtype(f"{bo}{kind}{next(iter(bits)) // 8}")
+
+    offsets, counts = tags[_STRIP_OFFSETS], tags[_STRIP_BYTE_COUNTS]
+    for o0, c0, o1 in zip(offsets[:-1], counts[:-1], offsets[1:]):
+        if o0 + c0 != o1:
+            raise ValueError(f"{path}: TIFF strips are not contiguous")
+
+    h, w = first(_IMAGE_LENGTH), first(_IMAGE_WIDTH)
+    shape = (h, w) if spp == 1 else (h, w, spp)
+    return offsets[0], shape, dtype
+
+
+def open_image_memmap(
+    path: PathLike,
+    *,
+    shape: Optional[Tuple[int, ...]] = None,
+    dtype: Union[np.dtype, type, None] = None,
+    offset: int = 0,
+    mode: str = "r",
+) -> np.ndarray:
+    """
+    Open an image file as a memory-mapped array without reading its pixels.
+
+    Parameters
+    ----------
+    path : str | Path
+        ``.npy``, uncompressed ``.tif``/``.tiff``, or a raw file.
+    shape : tuple | None, default None
+        (H, W) or (H, W, C); required for raw files.
+    dtype : np.dtype | type | None, default None
+        Sample dtype; required for raw files.
+    offset : int, default 0
+        Byte offset of the pixel data in a raw file.
+    mode : {"r", "r+", "c"}, default "r"
+        Memory-map mode (read-only, read-write, copy-on-write).
+
+    Returns
+    -------
+    np.ndarray
+        Memory-mapped (H, W) or (H, W, C) array.
+
+    Raises
+    ------
+    ValueError
+        If the TIFF layout cannot be mapped, or a raw file lacks `shape`/`dtype`.
+    """
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix == ".npy":
+        return np.load(p, mmap_mode=mode)
+    if suffix in _TIFF_SUFFIXES:
+        data_offset, tiff_shape, tiff_dtype = _tiff_layout(p)
+        return np.memmap(p, dtype=tiff_dtype, mode=mode, offset=data_offset, shape=tiff_shape)
+    if shape is None or dtype is None:
+        raise ValueError("raw files require shape and dtype")
+    return np.memmap(p, dtype=dtype, mode=mode, offset=offset, shape=tuple(shape))
+
+
+def _tiff_entries(
+    shape: Tuple[int, ...],
+    dtype: np.dtype,
+    bilevel: bool,
+    data_offset: int,
+    strip_rows: int,
+    big: bool,
+) -> List[Tuple[int, int, List[int]]]:
+    """TIFF directory entries (tag, type, values) for a contiguous-strip image."""
+    h, w = shape[:2]
+    spp = 1 if len(shape) == 2 else shape[2]
+    row_bytes = w * spp * dtype.itemsize
+    n_strips = -(-h // strip_rows)
+    counts = [min(strip_rows, h - i * strip_rows) * row_bytes for i in range(n_strips)]
+    offsets = [data_offset + i * strip_rows * row_bytes for i in range(n_strips)]
+    off_type = _LONG8 if big else _LONG
+
+    if bilevel:
+        photometric = 3
+    else:
+        photometric = 1 if spp < 3 else 2
+    entries = [
+        (_IMAGE_WIDTH, _LONG, [w]),
+        (_IMAGE_LENGTH, _LONG, [h]),
+        (_BITS_PER_SAMPLE, _SHORT, [dtype.itemsize * 8] * spp),
+        (_COMPRESSION, _SHORT, [1]),
+        (_PHOTOMETRIC, _SHORT, [photometric]),
+        (_STRIP_OFFSETS, off_type, offsets),
+        (_SAMPLES_PER_PIXEL, _SHORT, [spp]),
+        (_ROWS_PER_STRIP, _LONG, [strip_rows]),
+        (_STRIP_BYTE_COUNTS, off_type, counts),
+        (_PLANAR_CONFIG, _SHORT, [1]),
+    ]
+    if bilevel:
+        # 0 -> black, any other index -> white
+        ramp = [0] + [65535] * 255
+        entries.append((_COLOR_MAP, _SHORT, ramp * 3))
+    kind = {"u": 1, "i": 2, "f": 3}[dtype.kind]
+    entries.append((_SAMPLE_FORMAT, _SHORT, [kind] * spp))
+    return entries
+
+
+def _write_tiff_header(
+    f,
+    shape: Tuple[int, ...],
+    dtype: np.dtype,
+    bilevel: bool,
+) -> int:
+    """Write a little-endian TIFF header and directory; return the pixel data offset."""
+    h, w = shape[:2]
+    spp = 1 if len(shape) == 2 else shape[2]
+    row_bytes = w * spp * dtype.itemsize
+    strip_rows = max(1, min(h, _STRIP_BYTES // max(1, row_bytes)))
+    big = h * row_bytes > 0xFFFFFFFF - (1 << 20)
+
+    head_size = 16 if big else 8
+    entry_size, inline = (20, 8) if big else (12, 4)
+
+    # Directory size does not depend on the data offset: lay out once, then fill in
+    entries = _tiff_entries(shape, dtype, bilevel, 0, strip_rows, big)
+    ifd_size = (8 + len(entries) * entry_size + 8) if big else (2 + len(entries) * entry_size + 4)
+    extra = sum(
+        -(-len(vals) * _TIFF_TYPES[typ][1] // 2) * 2
+        for _, typ, vals in entries
+        if len(vals) * _TIFF_TYPES[typ][1] > inline
+    )
+    data_offset = -(-(head_size + ifd_size + extra) // 16) * 16
+    entries = _tiff_entries(shape, dtype, bilevel, data_offset, strip_rows, big)
+
+    ptr = "<Q" if big else "<I"
+    blob = bytearray()
+    blob_base = head_size + ifd_size
+    dir_bytes = bytearray(struct.pack("<Q" if big else "<H", len(entries)))
+    for tag, typ, vals in entries:
+        fmt, size = _TIFF_TYPES[typ]
+        payload = struct.pack(f"<{len(vals)}{fmt}", *vals)
+        if len(payload) <= inline:
+            value = payload.ljust(inline, b"\0")
+        else:
+            value = struct.pack(ptr, blob_base + len(blob))
+            blob += payload
+            if len(blob) % 2:
+                blob += b"\0"
+        head = struct.pack("<HHQ" if big else "<HHI", tag, typ, len(vals))
+        dir_bytes += head + value
+    dir_bytes += struct.pack(ptr, 0)  # no next directory
+
+    if big:
+        f.write(b"II" + struct.pack("<HHHQ", 43, 8, 0, head_size))
+    else:
+        f.write(b"II" + struct.pack("<HI", 42, head_size))
+    f.write(dir_bytes)
+    f.write(blob)
+    f.write(b"\0" * (data_offset - f.tell()))
+    return data_offset
+
+
+def create_image_memmap(
+    path: PathLike,
+    shape: Tuple[int, ...],
+    dtype: Union[np.dtype, type] = np.uint8,
+    *,
+    bilevel: bool = False,
+) -> np.ndarray:
+    """
+    Create an image file and return a writable memory map of its pixels.
+
+    The file is allocated at full size up front (sparse where the filesystem
+    allows); pixels are written by assigning into the returned array. Call
+    ``flush()`` on it (or drop it) when done.
+
+    Parameters
+    ----------
+    path : str | Path
+        Output path; ``.npy``, ``.tif``/``.tiff`` (little-endian, BigTIFF when
+        larger than 4 GiB), or any other suffix for a raw file.
+    shape : tuple
+        (H, W) or (H, W, C).
+    dtype : np.dtype | type, default np.uint8
+        Sample dtype.
+    bilevel : bool, default False
+        TIFF only: write a palette image mapping 0 to black and 1 to white,
+        for the {0,1} uint8 output of the ``*_bw`` functions.
+
+    Returns
+    -------
+    np.ndarray
+        Writable memory-mapped array of `shape`.
+
+    Raises
+    ------
+    ValueError
+        If `shape` is not 2D/3D, or `bilevel` is requested for non-uint8 or
+        multi-channel data.
+    """
+    p = Path(path)
+    dt = np.dtype(dtype)
+    shape = tuple(int(s) for s in shape)
+    if len(shape) not in (2, 3):
+        raise ValueError("shape must be (H, W) or (H, W, C)")
+    if bilevel and (dt != np.uint8 or len(shape) != 2):
+        raise ValueError("bilevel output requires a (H, W) uint8 image")
+
+    suffix = p.suffix.lower()
+    if suffix == ".npy":
+        return np.lib.format.open_memmap(p, mode="w+", dtype=dt, shape=shape)
+    if suffix in _TIFF_SUFFIXES:
+        dt = dt.newbyteorder("<")
+        with open(p, "wb") as f:
+            data_offset = _write_tiff_header(f, shape, dt, bilevel)
+            f.truncate(data_offset + int(np.prod(shape)) * dt.itemsize)
+        return np.memmap(p, dtype=dt, mode="r+", offset=data_offset, shape=shape)
+    return np.memmap(p, dtype=dt, mode="w+", shape=shape)
@@ -3,13 +3,16 @@
 
 Utilities to:
 - Convert arbitrary arrays to uint8 for saving (`to_uint8_image`)
+- Quantize image channels to uint8 with input-range scaling (`quantize_to_uint8`)
+- Resolve an image's input range once for banded/tiled processing (`gray_input_scale`)
 - Normalize/interpret requested output dtype semantics (`process_dtype_arg`)
 - Prepare RGB images as float32 in [0..255] with metadata (`tuple_prepare_img`)
+- Convert RGB rows lazily to float32 [0..255] (`rgb_input_scale`, `prepare_rgb_rows`)
 """
 
 from __future__ import annotations
 
-from typing import Literal, Tuple, Union
+from typing import Literal, Optional, Tuple, Union
 
 import numpy as np
 
@@ -60,6 +63,79 @@ def to_uint8_image(arr: np.ndarray) -> np.ndarray:
     return np.clip(a, 0, 255).astype(np.uint8)
 
 
+def gray_input_scale(img: np.ndarray, band_rows: int = 256) -> float:
+    """
+    Factor mapping an image's values to the [0..255] range, for all its channels.
+
+    The range `to_grayscale` and `quantize_to_uint8` would pick for the whole
+    image: integer inputs scale by ``255 / max(dtype)``; float inputs are
+    [0..1] (factor 255) when their maximum is <= 1.0, else [0..255] (factor
+    1). Passing it to conversions of bands or tiles of the image makes them
+    agree with a conversion of the whole; a band of a float image on the
+    [0..255] scale could otherwise have a maximum <= 1.0 and be stretched.
+    The float maximum is found band by band, so memory-mapped inputs are only
+    streamed, never copied.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Input image (H, W) or (H, W, C), any numeric dtype.
+    band_rows : int, default 256
+        Rows scanned per band when searching the float maximum.
+
+    Returns
+    -------
+    float
+        Scale factor.
+    """
+    dt = img.dtype
+    if np.issubdtype(dt, np.integer):
+        return 255.0 / float(np.iinfo(dt).max)
+    if np.issubdtype(dt, np.floating):
+        vmax = -np.inf
+        if img.size:
+            for y0 in range(0, img.shape[0], band_rows):
+                vmax = max(vmax, float(np.nanmax(img[y0:y0 + band_rows])))
+        return 1.0 if vmax > 1.0 else 255.0
+    return 1.0
+
+
+def quantize_to_uint8(arr: np.ndarray, scale: Optional[float] = None) -> np.ndarray:
+    """
+    Quantize image channels to uint8, scaling by the input range.
+
+    Integer inputs are scaled by ``255 / max(dtype)``; float inputs are taken
+    as [0..1] when their maximum is <= 1.0, else as [0..255]. This matches the
+    normalization used by `to_grayscale`.
+
+    Parameters
+    ----------
+    arr : np.ndarray
+        Input image of any numeric dtype.
+    scale : float | None, default None
+        Float input factor from `gray_input_scale` (e.g. of the full image
+        `arr` is a band of); None derives it from `arr`.
+
+    Returns
+    -------
+    np.ndarray
+        Array of the same shape with dtype uint8 (`arr` itself if already uint8).
+    """
+    a = np.asarray(arr)
+    if a.dtype == np.uint8:
+        return a
+    if np.issubdtype(a.dtype, np.integer):
+        in_max = float(np.iinfo(a.dtype).max)
+        a_f = a.astype(np.float32) * np.float32(255.0 / in_max)
+    else:
+        a_f = a.astype(np.float32)
+        if scale is None:
+            scale = 255.0 if a_f.size and float(np.nanmax(a_f)) <= 1.0 else 1.0
+        if scale != 1.0:
+            a_f *= np.float32(scale)
+    return np.clip(np.rint(a_f), 0, 255).astype(np.uint8)
+
+
 def process_dtype_arg(
     dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type]
 ) -> Tuple[type, bool, Tuple[float, float]]:
@@ -102,6 +178,82 @@ def process_dtype_arg(
     raise TypeError(f"Unsupported dtype: {dtype!r}")
 
 
+def rgb_input_scale(
+    img: np.ndarray,
+    band_rows: int = 256,
+) -> float:
+    """
+    Factor mapping an RGB(A) image's channel values to the [0..255] range.
+
+    Integer inputs scale by ``255 / max(dtype)``; float inputs are taken as
+    [0..1] (factor 255) when their maximum is <= 1.0, else as [0..255]. The
+    float maximum is found band by band, so memory-mapped inputs are only
+    streamed, never copied.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Input image of shape (H, W, 3/4), any numeric dtype.
+    band_rows : int, default 256
+        Rows scanned per band when searching the float maximum.
+
+    Returns
+    -------
+    float
+        Scale factor (1.0 when no scaling is needed).
+    """
+    dt = img.dtype
+    if np.issubdtype(dt, np.integer):
+        return 255.0 / float(np.iinfo(dt).max)
+    if np.issubdtype(dt, np.floating) and img.size:
+        vmax = -np.inf
+        for y0 in range(0, img.shape[0], band_rows):
+            band = img[y0:y0 + band_rows, :, :3]
+            vmax = max(vmax, float(np.nanmax(band)))
+        if vmax <= 1.0:
+            return 255.0
+    return 1.0
+
+
+def prepare_rgb_rows(
+    img: np.ndarray,
+    row_start: int,
+    row_stop: int,
+    scale: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Convert rows ``[row_start, row_stop)`` of an RGB(A) image to float32 [0..255].
+
+    Produces exactly the values `tuple_prepare_img` would for those rows,
+    touching only the requested rows of `img` (which may be a memmap).
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Input image of shape (H, W, 3/4), any numeric dtype.
+    row_start, row_stop : int
+        Row range to convert.
+    scale : float
+        Factor from `rgb_input_scale` for the whole image.
+    out : np.ndarray | None, default None
+        float32 destination of shape (row_stop - row_start, W, 3).
+
+    Returns
+    -------
+    np.ndarray
+        float32 rows (`out` when given), alpha dropped.
+    """
+    rows = img[row_start:row_stop, :, :3]
+    if out is None:
+        out = np.empty(rows.shape, dtype=np.float32)
+    out[...] = rows
+    if scale != 1.0:
+        out *= scale
+    np.clip(out, 0.0, 255.0, out=out)
+    return out
+
+
 def tuple_prepare_img(
     img: np.ndarray,
     dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type],
@@ -135,28 +287,8 @@ def tuple_prepare_img(
     if img.ndim != 3 or img.shape[2] < 3:
         raise ValueError("Input image must be HxWx3 or HxWx4.")
 
-    # Keep RGB, drop alpha if present
-    a = np.asarray(img)[..., :3]
-
-    # Convert to float32 in [0..255]
-    if np.issubdtype(a.dtype, np.integer):
-        in_max = float(np.iinfo(a.dtype).max)
-        a_f = a.astype(np.float32)
-        if in_max != 255.0:
-            a_f *= 255.0 / in_max
-    elif np.issubdtype(a.dtype, np.floating):
-        a_f = a.astype(np.float32)
-        if a_f.size:
-            vmax = float(np.nanmax(a_f))
-            if vmax <= 1.0:
-                a_f *= 255.0
-    else:
-        # Fallback: treat as bytes-like
-        a_f = a.astype(np.float32)
-
-    # Clip and ensure contiguous float32
-    a_f = np.clip(a_f, 0.0, 255.0).astype(np.float32, copy=False)
-    a_f = np.ascontiguousarray(a_f)
+    a = np.asarray(img)
+    a_f = prepare_rgb_rows(a, 0, a.shape[0], rgb_input_scale(a))
 
     # Resolve desired output dtype / range semantics
     out_dtype, is_int_out, out_range = process_dtype_arg(dtype)
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""Content-addressed on-disk cache of dithering results.
+
+A result is keyed by a hash of the input pixels, the function, its canonical
+parameters (defaults filled in, kernel aliases resolved, dtype normalized) and
+the library version. Entries are ``.npy`` files served memory-mapped on a hit;
+the least recently used ones are evicted once the cache exceeds its size
+bound. Several processes may share one cache directory.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .workspace import output_dtype
+
+# Arguments that never change a function's result
+_IGNORED_PARAMS = ("out", "workspace")
+
+# Version of the key layout; part of every key, so entries keyed under an
+# older layout are never served
+_KEY_SCHEMA = 2
+
+# Rows hashed per step, so memmapped inputs are not copied whole
+_HASH_ROWS = 1024
+
+# Puts between full directory scans, which pick up entries written or removed by
+# other processes sharing the cache
+_RESCAN_PUTS = 64
+
+# Share of `max_bytes` a put that crosses the bound evicts down to, so a full
+# cache is not rescanned on every further put
+_EVICT_LOW = 0.9
+
+
+def image_fingerprint(img: np.ndarray) -> str:
+    """
+    Content hash of an array: shape, dtype and pixel bytes.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Any array; may be a memmap or a non-contiguous view.
+
+    Returns
+    -------
+    str
+        Hex digest (40 characters).
+    """
+    arr = np.asarray(img)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{arr.shape}|{arr.dtype.str}|".encode())
+    if arr.ndim == 0 or arr.flags.c_contiguous:
+        h.update(memoryview(np.ascontiguousarray(arr)).cast("B"))
+    else:
+        for y0 in range(0, arr.shape[0], _HASH_ROWS):
+            h.update(memoryview(np.ascontiguousarray(arr[y0:y0 + _HASH_ROWS])).cast("B"))
+    return h.hexdigest()
+
+
+def _canonical(name: str, value: Any) -> Any:
+    """JSON-able canonical form of one parameter; raises TypeError if it has none."""
+    if name in ("kernel_type", "kernel") and isinstance(value, str):
+        # imported here: error_diffusion depends on utils
+        from ..error_diffusion.kernels import resolve_kernel_name
+
+        return resolve_kernel_name(value)
+    if name == "dtype" and value is not None:
+        return np.dtype(output_dtype(value)).str
+    return _canonical_value(value)
+
+
+def _canonical_value(value: Any) -> Any:
+    """Canonical form of a number, string, sequence, mapping, array or dataclass."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, np.integer)):
+        return int(value)  # exact: large seeds must not collide
+    if isinstance(value, (float, np.floating)):
+        # integral floats share an entry with the equal int (128.0 and 128)
+        return int(value) if float(value).is_integer() else float(value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical_value(v) for k, v in sorted(value.items())}
+    if isinstance(value, np.ndarray):
+        return {"ndarray": image_fingerprint(value)}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = {
+            f.name: _canonical_value(getattr(value, f.name)) for f in dataclasses.fields(value)
+        }
+        return {type(value).__qualname__: fields}
+    raise TypeError(f"No canonical form for {type(value).__name__}")
+
+
+class ResultCache:
+    """
+    Size-bounded, content-addressed cache of dithering results on disk.
+
+    Parameters
+    ----------
+    root : str | Path
+        Cache directory (created if missing).
+    max_bytes : int, default 1 GiB
+        Total size of the entries; the least recently used are evicted beyond it.
+    version : str | None, default None
+        Part of every key; defaults to the library version, so upgrading the
+        library invalidates old entries.
+
+    Examples
+    --------
+    >>> cache = ResultCache("~/.cache/dither")
+    >>> out = cache.run(error_diff_bw, img, kernel_type="FS")   # computed, stored
+    >>> out = cache.run(error_diff_bw, img, kernel_type="floyd_steinberg")  # memmapped hit
+    >>> fs = cache.wrap(error_diff_bw)                           # same signature, cached
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        *,
+        max_bytes: int = 1 << 30,
+        version: Optional[str] = None,
+    ) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        if version is None:
+            from .. import __version__ as version
+        self.root = Path(root).expanduser()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.version = str(version)
+        self.hits = 0
+        self.misses = 0
+        # Running total of the entry sizes, resynced by every full scan in `evict`
+        self._nbytes: Optional[int] = None
+        self._puts = 0
+
+    def key(
+        self,
+        fn: Callable[..., np.ndarray],
+        img: np.ndarray,
+        **params: Any,
+    ) -> Optional[str]:
+        """
+        Cache key for ``fn(img, **params)``, or None if the call is not cacheable.
+
+        A call is not cacheable when a parameter has no canonical form, when it
+        draws fresh randomness (``seed=None``), when it resumes state held in
+        a workspace (``resume=True``), or when its result depends on a wall-clock
+        budget (``time_budget`` set).
+
+        Raises
+        ------
+        TypeError
+            If the arguments do not match `fn`'s signature.
+        """
+        bound = inspect.signature(fn).bind(img, **params)
+        bound.apply_defaults()
+        args = dict(bound.arguments)
+        args.pop(next(iter(bound.arguments)))
+        if "seed" in args and args["seed"] is None:
+            return None
+        if args.get("resume") or args.get("time_budget") is not None:
+            return None
+        try:
+            canon = {
+                k: _canonical(k, v) for k, v in sorted(args.items()) if k not in _IGNORED_PARAMS
+            }
+        except TypeError:
+            return None
+        record = {
+            "schema": _KEY_SCHEMA,
+            "fn": f"{fn.__module__}.{fn.__qualname__}",
+            "params": canon,
+            "version": self.version,
+            "img": image_fingerprint(img),
+        }
+        blob = json.dumps(record, sort_keys=True, separators=(",", ":")).encode()
+        return hashlib.blake2b(blob, digest_size=20).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Entry file for `key`, sharded by its first two hex digits."""
+        return self.root / key[:2] / f"{key}.npy"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the entry for `key` memory-mapped read-only, or None."""
+        path = self._path(key)
+        try:
+            arr = np.load(path, mmap_mode="r")
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        return arr
+
+    def put(self, key: str, arr: np.ndarray) -> None:
+        """
+        Store `arr` under `key` (atomically), then evict down to `max_bytes`.
+
+        The cache size is tracked across puts; the directory is only scanned
+        (see `evict`) when the tracked size exceeds `max_bytes`, on the first
+        put, and every few dozen puts to account for other processes. Crossing
+        the bound evicts down to 90% of it.
+        """
+        import tempfile  # only needed on a miss; keeps CLI startup light
+
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(arr), allow_pickle=False)
+                size = f.tell()
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        self._puts += 1
+        if self._nbytes is not None:
+            self._nbytes += size - replaced
+        if self._nbytes is not None and self._nbytes > self.max_bytes:
+            self._evict(int(self.max_bytes * _EVICT_LOW))
+        elif self._nbytes is None or self._puts % _RESCAN_PUTS == 0:
+            self.evict()
+
+    def run(
+        self,
+        fn: Callable[..., np.ndarray],
+        img: np.ndarray,
+        **params: Any,
+    ) -> np.ndarray:
+        """
+        Return ``fn(img, **params)``, from the cache when possible.
+
+        A hit is returned memory-mapped (read-only), or copied into ``out=``
+        when one is passed. Calls that are not cacheable (see `key`) simply run.
+        """
+        key = self.key(fn, img, **params)
+        if key is not None:
+            hit = self.get(key)
+            if hit is not None:
+                self.hits += 1
+                out = params.get("out")
+                if out is None:
+                    return hit
+                np.copyto(out, hit)
+                return out
+            self.misses += 1
+        res = fn(img, **params)
+        if key is not None:
+            self.put(key, res)
+        return res
+
+    def wrap(self, fn: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+        """`fn` with its results served from this cache (see `run`)."""
+
+        @functools.wraps(fn)
+        def cached(img: np.ndarray, **params: Any) -> np.ndarray:
+            return self.run(fn, img, **params)
+
+        return cached
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """(mtime, size, path) of every stored entry."""
+        entries = []
+        for path in self.root.glob("??/*.npy"):
+            try:
+                st = path.stat()
+            except OSError:  # removed by another process
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the stored entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits `max_bytes`; return the count."""
+        return self._evict(self.max_bytes)
+
+    def _evict(self, limit: int) -> int:
+        """Scan the cache and delete least recently used entries until it fits `limit`."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self._nbytes = total
+        return removed
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+        self._nbytes = 0
@@ -0,0 +1,573 @@
+# -*- coding: utf-8 -*-
+"""Frame-sequence readers and streaming animated GIF/APNG writers.
+
+`FrameReader` decodes animations (GIF, APNG, WebP, multi-page TIFF via
+Pillow), videos (via imageio's plugins), ``.npy`` frame stacks (memory-mapped)
+and lists of still images one frame at a time, so only the frames in flight
+are ever in memory.
+
+`GIFWriter` and `APNGWriter` encode indexed frames as they arrive and write
+each one straight to the file. With ``delta=True`` every frame after the first
+is cropped to the bounding box of the pixels that changed, and unchanged
+pixels inside it are written as a transparent index drawn over the previous
+frame. Temporally stable dithering (fixed ordered or blue-noise thresholds)
+leaves static regions bit-identical from frame to frame, so the deltas shrink
+to the moving parts and compress to long runs of one index.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .stream_io import PNG_SIGNATURE, _pack_samples
+
+PathLike = Union[str, Path]
+
+# Black and white: index 0 = black, 1 = white, as the {0, 1} ``*_bw`` output
+BILEVEL_PALETTE: np.ndarray = np.array([[0, 0, 0], [255, 255, 255]], dtype=np.uint8)
+
+# Frame delay when neither the caller nor the source gives one
+_DEFAULT_DURATION_MS = 100
+
+# Largest LZW code in a GIF stream
+_LZW_MAX_CODE = 4095
+
+
+def _to_frame(im) -> np.ndarray:
+    """PIL image -> (H, W) uint8 gray or (H, W, 3) uint8 RGB frame."""
+    if im.mode.startswith("I;16"):
+        return (np.asarray(im) >> 8).astype(np.uint8)
+    if im.mode in ("1", "L", "LA", "I", "F"):
+        return np.asarray(im.convert("L"))
+    return np.asarray(im.convert("RGB"))
+
+
+class FrameReader:
+    """
+    Lazy frame decoder.
+
+    Parameters
+    ----------
+    source : str | Path | sequence of str | Path
+        An animated image (GIF, APNG, WebP, multi-page TIFF), a video file
+        readable by imageio, an ``.npy`` stack (N, H, W[, C]) or a list of
+        still image files, one per frame.
+
+    Attributes
+    ----------
+    n_frames : int | None
+        Number of frames when the container says so, else None.
+    durations : list of int | None
+        Display time in milliseconds of every frame decoded so far (None when
+        the source does not say), filled in as iteration proceeds.
+
+    Raises
+    ------
+    ValueError
+        If an ``.npy`` stack is not (N, H, W) or (N, H, W, C).
+
+    Examples
+    --------
+    >>> with FrameReader("clip.gif") as frames:
+    ...     for i, frame in enumerate(frames):
+    ...         delay = frames.durations[i]
+    """
+
+    def __init__(self, source: Union[PathLike, Sequence[PathLike]]) -> None:
+        self.durations: List[Optional[int]] = []
+        self._im = None
+        self._stack = None
+        self._files: Optional[List[Path]] = None
+        self._path: Optional[Path] = None
+        if isinstance(source, (str, Path)):
+            self._path = Path(source)
+        else:
+            self._files = [Path(p) for p in source]
+
+        if self._files is not None:
+            self.n_frames: Optional[int] = len(self._files)
+        elif self._path.suffix.lower() == ".npy":
+            self._stack = np.load(self._path, mmap_mode="r")
+            if self._stack.ndim not in (3, 4):
+                raise ValueError(f"{self._path}: frame stack must be (N, H, W) or (N, H, W, C)")
+            self.n_frames = self._stack.shape[0]
+        else:
+            from PIL import Image, UnidentifiedImageError
+
+            try:
+                self._im = Image.open(self._path)
+                self.n_frames = getattr(self._im, "n_frames", 1)
+            except UnidentifiedImageError:
+                self.n_frames = None  # a video; decoded by imageio
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Decode frames one at a time as (H, W) gray or (H, W, 3) RGB uint8 arrays."""
+        if self._files is not None:
+            from PIL import Image
+
+            for path in self._files:
+                with Image.open(path) as im:
+                    frame = _to_frame(im)
+                self.durations.append(None)
+                yield frame
+        elif self._stack is not None:
+            for i in range(self._stack.shape[0]):
+                self.durations.append(None)
+                yield self._stack[i]
+        elif self._im is not None:
+            for i in range(self.n_frames):
+                self._im.seek(i)
+                duration = self._im.info.get("duration")
+                self.durations.append(int(duration) if duration else None)
+                yield _to_frame(self._im)
+        else:
+            import imageio.v3 as iio
+
+            meta = iio.immeta(self._path)
+            fps = meta.get("fps")
+            duration = int(round(1000.0 / fps)) if fps else None
+            for frame in iio.imiter(self._path):
+                self.durations.append(duration)
+                frame = np.asarray(frame)
+                yield frame[..., :3] if frame.ndim == 3 else frame
+
+    def close(self) -> None:
+        """Release the underlying file."""
+        if self._im is not None:
+            self._im.close()
+            self._im = None
+        self._stack = None
+
+    def __enter__(self) -> "FrameReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _lzw_encode(data: bytes, min_code_size: int) -> bytes:
+    """GIF variable-length LZW code stream (LSB-first) of index bytes, without sub-blocks."""
+    clear = 1 << min_code_size
+    eoi = clear + 1
+    out = bytearray()
+    acc, nbits = clear, min_code_size + 1
+    size = min_code_size + 1
+    table: dict = {}
+    nxt = eoi + 1
+
+    it = iter(data)
+    prefix = next(it)
+    for c in it:
+        key = (prefix << 8) | c
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        acc |= prefix << nbits
+        nbits += size
+        while nbits >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            nbits -= 8
+        if nxt <= _LZW_MAX_CODE:
+            # The decoder widens its codes once its table reaches 2**size entries
+            if nxt == 1 << size:
+                size += 1
+            table[key] = nxt
+            nxt += 1
+        else:
+            acc |= clear << nbits
+            nbits += size
+            table.clear()
+            size = min_code_size + 1
+            nxt = eoi + 1
+        prefix = c
+
+    acc |= prefix << nbits
+    nbits += size
+    if nxt == 1 << size and size < 12:
+        size += 1
+    acc |= eoi << nbits
+    nbits += size
+    while nbits > 0:
+        out.append(acc & 0xFF)
+        acc >>= 8
+        nbits -= 8
+    return bytes(out)
+
+
+def _sub_blocks(data: bytes) -> bytes:
+    """Split `data` into GIF data sub-blocks (<= 255 bytes each) plus the terminator."""
+    parts = bytearray()
+    for i in range(0, len(data), 255):
+        block = data[i:i + 255]
+        parts.append(len(block))
+        parts += block
+    parts.append(0)
+    return bytes(parts)
+
+
+class _AnimationWriter(ABC):
+    """Palette checks, delta cropping and file handling shared by the GIF and APNG writers."""
+
+    def __init__(
+        self,
+        path: Union[PathLike, BinaryIO],
+        width: int,
+        height: int,
+        palette: Optional[np.ndarray],
+        delta: bool,
+    ) -> None:
+        if width < 1 or height < 1:
+            raise ValueError("width and height must be >= 1")
+        if width > 0xFFFF or height > 0xFFFF:
+            raise ValueError("width and height must be <= 65535")
+        pal = BILEVEL_PALETTE if palette is None else np.asarray(palette, dtype=np.uint8)
+        if pal.ndim != 2 or pal.shape[1] != 3 or not 1 <= pal.shape[0] <= 256:
+            raise ValueError("palette must be (K, 3) with 1 <= K <= 256")
+        self.width, self.height = width, height
+        self.palette = pal
+        self.delta = delta
+        # An index past the palette marks unchanged pixels of delta frames, when one is free
+        self.transparent: Optional[int] = pal.shape[0] if delta and pal.shape[0] < 256 else None
+        self.frames_written = 0
+        self._prev: Optional[np.ndarray] = None
+        self._own = not hasattr(path, "write")
+        self._f: BinaryIO = open(path, "wb") if self._own else path  # type: ignore[arg-type]
+
+    def _region(self, indices: np.ndarray) -> Tuple[int, int, np.ndarray, bool]:
+        """
+        Validate a frame and return (y, x, pixels, blend) to encode.
+
+        The first frame, and every frame without `delta`, is encoded whole.
+        Later frames are cropped to the changed pixels' bounding box (one
+        pixel when nothing changed); `blend` is True when unchanged pixels
+        inside it hold the transparent index.
+        """
+        a = np.asarray(indices)
+        if a.shape != (self.height, self.width):
+            raise ValueError(f"frame must be ({self.height}, {self.width}) palette indices")
+        if a.dtype != np.uint8:
+            a = a.astype(np.uint8)
+        if a.size and int(a.max()) >= self.palette.shape[0]:
+            raise ValueError(f"frame indices must be < {self.palette.shape[0]}")
+
+        prev, self._prev = self._prev, a.copy()
+        if prev is None or not self.delta:
+            return 0, 0, a, False
+        changed = a != prev
+        rows, cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+        if rows.size == 0:
+            y0, y1, x0, x1 = 0, 1, 0, 1
+        else:
+            y0, y1, x0, x1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+        crop = a[y0:y1, x0:x1]
+        if self.transparent is None:
+            return int(y0), int(x0), crop, False
+        crop = np.where(changed[y0:y1, x0:x1], crop, np.uint8(self.transparent))
+        return int(y0), int(x0), crop, True
+
+    def _finish(self) -> None:
+        if self._own:
+            self._f.close()
+        self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._own and self._f is not None:
+            self._f.close()
+
+    @abstractmethod
+    def write_frame(self, indices: np.ndarray, duration_ms: Optional[int] = None) -> None:
+        """Encode the next frame of palette indices."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finish the file (trailer, frame count) and release it."""
+
+
+class GIFWriter(_AnimationWriter):
+    """
+    Streaming animated GIF encoder.
+
+    Parameters
+    ----------
+    path : str | Path | BinaryIO
+        Destination file or binary stream.
+    width, height : int
+        Frame size (<= 65535).
+    palette : np.ndarray | None, default None
+        (K, 3) uint8 global color table, K <= 256; black and white by default,
+        so the {0, 1} ``*_bw`` output can be written as is.
+    loop : int | None, default 0
+        Repetitions (0 = forever); None plays once without a loop extension.
+    delta : bool, default True
+        Crop frames after the first to the changed region, with unchanged
+        pixels transparent (needs K < 256 for the transparent index).
+
+    Raises
+    ------
+    ValueError
+        If the size or palette is invalid.
+    """
+
+    def __init__(
+        self,
+        path: Union[PathLike, BinaryIO],
+        width: int,
+        height: int,
+        *,
+        palette: Optional[np.ndarray] = None,
+        loop: Optional[int] = 0,
+        delta: bool = True,
+    ) -> None:
+        super().__init__(path, width, height, palette, delta)
+        colors = self.palette.shape[0] + (self.transparent is not None)
+        self._bits = max(1, int(np.ceil(np.log2(colors))))
+        table = np.zeros((1 << self._bits, 3), dtype=np.uint8)
+        table[:self.palette.shape[0]] = self.palette
+
+        self._f.write(b"GIF89a")
+        self._f.write(struct.pack("<HHBBB", width, height, 0xF0 | (self._bits - 1), 0, 0))
+        self._f.write(table.tobytes())
+        if loop is not None:
+            self._f.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00")
+
+    def write_frame(self, indices: np.ndarray, duration_ms: Optional[int] = None) -> None:
+        """
+        Encode the next frame.
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            (height, width) palette indices.
+        duration_ms : int | None, default None
+            Display time, stored in 10 ms units; None uses 100 ms.
+
+        Raises
+        ------
+        ValueError
+            If the frame has the wrong shape or indices outside the palette.
+        """
+        y, x, pixels, blend = self._region(indices)
+        delay = _DEFAULT_DURATION_MS if duration_ms is None else duration_ms
+        flags = (1 << 2) | int(blend)  # disposal 1: keep the frame under the next one
+        transparent = self.transparent if blend else 0
+        self._f.write(
+            struct.pack("<BBBBHBB", 0x21, 0xF9, 4, flags, int(round(delay / 10)), transparent, 0)
+        )
+        h, w = pixels.shape
+        self._f.write(struct.pack("<BHHHHB", 0x2C, x, y, w, h, 0))
+        min_code_size = max(2, self._bits)
+        self._f.write(bytes([min_code_size]))
+        self._f.write(_sub_blocks(_lzw_encode(pixels.tobytes(), min_code_size)))
+        self.frames_written += 1
+
+    def close(self) -> None:
+        """
+        Write the trailer.
+
+        Raises
+        ------
+        ValueError
+            If no frame was written.
+        """
+        if self._f is None:
+            return
+        if self.frames_written == 0:
+            raise ValueError("no frames written")
+        self._f.write(b"\x3b")
+        self._finish()
+
+
+class APNGWriter(_AnimationWriter):
+    """
+    Streaming animated PNG encoder (indexed color).
+
+    The frame count is stored in the header; when `n_frames` is not given it
+    is patched on `close`, which then needs a seekable destination.
+
+    Parameters
+    ----------
+    path : str | Path | BinaryIO
+        Destination file or binary stream.
+    width, height : int
+        Frame size.
+    palette : np.ndarray | None, default None
+        (K, 3) uint8 palette, K <= 256; black and white by default. Indices
+        are stored with the smallest bit depth (1, 2, 4 or 8) that holds the
+        palette and the transparent index.
+    loop : int, default 0
+        Repetitions (0 = forever).
+    delta : bool, default True
+        Crop frames after the first to the changed region, with unchanged
+        pixels transparent and blended over the previous frame.
+    n_frames : int | None, default None
+        Number of frames that will be written, if known.
+    compress_level : int, default 6
+        zlib level 0..9.
+
+    Raises
+    ------
+    ValueError
+        If the size or palette is invalid.
+    """
+
+    def __init__(
+        self,
+        path: Union[PathLike, BinaryIO],
+        width: int,
+        height: int,
+        *,
+        palette: Optional[np.ndarray] = None,
+        loop: int = 0,
+        delta: bool = True,
+        n_frames: Optional[int] = None,
+        compress_level: int = 6,
+    ) -> None:
+        super().__init__(path, width, height, palette, delta)
+        colors = self.palette.shape[0] + (self.transparent is not None)
+        self.bit_depth = next(b for b in (1, 2, 4, 8) if colors <= 1 << b)
+        self.n_frames = n_frames
+        self.compress_level = compress_level
+        self._loop = loop
+        self._seq = 0
+
+        self._f.write(PNG_SIGNATURE)
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, self.bit_depth, 3, 0, 0, 0))
+        self._chunk(b"PLTE", self.palette.tobytes())
+        if self.transparent is not None:
+            self._chunk(b"tRNS", b"\xff" * self.palette.shape[0] + b"\x00")
+        self._actl_pos = self._f.tell() if n_frames is None else None
+        self._chunk(b"acTL", struct.pack(">II", n_frames or 0, loop))
+
+    def _chunk(self, tag: bytes, data: bytes) -> None:
+        self._f.write(struct.pack(">I", len(data)) + tag + data)
+        self._f.write(struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    def write_frame(self, indices: np.ndarray, duration_ms: Optional[int] = None) -> None:
+        """
+        Encode the next frame.
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            (height, width) palette indices.
+        duration_ms : int | None, default None
+            Display time in milliseconds; None uses 100 ms.
+
+        Raises
+        ------
+        ValueError
+            If the frame has the wrong shape, indices outside the palette, or
+            more than `n_frames` frames are written.
+        """
+        if self.n_frames is not None and self.frames_written >= self.n_frames:
+            raise ValueError(f"more than the declared {self.n_frames} frames")
+        y, x, pixels, blend = self._region(indices)
+        delay = _DEFAULT_DURATION_MS if duration_ms is None else duration_ms
+        h, w = pixels.shape
+        # dispose_op 0 (keep), blend_op 1 (over) for transparent deltas, else 0 (source)
+        fctl = struct.pack(">IIIIIHHBB", self._seq, w, h, x, y, delay, 1000, 0, int(blend))
+        self._chunk(b"fcTL", fctl)
+        self._seq += 1
+
+        raw = pixels if self.bit_depth == 8 else _pack_samples(pixels, self.bit_depth)
+        lines = np.zeros((h, raw.shape[1] + 1), dtype=np.uint8)  # filter type 0 per row
+        lines[:, 1:] = raw
+        data = zlib.compress(lines.tobytes(), self.compress_level)
+        if self.frames_written == 0:
+            self._chunk(b"IDAT", data)
+        else:
+            self._chunk(b"fdAT", struct.pack(">I", self._seq) + data)
+            self._seq += 1
+        self.frames_written += 1
+
+    def close(self) -> None:
+        """
+        Write the trailer, patching the frame count into the header if needed.
+
+        Raises
+        ------
+        ValueError
+            If no frame was written, fewer than `n_frames` were, or the count
+            must be patched into a stream that cannot seek.
+        """
+        if self._f is None:
+            return
+        if self.frames_written == 0:
+            raise ValueError("no frames written")
+        if self.n_frames is not None and self.frames_written != self.n_frames:
+            raise ValueError(f"wrote {self.frames_written} of {self.n_frames} frames")
+        self._chunk(b"IEND", b"")
+        if self._actl_pos is not None:
+            if not self._f.seekable():
+                raise ValueError("frame count unknown and the stream cannot seek; pass n_frames")
+            end = self._f.tell()
+            self._f.seek(self._actl_pos)
+            self._chunk(b"acTL", struct.pack(">II", self.frames_written, self._loop))
+            self._f.seek(end)
+        self._finish()
+
+
+def open_frame_writer(
+    path: PathLike,
+    width: int,
+    height: int,
+    *,
+    palette: Optional[np.ndarray] = None,
+    loop: int = 0,
+    delta: bool = True,
+    n_frames: Optional[int] = None,
+    compress_level: int = 6,
+) -> Union[GIFWriter, APNGWriter]:
+    """
+    Open an animated GIF or APNG file (by suffix) for frame-by-frame writing.
+
+    Parameters
+    ----------
+    path : str | Path
+        ``.gif``, or ``.png``/``.apng``.
+    width, height : int
+        Frame size.
+    palette : np.ndarray | None, default None
+        (K, 3) uint8 palette; black and white (1-bit) by default.
+    loop : int, default 0
+        Repetitions (0 = forever).
+    delta : bool, default True
+        Store later frames as transparent deltas over the previous one.
+    n_frames : int | None, default None
+        Number of frames, if known (APNG only).
+    compress_level : int, default 6
+        zlib level (APNG only).
+
+    Raises
+    ------
+    ValueError
+        If the suffix is unsupported.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".gif":
+        return GIFWriter(path, width, height, palette=palette, loop=loop, delta=delta)
+    if suffix in (".png", ".apng"):
+        return APNGWriter(
+            path,
+            width,
+            height,
+            palette=palette,
+            loop=loop,
+            delta=delta,
+            n_frames=n_frames,
+            compress_level=compress_level,
+        )
+    raise ValueError(f"{path}: animated output must be .gif, .png or .apng")
@@ -0,0 +1,665 @@
+# -*- coding: utf-8 -*-
+"""Row-streaming PNG and binary PBM/PGM/PPM readers and writers.
+
+Readers decode an image band by band (`read_rows`), writers encode bands as
+they arrive (`write_rows`); neither ever holds the whole image or the whole
+compressed file. Together with the ``band_rows``/``origin``/``resume`` options
+of the dithering functions this gives file -> dither -> file pipelines with
+constant memory (see `app.stream_task`).
+
+Supported formats:
+
+- PNG: non-interlaced, gray/RGB/palette/gray+alpha/RGBA, 1/2/4/8/16-bit.
+  IDAT data is streamed through zlib in both directions. Rows are returned
+  as `skimage.io.imread` would: low bit-depth gray is scaled to 8 bits,
+  palette images are expanded to RGB.
+- PNM: binary P4 (PBM), P5 (PGM) and P6 (PPM).
+
+Writers take samples as stored: 1-bit PNG/PBM writers expect {0, 1} with
+1 = white (the ``*_bw`` output), other depths take values in [0, 2**bits - 1].
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+PathLike = Union[str, Path]
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color type -> samples per pixel
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# Compressed bytes buffered before an IDAT chunk is emitted
+_IDAT_BYTES = 1 << 16
+
+_PNM_SUFFIXES = (".pbm", ".pgm", ".ppm", ".pnm")
+
+
+def _pack_samples(rows: np.ndarray, bits: int) -> np.ndarray:
+    """Pack (n, samples) values of `bits` < 8 into (n, ceil(samples * bits / 8)) bytes."""
+    if bits == 1:
+        return np.packbits(rows.astype(bool), axis=1)
+    per_byte = 8 // bits
+    n, m = rows.shape
+    padded = np.zeros((n, -(-m // per_byte) * per_byte), dtype=np.uint8)
+    padded[:, :m] = rows
+    shifts = (8 - bits * (np.arange(per_byte) + 1)).astype(np.uint8)
+    groups = padded.reshape(n, -1, per_byte) << shifts
+    return np.bitwise_or.reduce(groups, axis=2)
+
+
+def _unpack_samples(packed: np.ndarray, bits: int, count: int) -> np.ndarray:
+    """Unpack (n, nbytes) bytes into (n, count) samples of `bits` < 8."""
+    if bits == 1:
+        return np.unpackbits(packed, axis=1, count=count)
+    per_byte = 8 // bits
+    shifts = (8 - bits * (np.arange(per_byte) + 1)).astype(np.uint8)
+    mask = np.uint8((1 << bits) - 1)
+    vals = (packed[:, :, None] >> shifts) & mask
+    return vals.reshape(packed.shape[0], -1)[:, :count]
+
+
+def _filter_rows(raw: np.ndarray, prev: np.ndarray, bpp: int, filter_type: int) -> np.ndarray:
+    """Apply one PNG filter type to (n, nbytes) rows; `prev` is the row above the first."""
+    above = np.vstack((prev[None, :], raw[:-1])).astype(np.int16)
+    cur = raw.astype(np.int16)
+    left = np.zeros_like(cur)
+    left[:, bpp:] = cur[:, :-bpp]
+    if filter_type == 0:
+        pred = np.zeros_like(cur)
+    elif filter_type == 1:
+        pred = left
+    elif filter_type == 2:
+        pred = above
+    elif filter_type == 3:
+        pred = (left + above) >> 1
+    else:
+        upper_left = np.zeros_like(cur)
+        upper_left[:, bpp:] = above[:, :-bpp]
+        p = left + above - upper_left
+        pa, pb, pc = np.abs(p - left), np.abs(p - above), np.abs(p - upper_left)
+        pred = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, above, upper_left))
+    return ((cur - pred) & 0xFF).astype(np.uint8)
+
+
+def _unfilter_row(line: np.ndarray, prev: np.ndarray, bpp: int, filter_type: int) -> np.ndarray:
+    """Reconstruct one PNG scanline from its filtered bytes and the row above."""
+    if filter_type == 0:
+        return line
+    if filter_type == 1:
+        lanes = np.zeros(-(-line.size // bpp) * bpp, dtype=np.uint8)
+        lanes[:line.size] = line
+        return np.cumsum(lanes.reshape(-1, bpp), axis=0, dtype=np.uint8).ravel()[:line.size]
+    if filter_type == 2:
+        return line + prev
+    if filter_type not in (3, 4):
+        raise ValueError(f"invalid PNG filter type {filter_type}")
+
+    # Average/Paeth depend on the reconstructed left neighbour: scalar loop
+    out = bytearray(line.tobytes())
+    up = prev.tobytes()
+    for i in range(len(out)):
+        a = out[i - bpp] if i >= bpp else 0
+        b = up[i]
+        if filter_type == 3:
+            out[i] = (out[i] + ((a + b) >> 1)) & 0xFF
+        else:
+            c = up[i - bpp] if i >= bpp else 0
+            p = a + b - c
+            pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+            pred = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+            out[i] = (out[i] + pred) & 0xFF
+    return np.frombuffer(bytes(out), dtype=np.uint8)
+
+
+class PNGWriter:
+    """
+    Streaming PNG encoder.
+
+    Parameters
+    ----------
+    path : str | Path | BinaryIO
+        Destination file or binary stream.
+    width, height : int
+        Image size.
+    channels : {1, 2, 3, 4}, default 1
+        Gray, gray+alpha, RGB, RGBA (or palette indices with `palette`).
+    bit_depth : {1, 2, 4, 8, 16}, default 8
+        Bits per sample; 1/2/4 only for gray or palette images.
+    palette : np.ndarray | None, default None
+        (K, 3) uint8 palette (K <= 2**bit_depth); rows then hold indices.
+    compress_level : int, default 6
+        zlib level 0..9.
+    filter_type : {0, 1, 2, 3, 4}, default 0
+        PNG filter applied to every row (None, Sub, Up, Average, Paeth).
+
+    Raises
+    ------
+    ValueError
+        If the size, depth or palette combination is invalid.
+    """
+
+    def __init__(
+        self,
+        path: Union[PathLike, BinaryIO],
+        width: int,
+        height: int,
+        *,
+        channels: int = 1,
+        bit_depth: int = 8,
+        palette: Optional[np.ndarray] = None,
+        compress_level: int = 6,
+        filter_type: int = 0,
+    ) -> None:
+        if width < 1 or height < 1:
+            raise ValueError("width and height must be >= 1")
+        if bit_depth not in (1, 2, 4, 8, 16):
+            raise ValueError("bit_depth must be 1, 2, 4, 8 or 16")
+        if palette is not None:
+            pal = np.asarray(palette, dtype=np.uint8)
+            max_colors = min(256, 1 << bit_depth)
+            if pal.ndim != 2 or pal.shape[1] != 3 or not 1 <= pal.shape[0] <= max_colors:
+                raise ValueError("palette must be (K, 3) with K <= 2**bit_depth (max 256)")
+            if channels != 1 or bit_depth == 16:
+                raise ValueError("palette images have 1 channel of at most 8 bits")
+            color_type = 3
+        else:
+            pal = None
+            color_type = {1: 0, 2: 4, 3: 2, 4: 6}.get(channels)
+            if color_type is None:
+                raise ValueError("channels must be 1, 2, 3 or 4")
+            if bit_depth < 8 and channels != 1:
+                raise ValueError("bit depths below 8 require a single channel")
+        if filter_type not in (0, 1, 2, 3, 4):
+            raise ValueError("filter_type must be in 0..4")
+
+        self.width, self.height, self.channels = width, height, channels
+        self.bit_depth, self.filter_type = bit_depth, filter_type
+        self.rows_written = 0
+        self._bpp = max(1, channels * bit_depth // 8)
+        self._row_bytes = -(-width * channels * bit_depth // 8)
+        self._prev = np.zeros(self._row_bytes, dtype=np.uint8)
+        self._z = zlib.compressobj(compress_level)
+        self._pending = bytearray()
+
+        self._own = not hasattr(path, "write")
+        self._f: BinaryIO = open(path, "wb") if self._own else path  # type: ignore[arg-type]
+        self._f.write(PNG_SIGNATURE)
+        ihdr = struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)
+        self._chunk(b"IHDR", ihdr)
+        if pal is not None:
+            self._chunk(b"PLTE", pal.tobytes())
+
+    def _chunk(self, tag: bytes, data: bytes) -> None:
+        self._f.write(struct.pack(">I", len(data)) + tag + data)
+        self._f.write(struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        """
+        Encode the next rows: (n, W) or (n, W, channels) samples.
+
+        Raises
+        ------
+        ValueError
+            If the rows have the wrong width/channels or overflow the height.
+        """
+        a = np.asarray(rows)
+        if a.ndim == 2 and self.channels == 1:
+            a = a[:, :, None]
+        if a.ndim != 3 or a.shape[1:] != (self.width, self.channels):
+            raise ValueError(f"rows must be (n, {self.width}, {self.channels})")
+        n = a.shape[0]
+        if self.rows_written + n > self.height:
+            raise ValueError("more rows than the image height")
+
+        flat = a.reshape(n, -1)
+        if self.bit_depth == 16:
+            raw = flat.astype(">u2").view(np.uint8).reshape(n, -1)
+        elif self.bit_depth == 8:
+            raw = flat.astype(np.uint8, copy=False)
+        else:
+            raw = _pack_samples(flat.astype(np.uint8, copy=False), self.bit_depth)
+
+        filtered = _filter_rows(raw, self._prev, self._bpp, self.filter_type)
+        self._prev = raw[-1].copy()
+        lines = np.empty((n, self._row_bytes + 1), dtype=np.uint8)
+        lines[:, 0] = self.filter_type
+        lines[:, 1:] = filtered
+
+        self._pending += self._z.compress(lines.tobytes())
+        if len(self._pending) >= _IDAT_BYTES:
+            self._chunk(b"IDAT", bytes(self._pending))
+            self._pending.clear()
+        self.rows_written += n
+
+    def close(self) -> None:
+        """
+        Flush the compressed stream and write the trailer.
+
+        Raises
+        ------
+        ValueError
+            If fewer rows than the image height were written.
+        """
+        if self._f is None:
+            return
+        if self.rows_written != self.height:
+            raise ValueError(f"wrote {self.rows_written} of {self.height} rows")
+        self._pending += self._z.flush()
+        self._chunk(b"IDAT", bytes(self._pending))
+        self._chunk(b"IEND", b"")
+        if self._own:
+            self._f.close()
+        self._f = None
+
+    def __enter__(self) -> "PNGWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._own and self._f is not None:
+            self._f.close()
+
+
+class PNGReader:
+    """
+    Streaming PNG decoder (non-interlaced).
+
+    Attributes
+    ----------
+    shape : tuple
+        (H, W) or (H, W, C) of the decoded image.
+    dtype : np.dtype
+        uint8, or uint16 for 16-bit files.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a PNG, is interlaced, or is truncated.
+    """
+
+    def __init__(self, path: Union[PathLike, BinaryIO]) -> None:
+        self._own = not hasattr(path, "read")
+        self._f: BinaryIO = open(path, "rb") if self._own else path  # type: ignore[arg-type]
+        if self._f.read(8) != PNG_SIGNATURE:
+            raise ValueError("not a PNG file")
+
+        tag, data = self._next_chunk()
+        if tag != b"IHDR":
+            raise ValueError("PNG does not start with IHDR")
+        w, h, bits, color_type, _, _, interlace = struct.unpack(">IIBBBBB", data)
+        if interlace:
+            raise ValueError("interlaced PNG files cannot be streamed")
+        if color_type not in _PNG_CHANNELS:
+            raise ValueError(f"invalid PNG color type {color_type}")
+        self.width, self.height, self.bit_depth, self.color_type = w, h, bits, color_type
+
+        self.palette: Optional[np.ndarray] = None
+        self._idat = b""
+        while True:
+            tag, data = self._next_chunk()
+            if tag == b"PLTE":
+                self.palette = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+            elif tag == b"IDAT":
+                self._idat = data
+                break
+            elif tag == b"IEND":
+                raise ValueError("PNG has no image data")
+        if color_type == 3 and self.palette is None:
+            raise ValueError("palette PNG without PLTE chunk")
+
+        samples = _PNG_CHANNELS[color_type]
+        self._samples = w * samples
+        self._bpp = max(1, samples * bits // 8)
+        self._row_bytes = -(-w * samples * bits // 8)
+        self._prev = np.zeros(self._row_bytes, dtype=np.uint8)
+        self._z = zlib.decompressobj()
+        self._buf = bytearray()
+        self.rows_read = 0
+
+        out_channels = 3 if color_type == 3 else samples
+        self.shape: Tuple[int, ...] = (h, w) if out_channels == 1 else (h, w, out_channels)
+        self.dtype = np.dtype(np.uint16 if bits == 16 else np.uint8)
+
+    def _next_chunk(self) -> Tuple[bytes, bytes]:
+        head = self._f.read(8)
+        if len(head) < 8:
+            raise ValueError("truncated PNG file")
+        length, tag = struct.unpack(">I4s", head)
+        data = self._f.read(length)
+        self._f.read(4)  # CRC
+        return tag, data
+
+    def _fill(self, nbytes: int) -> None:
+        """Decompress until `nbytes` are buffered (or the image data ends)."""
+        while len(self._buf) < nbytes:
+            if self._idat:
+                # Bounded inflate: highly compressible data expands far beyond one band
+                want = max(nbytes - len(self._buf), 1 << 16)
+                self._buf += self._z.decompress(self._idat, want)
+                self._idat = self._z.unconsumed_tail
+                continue
+            tag, data = self._next_chunk()
+            if tag == b"IDAT":
+                self._idat = data
+            elif tag == b"IEND":
+                self._buf += self._z.flush()
+                break
+
+    def read_rows(self, n: int) -> np.ndarray:
+        """Decode up to `n` further rows; returns (k, W[, C]) with k <= n (0 at the end)."""
+        n = max(0, min(n, self.height - self.rows_read))
+        stride = self._row_bytes + 1
+        self._fill(n * stride)
+        if len(self._buf) < n * stride:
+            raise ValueError("truncated PNG image data")
+
+        raw = np.empty((n, self._row_bytes), dtype=np.uint8)
+        lines = np.frombuffer(bytes(self._buf[:n * stride]), dtype=np.uint8).reshape(n, stride)
+        del self._buf[:n * stride]
+        prev = self._prev
+        for i in range(n):
+            prev = raw[i] = _unfilter_row(lines[i, 1:], prev, self._bpp, int(lines[i, 0]))
+        if n:
+            self._prev = raw[-1].copy()
+        self.rows_read += n
+
+        bits = self.bit_depth
+        if bits == 16:
+            vals = raw.view(">u2").astype(np.uint16)
+        elif bits == 8:
+            vals = raw
+        else:
+            vals = _unpack_samples(raw, bits, self._samples)
+            if self.color_type == 0:
+                vals = vals * np.uint8(255 // ((1 << bits) - 1))
+
+        if self.color_type == 3:
+            return self.palette[np.minimum(vals, len(self.palette) - 1)].reshape(n, self.width, 3)
+        return vals.reshape((n,) + self.shape[1:])
+
+    def iter_bands(self, band_rows: int) -> Iterator[np.ndarray]:
+        """Yield successive bands of up to `band_rows` rows."""
+        while self.rows_read < self.height:
+            yield self.read_rows(band_rows)
+
+    def close(self) -> None:
+        """Close the underlying file (if opened by the reader)."""
+        if self._own:
+            self._f.close()
+
+    def __enter__(self) -> "PNGReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _pnm_header(f: BinaryIO) -> Tuple[str, int, int, int]:
+    """Parse a binary PNM header: (magic, width, height, maxval)."""
+    magic = f.read(2).decode("ascii", "replace")
+    if magic not in ("P4", "P5", "P6"):
+        raise ValueError(f"unsupported PNM type {magic!r} (binary P4/P5/P6 only)")
+    tokens = []
+    needed = 2 if magic == "P4" else 3
+    c = f.read(1)
+    while len(tokens) < needed:
+        if not c:
+            raise ValueError("truncated PNM header")
+        if c == b"#":
+            while c not in (b"\n", b"\r", b""):
+                c = f.read(1)
+        elif c.isspace():
+            c = f.read(1)
+        else:
+            tok = b""
+            while c and not c.isspace() and c != b"#":
+                tok += c
+                c = f.read(1)
+            tokens.append(int(tok))
+    # exactly one whitespace byte (already consumed in `c`) precedes the raster
+    maxval = 1 if magic == "P4" else tokens[2]
+    return magic, tokens[0], tokens[1], maxval
+
+
+class PNMReader:
+    """
+    Streaming binary PBM/PGM/PPM decoder.
+
+    PBM rows decode to uint8 gray {0, 255} (white = 255); PGM/PPM samples are
+    returned unscaled (uint16 when maxval > 255).
+
+    Attributes
+    ----------
+    shape : tuple
+        (H, W) or (H, W, 3).
+    dtype : np.dtype
+        uint8 or uint16.
+    """
+
+    def __init__(self, path: Union[PathLike, BinaryIO]) -> None:
+        self._own = not hasattr(path, "read")
+        self._f: BinaryIO = open(path, "rb") if self._own else path  # type: ignore[arg-type]
+        self.magic, self.width, self.height, self.maxval = _pnm_header(self._f)
+        channels = 3 if self.magic == "P6" else 1
+        self.shape: Tuple[int, ...] = (
+            (self.height, self.width) if channels == 1 else (self.height, self.width, 3)
+        )
+        self.dtype = np.dtype(np.uint16 if self.maxval > 255 else np.uint8)
+        if self.magic == "P4":
+            self._row_bytes = -(-self.width // 8)
+        else:
+            self._row_bytes = self.width * channels * self.dtype.itemsize
+        self.rows_read = 0
+
+    def read_rows(self, n: int) -> np.ndarray:
+        """Decode up to `n` further rows; returns (k, W[, 3]) with k <= n (0 at the end)."""
+        n = max(0, min(n, self.height - self.rows_read))
+        data = self._f.read(n * self._row_bytes)
+        if len(data) < n * self._row_bytes:
+            raise ValueError("truncated PNM image data")
+        self.rows_read += n
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(n, self._row_bytes)
+        if self.magic == "P4":
+            bits = np.unpackbits(raw, axis=1, count=self.width)
+            return (1 - bits) * np.uint8(255)
+        vals = raw.view(">u2").astype(np.uint16) if self.maxval > 255 else raw
+        return vals.reshape((n,) + self.shape[1:])
+
+    def iter_bands(self, band_rows: int) -> Iterator[np.ndarray]:
+        """Yield successive bands of up to `band_rows` rows."""
+        while self.rows_read < self.height:
+            yield self.read_rows(band_rows)
+
+    def close(self) -> None:
+        """Close the underlying file (if opened by the reader)."""
+        if self._own:
+            self._f.close()
+
+    def __enter__(self) -> "PNMReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class PNMWriter:
+    """
+    Streaming binary PBM/PGM/PPM encoder.
+
+    Parameters
+    ----------
+    path : str | Path | BinaryIO
+        Destination file or binary stream.
+    width, height : int
+        Image size.
+    kind : {"pbm", "pgm", "ppm"}, default "pgm"
+        P4 rows take {0, 1} with 1 = white (stored inverted, as PBM uses 1 = black);
+        P5/P6 rows take samples in [0, maxval].
+    maxval : int, default 255
+        Maximum sample value for PGM/PPM (<= 65535).
+
+    Raises
+    ------
+    ValueError
+        If `kind` or `maxval` is invalid.
+    """
+
+    def __init__(
+        self,
+        path: Union[PathLike, BinaryIO],
+        width: int,
+        height: int,
+        *,
+        kind: str = "pgm",
+        maxval: int = 255,
+    ) -> None:
+        magic = {"pbm": "P4", "pgm": "P5", "ppm": "P6"}.get(kind)
+        if magic is None:
+            raise ValueError("kind must be 'pbm', 'pgm' or 'ppm'")
+        if not 1 <= maxval <= 65535:
+            raise ValueError("maxval must be in [1, 65535]")
+        self.width, self.height, self.kind, self.maxval = width, height, kind, maxval
+        self.channels = 3 if kind == "ppm" else 1
+        self.rows_written = 0
+
+        self._own = not hasattr(path, "write")
+        self._f: BinaryIO = open(path, "wb") if self._own else path  # type: ignore[arg-type]
+        header = f"{magic}\n{width} {height}\n" + ("" if kind == "pbm" else f"{maxval}\n")
+        self._f.write(header.encode("ascii"))
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        """
+        Encode the next rows: (n, W) or, for PPM, (n, W, 3).
+
+        Raises
+        ------
+        ValueError
+            If the rows have the wrong shape or overflow the height.
+        """
+        a = np.asarray(rows)
+        expected = (self.width,) if self.channels == 1 else (self.width, 3)
+        if a.ndim != len(expected) + 1 or a.shape[1:] != expected:
+            raise ValueError(f"rows must be (n, {', '.join(map(str, expected))})")
+        if self.rows_written + a.shape[0] > self.height:
+            raise ValueError("more rows than the image height")
+        if self.kind == "pbm":
+            data = np.packbits(a == 0, axis=1)
+        elif self.maxval > 255:
+            data = a.astype(">u2")
+        else:
+            data = a.astype(np.uint8, copy=False)
+        self._f.write(np.ascontiguousarray(data).tobytes())
+        self.rows_written += a.shape[0]
+
+    def close(self) -> None:
+        """
+        Close the file.
+
+        Raises
+        ------
+        ValueError
+            If fewer rows than the image height were written.
+        """
+        if self._f is None:
+            return
+        if self.rows_written != self.height:
+            raise ValueError(f"wrote {self.rows_written} of {self.height} rows")
+        if self._own:
+            self._f.close()
+        self._f = None
+
+    def __enter__(self) -> "PNMWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._own and self._f is not None:
+            self._f.close()
+
+
+def is_stream_path(path: PathLike) -> bool:
+    """Whether `path` has a suffix handled by the row-streaming readers/writers."""
+    return Path(path).suffix.lower() in (".png",) + _PNM_SUFFIXES
+
+
+def open_row_reader(path: PathLike) -> Union[PNGReader, PNMReader]:
+    """
+    Open a PNG or binary PNM file for band-by-band reading (by file signature).
+
+    Raises
+    ------
+    ValueError
+        If the file is neither PNG nor binary PNM.
+    """
+    with open(path, "rb") as f:
+        head = f.read(8)
+    if head == PNG_SIGNATURE:
+        return PNGReader(path)
+    if head[:2] in (b"P4", b"P5", b"P6"):
+        return PNMReader(path)
+    raise ValueError(f"{path}: not a PNG or binary PBM/PGM/PPM file")
+
+
+def open_row_writer(
+    path: PathLike,
+    width: int,
+    height: int,
+    *,
+    channels: int = 1,
+    bilevel: bool = False,
+    compress_level: int = 6,
+) -> Union[PNGWriter, PNMWriter]:
+    """
+    Open a PNG/PBM/PGM/PPM file (by suffix) for band-by-band writing.
+
+    Parameters
+    ----------
+    path : str | Path
+        ``.png``, ``.pbm``, ``.pgm``, ``.ppm`` or ``.pnm``.
+    width, height : int
+        Image size.
+    channels : int, default 1
+        Samples per pixel (1 or 3 for PNM).
+    bilevel : bool, default False
+        Rows hold {0, 1} (1 = white): 1-bit PNG, or PBM for ``.pnm``.
+    compress_level : int, default 6
+        zlib level for PNG.
+
+    Raises
+    ------
+    ValueError
+        If the suffix is unsupported or incompatible with `bilevel`/`channels`.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".png":
+        return PNGWriter(
+            path,
+            width,
+            height,
+            channels=channels,
+            bit_depth=1 if bilevel else 8,
+            compress_level=compress_level,
+        )
+    if suffix in _PNM_SUFFIXES:
+        if suffix == ".pnm":
+            kind = "pbm" if bilevel else ("ppm" if channels == 3 else "pgm")
+        else:
+            kind = suffix[1:]
+        if (kind == "ppm") != (channels == 3):
+            need = "3 channels" if kind == "ppm" else "1 channel"
+            raise ValueError(f"{suffix} files need {need}")
+        if kind == "pgm" and bilevel:
+            return PNMWriter(path, width, height, kind="pgm", maxval=1)
+        if kind == "pbm" and not bilevel:
+            raise ValueError(".pbm output requires bilevel rows")
+        return PNMWriter(path, width, height, kind=kind)
+    raise ValueError(f"unsupported output format {suffix!r}")
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""Tone curves folded into grayscale conversion.
+
+A `ToneCurve` is an immutable chain of tone operations (sRGB <-> linear,
+black/white point levels, gamma, histogram equalization). It compiles to
+lookup tables that `grayscale` evaluates during luminance conversion:
+
+- input stage: three 256-entry int32 tables, one per channel, holding the
+  BT.601 weight times the channel's 16-bit value (sRGB-decoded when the
+  curve starts with `srgb_to_linear`, so luminance is mixed in linear light)
+- output stage: one 65536-entry uint8 table applying the remaining
+  operations to 16-bit luminance
+
+Conversion therefore costs one extra table lookup per pixel, whatever the
+number of operations.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .prep_img import quantize_to_uint8
+
+# BT.601 weights scaled by 10**4 (same as `luma_lut`)
+LUMA_WEIGHTS = (2989, 5870, 1140)
+LUMA_DENOM = 10000
+
+ToneOp = Tuple[str, Tuple[float, ...]]
+
+
+def srgb_to_linear(x: np.ndarray) -> np.ndarray:
+    """Decode sRGB-encoded values in [0, 1] to linear light."""
+    x = np.clip(x, 0.0, 1.0)
+    return np.where(x <= 0.04045, x / 12.92, ((x + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(x: np.ndarray) -> np.ndarray:
+    """Encode linear-light values in [0, 1] to sRGB."""
+    x = np.clip(x, 0.0, 1.0)
+    return np.where(x <= 0.0031308, x * 12.92, 1.055 * x ** (1.0 / 2.4) - 0.055)
+
+
+def _apply_op(op: ToneOp, x: np.ndarray) -> np.ndarray:
+    """Apply one tone operation to values in [0, 1]."""
+    name, params = op
+    if name == "srgb_to_linear":
+        return srgb_to_linear(x)
+    if name == "linear_to_srgb":
+        return linear_to_srgb(x)
+    if name == "levels":
+        black, white = params
+        return np.clip((x * 255.0 - black) / (white - black), 0.0, 1.0)
+    if name == "gamma":
+        return np.clip(x, 0.0, 1.0) ** (1.0 / params[0])
+    if name == "equalize":
+        cdf = np.cumsum(np.asarray(params, dtype=np.float64))
+        nz = cdf[cdf > 0]
+        if nz.size == 0 or cdf[-1] == nz[0]:
+            return x
+        lut = np.clip((cdf - nz[0]) / (cdf[-1] - nz[0]), 0.0, 1.0)
+        return lut[np.clip(np.rint(x * 255.0), 0, 255).astype(np.intp)]
+    raise ValueError(f"Unknown tone operation: {name}")
+
+
+@dataclass(frozen=True)
+class ToneCurve:
+    """
+    Immutable, composable tone curve.
+
+    Build by chaining, e.g. ``ToneCurve().srgb_to_linear().levels(16, 235).gamma(1.2)``.
+    A leading `srgb_to_linear` is applied per channel before the luminance
+    mix; all later operations act on luminance.
+
+    Attributes
+    ----------
+    ops : tuple
+        Operations as ``(name, params)`` pairs, in application order.
+    """
+
+    ops: Tuple[ToneOp, ...] = ()
+
+    def _then(self, name: str, *params: float) -> "ToneCurve":
+        return ToneCurve(self.ops + ((name, tuple(float(p) for p in params)),))
+
+    def srgb_to_linear(self) -> "ToneCurve":
+        """Decode sRGB to linear light."""
+        return self._then("srgb_to_linear")
+
+    def linear_to_srgb(self) -> "ToneCurve":
+        """Encode linear light back to sRGB."""
+        return self._then("linear_to_srgb")
+
+    def levels(self, black: float = 0.0, white: float = 255.0) -> "ToneCurve":
+        """
+        Stretch ``[black, white]`` (8-bit units) to the full range, clipping outside.
+
+        Raises
+        ------
+        ValueError
+            If `white` <= `black`.
+        """
+        if white <= black:
+            raise ValueError("white point must be greater than black point")
+        return self._then("levels", black, white)
+
+    def gamma(self, gamma: float) -> "ToneCurve":
+        """
+        Apply ``y = x ** (1 / gamma)``; gamma > 1 brightens mid-tones.
+
+        Raises
+        ------
+        ValueError
+            If `gamma` <= 0.
+        """
+        if gamma <= 0:
+            raise ValueError("gamma must be > 0")
+        return self._then("gamma", gamma)
+
+    def equalize(self, hist: np.ndarray) -> "ToneCurve":
+        """
+        Equalize using a (256,) histogram of the values entering this step.
+
+        See `equalized_for` to compute the histogram from an image.
+
+        Raises
+        ------
+        ValueError
+            If `hist` does not have 256 bins.
+        """
+        h = np.asarray(hist)
+        if h.shape != (256,):
+            raise ValueError("equalize expects a (256,) histogram")
+        return self._then("equalize", *h.tolist())
+
+    def equalized_for(self, img: np.ndarray) -> "ToneCurve":
+        """Append equalization fitted to `img` as seen through this curve."""
+        from .grayscale import grayscale  # local import: grayscale imports this module
+        from .histogram import gray_histogram
+
+        gray = grayscale(img, "u8", tone=self if self.ops else None)
+        return self.equalize(gray_histogram(gray))
+
+    @property
+    def linear_input(self) -> bool:
+        """Whether the curve starts by decoding sRGB (applied per channel)."""
+        return bool(self.ops) and self.ops[0][0] == "srgb_to_linear"
+
+    @cached_property
+    def channel_tables(self) -> np.ndarray:
+        """(3, 256) int32 tables: BT.601 weight x 16-bit (optionally linear) channel value."""
+        v = np.arange(256, dtype=np.float64) / 255.0
+        if self.linear_input:
+            v = srgb_to_linear(v)
+        v16 = np.rint(v * 65535.0).astype(np.int32)
+        return np.array(LUMA_WEIGHTS, dtype=np.int32)[:, None] * v16[None, :]
+
+    @cached_property
+    def output_lut(self) -> np.ndarray:
+        """(65536,) uint8 table mapping 16-bit luminance to the final gray level."""
+        x = np.arange(65536, dtype=np.float64) / 65535.0
+        for op in self.ops[1:] if self.linear_input else self.ops:
+            x = _apply_op(op, x)
+        return np.clip(np.rint(x * 255.0), 0, 255).astype(np.uint8)
+
+    @cached_property
+    def channel_lut(self) -> np.ndarray:
+        """(256,) uint8 table applying the whole curve to a single channel."""
+        return self.output_lut[self.channel_tables[0] // LUMA_WEIGHTS[0]]
+
+    def apply_rgb(self, img: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Apply the curve to each channel of an image (for color paths); returns uint8."""
+        return np.take(self.channel_lut, quantize_to_uint8(img), out=out)
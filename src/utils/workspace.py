@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""Reusable scratch buffers and output allocation.
+
+A `Workspace` keeps named arrays (gray planes, error rows, threshold planes)
+alive between calls, so a loop that dithers same-sized frames reaches a
+steady state with no large allocations. With an attached `IntermediateCache`
+it also shares per-image intermediates (gray plane, histogram) and threshold
+planes across algorithms. A workspace is not thread-safe: give each
+concurrent caller its own.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Literal, Optional, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .intermediates import IntermediateCache
+
+
+class Workspace:
+    """
+    Named scratch buffers reused across dithering calls.
+
+    Buffers are reallocated only when the requested shape or dtype changes.
+
+    Parameters
+    ----------
+    intermediates : IntermediateCache | None, default None
+        Shared cache of per-image intermediates and threshold planes; see
+        `image_memo` and `memo`.
+
+    Examples
+    --------
+    >>> ws = Workspace()
+    >>> for frame in frames:
+    ...     error_diff_bw(frame, out=dst, workspace=ws)
+    """
+
+    def __init__(self, intermediates: Optional["IntermediateCache"] = None) -> None:
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._memo: Dict[str, Tuple[Hashable, np.ndarray]] = {}
+        self.intermediates = intermediates
+
+    def get(
+        self,
+        name: str,
+        shape: Tuple[int, ...],
+        dtype: Union[np.dtype, type] = np.float32,
+    ) -> np.ndarray:
+        """Return the buffer `name` with the given shape/dtype (contents undefined)."""
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != np.dtype(dtype):
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buf
+        return buf
+
+    def has(
+        self,
+        name: str,
+        shape: Tuple[int, ...],
+        dtype: Union[np.dtype, type] = np.float32,
+    ) -> bool:
+        """Whether buffer `name` exists with the given shape/dtype."""
+        buf = self._buffers.get(name)
+        return buf is not None and buf.shape == tuple(shape) and buf.dtype == np.dtype(dtype)
+
+    def zeros(
+        self,
+        name: str,
+        shape: Tuple[int, ...],
+        dtype: Union[np.dtype, type] = np.float32,
+    ) -> np.ndarray:
+        """Return the buffer `name`, zero-filled."""
+        buf = self.get(name, shape, dtype)
+        buf.fill(0)
+        return buf
+
+    def memo(
+        self,
+        name: str,
+        key: Hashable,
+        build: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Return the array cached under `name` if built for `key`, else build and cache it.
+
+        Keeps one array per name, or any number (LRU-bounded) in the attached
+        `intermediates` cache.
+        """
+        if self.intermediates is not None:
+            return self.intermediates.memo(None, name, key, build)
+        hit = self._memo.get(name)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        arr = build()
+        self._memo[name] = (key, arr)
+        return arr
+
+    def image_memo(
+        self,
+        img: np.ndarray,
+        name: str,
+        key: Hashable,
+        build: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Intermediate `name` of `img` for `key`, from the `intermediates` cache.
+
+        Without an attached cache this just calls `build`.
+        """
+        if self.intermediates is None:
+            return build()
+        return self.intermediates.memo(img, name, key, build)
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes held by the workspace."""
+        return sum(b.nbytes for b in self._buffers.values()) + sum(
+            a.nbytes for _, a in self._memo.values()
+        )
+
+    def clear(self) -> None:
+        """Release all buffers."""
+        self._buffers.clear()
+        self._memo.clear()
+
+
+def output_dtype(
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type]
+) -> type:
+    """Resolve the dtype `binarize` produces for a dtype specifier."""
+    if dtype == "u8":
+        return np.uint8
+    if dtype == "f32":
+        return np.float32
+    return np.dtype(dtype).type
+
+
+def prepare_output(
+    shape: Tuple[int, ...],
+    dtype: Union[Literal["u8"], Literal["f32"], np.dtype, type],
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Return `out` after checking its shape, or allocate an output array.
+
+    Parameters
+    ----------
+    shape : tuple
+        Required output shape.
+    dtype : {"u8","f32"} | np.dtype | type
+        Dtype specifier used when allocating.
+    out : np.ndarray | None, default None
+        Caller-provided destination (any numeric dtype).
+
+    Returns
+    -------
+    np.ndarray
+        The destination array.
+
+    Raises
+    ------
+    ValueError
+        If `out` has the wrong shape.
+    """
+    if out is None:
+        return np.empty(shape, dtype=output_dtype(dtype))
+    if out.shape != tuple(shape):
+        raise ValueError(f"Output shape {out.shape} does not match expected shape {tuple(shape)}")
+    return out